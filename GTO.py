@@ -3,26 +3,26 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Set, Dict, Tuple
 
+import ehs_table
+import strategy_store
+import pushfold
+# the hand classes live in poker_core so pushfold can use them without importing GTO
+from poker_core import evaluate_hand, choose_winner, CARDS, HAND_CLASSES, CLASS_INDEX, hand_index, hand_key
+
 RANK_TO_VALUE = {'2': 2, '3': 3, '4': 4, '5': 5, '6': 6, '7': 7, '8': 8, '9': 9,
                  'T': 10, 'J': 11, 'Q': 12, 'K': 13, 'A': 14}
 DATA_DIR = Path(__file__).parent / "data"
 
-def load_json_chart(filename: str) -> dict:
-    p = DATA_DIR / filename
+def load_json_chart(filename: str, directory: Path = DATA_DIR) -> dict:
+    p = directory / filename
     if not p.exists():
         return {}
     return json.loads(p.read_text())
 
-PRE_CHART  = load_json_chart("preflop_hunl.json")
-FLOP_CHART = load_json_chart("flop_hunl.json")
-TURN_CHART = load_json_chart("turn_hunl.json")
-RIVER_CHART= load_json_chart("river_hunl.json")
-
-def hand_key(cards: Set[str]) -> str:
-    a, b = sorted(cards, key=lambda c: RANK_TO_VALUE[c[0]], reverse=True)
-    if a[0] == b[0]:
-        return a[0] * 2
-    return a[0] + b[0] + ('s' if a[1] == b[1] else 'o')
+CHART_FILES = {"preflop": "preflop_hunl.json", "flop": "flop_hunl.json", "turn": "turn_hunl.json", "river": "river_hunl.json"}
+POSITIONS = ("SB", "BB")
+POSITION_INDEX = {position: i for i, position in enumerate(POSITIONS)}
+BUCKETS = ("very_strong", "strong", "medium", "weak", "very_weak")
 
 def equity_bucket(equity: float) -> str:
     if equity >= 0.85: return "very_strong"
@@ -39,12 +39,107 @@ def sample(dist: Dict[str, float]) -> str:
             return k
     return list(dist)[-1]
 
+# Probabilities sample(dist) draws each of actions with: the probabilities are used in order up to a total of 1,
+# and the last action soaks up whatever the chart leaves unassigned
+# The SB's preflop entry also says how often it calls when the BB raises: "call" against a 3-bet of its open,
+# "call_vs_raise" against a raise over its limp (the same as "call" if the entry doesn't give it)
+def sb_raise_calls(strat: Dict[str, float]) -> Tuple[Dict[str, float], Dict[str, float]]:
+    call = strat.get("call", 0.0)
+    call_vs_raise = strat.get("call_vs_raise", call)
+    return {"call": call, "fold": 1.0 - call}, {"call": call_vs_raise, "fold": 1.0 - call_vs_raise}
+
+def chart_probs(dist: Dict[str, float], actions) -> list:
+    probs, total = dict.fromkeys(actions, 0.0), 0.0
+    for action, p in dist.items():
+        probs[action] += max(0.0, min(total + p, 1.0) - min(total, 1.0))
+        total += p
+    probs[list(dist)[-1]] += 1.0 - min(total, 1.0)
+    return [probs[action] for action in actions]
+
+# Walker's alias method: one table per distribution, sampled in O(1) with a single random number
+class AliasTable:
+    __slots__ = ("actions", "prob", "alias")
+
+    # Built so that it draws exactly what sample(dist) draws, including the last action soaking up
+    # whatever probability the chart leaves unassigned
+    def __init__(self, dist: Dict[str, float]):
+        actions = list(dist)
+        weights, total = [], 0.0
+        for p in dist.values():
+            weights.append(max(0.0, min(total + p, 1.0) - min(total, 1.0)))
+            total += p
+        weights[-1] += 1.0 - min(total, 1.0)
+
+        n = len(actions)
+        scaled = [w * n for w in weights]
+        prob, alias = [1.0] * n, list(range(n))
+        small = [i for i, w in enumerate(scaled) if w < 1.0]
+        large = [i for i, w in enumerate(scaled) if w >= 1.0]
+        while small and large:
+            s, l = small.pop(), large.pop()
+            prob[s], alias[s] = scaled[s], l
+            scaled[l] -= 1.0 - scaled[s]
+            (small if scaled[l] < 1.0 else large).append(l)
+        self.actions, self.prob, self.alias = actions, prob, alias
+
+    def sample(self) -> str:
+        u = random.random() * len(self.actions)
+        i = int(u)
+        return self.actions[i] if u - i < self.prob[i] else self.actions[self.alias[i]]
+
+# Preflop tables are indexed [position][branch][hand class], postflop ones [street][position][bucket][facing a bet]
+# (None where the chart has no entry); compiled from the JSON charts on first use so importing GTO costs nothing
+_charts = None
+
+def compile_charts() -> dict:
+    preflop_chart = load_json_chart(CHART_FILES["preflop"])
+    preflop = []
+    for position in POSITIONS:
+        branches = {name: [None] * len(HAND_CLASSES) for name in ("root", "vs_open", "vs_limp", "vs_3bet", "vs_raise")}
+        known = [False] * len(HAND_CLASSES)
+        for key, strat in preflop_chart.get(position, {}).items():
+            if not strat or key not in CLASS_INDEX:
+                continue
+            i = CLASS_INDEX[key]
+            known[i] = True
+            flat = all(isinstance(p, (int, float)) for p in strat.values())
+            branches["root"][i] = AliasTable({k: v for k, v in strat.items() if k in ("open", "limp", "fold")} or {"fold": 1.0}) if flat else None
+            branches["vs_open"][i] = AliasTable(strat.get("vs_open", {"fold": 1.0}))
+            branches["vs_limp"][i] = AliasTable(strat.get("vs_limp", {"check": 1.0}))
+            vs_3bet, vs_raise = sb_raise_calls(strat) if flat else ({"fold": 1.0}, {"fold": 1.0})
+            branches["vs_3bet"][i], branches["vs_raise"][i] = AliasTable(vs_3bet), AliasTable(vs_raise)
+        branches["known"] = known
+        preflop.append(branches)
+
+    # a position without a chart checks when it can and folds to a bet
+    postflop = {"default": (AliasTable({"check": 1.0}), AliasTable({"fold": 1.0}))}
+    for street in ("flop", "turn", "river"):
+        chart = load_json_chart(CHART_FILES[street])
+        postflop[street] = []
+        for position in POSITIONS:
+            buckets = {}
+            for bucket in BUCKETS:
+                strat = chart.get(position, {}).get(bucket, {"fold": 1.0})
+                unopened = {k: v for k, v in strat.items() if k in ("bet", "check")} or {"check": 1.0}
+                facing = {k: v for k, v in strat.items() if k in ("call", "raise", "fold")} or {"fold": 1.0}
+                buckets[bucket] = (AliasTable(unopened), AliasTable(facing))
+            postflop[street].append(buckets)
+    return {"preflop": preflop, "postflop": postflop}
+
+def get_charts() -> dict:
+    global _charts
+    if _charts is None:
+        _charts = compile_charts()
+    return _charts
+
 @dataclass
 class GTOBot:
     hole_cards: Set[str]
     community_cards: Set[str]
     bank: float
     position: str = "SB"
+    # whether the SB opened this hand (rather than limped), which decides how it answers the BB's raise
+    opened: bool = False
 
     def draw_card(self) -> Set[str]:
         return set()
@@ -53,6 +148,9 @@ class GTOBot:
         self.bank += amount
 
     def choose_move(self, game_phase: str, minimum_bet: int, current_bet: int, pot: int, opponent_bank: int) -> Tuple[str, int]:
+        move = pushfold.short_stack_move(self.hole_cards, game_phase, minimum_bet, current_bet, self.bank, opponent_bank)
+        if move is not None:
+            return move
         if game_phase == "PF":
             return self.preflop_action(minimum_bet, current_bet)
         elif game_phase == "F":
@@ -65,29 +163,32 @@ class GTOBot:
             return "fold", 0
 
     def preflop_action(self, min_bet, cur_bet):
-        chart = PRE_CHART.get(self.position, {})
-        hand = hand_key(self.hole_cards)
-        strat = chart.get(hand, None)
-        if not strat:
+        if self.position not in POSITION_INDEX:
+            return "fold", 0
+        chart = get_charts()["preflop"][POSITION_INDEX[self.position]]
+        hand = hand_index(self.hole_cards)
+        if not chart["known"][hand]:
             return "fold", 0
 
         if self.position == "SB":
             if cur_bet == 0:
-                action = sample(strat)
+                table = chart["root"][hand]
+                action = table.sample() if table is not None else "fold"
+                self.opened = action == "open"
                 if action == "open":
                     return "bet", 3 * min_bet
                 if action == "limp":
                     return "call", min_bet
                 return "fold", 0
             else:
-                if strat.get("call", 0) > 0:
+                table = chart["vs_3bet" if self.opened else "vs_raise"][hand]
+                if table is not None and table.sample() == "call":
                     return "call", cur_bet
                 return "fold", 0
 
         if self.position == "BB":
             if cur_bet > min_bet:
-                strat_branch = strat.get("vs_open", {"fold": 1.0})
-                action = sample(strat_branch)
+                action = chart["vs_open"][hand].sample()
                 if action == "3bet":
                     raise_to = cur_bet * 3
                     return "raise", raise_to
@@ -95,8 +196,7 @@ class GTOBot:
                     return "call", cur_bet
                 return "fold", 0
             else:
-                strat_branch = strat.get("vs_limp", {"check": 1.0})
-                action = sample(strat_branch)
+                action = chart["vs_limp"][hand].sample()
                 if action == "raise":
                     raise_to = 4 * min_bet 
                     return "raise", raise_to
@@ -106,28 +206,25 @@ class GTOBot:
         return "fold", 0
 
     def postflop_action(self, street, min_bet, cur_bet, pot):
-        eq = self.estimate_equity()
-        bucket = equity_bucket(eq)
-        if street == "flop":
-            chart = FLOP_CHART.get(self.position, {})
-        elif street == "turn":
-            chart = TURN_CHART.get(self.position, {})
-        elif street == "river":
-            chart = RIVER_CHART.get(self.position, {})
-        else:
+        if street not in ("flop", "turn", "river"):
             return "fold", 0
-        strat = chart.get(bucket, {"fold": 1.0})
-
-        if cur_bet == 0:
-            legal = {k: v for k, v in strat.items() if k in ("bet", "check")}
-            if not legal:
-                legal = {"check": 1.0}
-        else:
-            legal = {k: v for k, v in strat.items() if k in ("call", "raise", "fold")}
-            if not legal:
-                legal = {"fold": 1.0}
-
-        action = sample(legal)
+        # the strategy store plays the infoset if it knows it, then the charts play the bucket: the precomputed
+        # bucket table answers without sampling, the Monte Carlo estimate covers what it doesn't
+        key = ehs_table.canonical_key(self.hole_cards, self.community_cards) if len(self.community_cards) in ehs_table.STREETS else None
+        action = None
+        if key is not None and self.position in POSITION_INDEX:
+            action = strategy_store.lookup(street, POSITION_INDEX[self.position], cur_bet, pot, key)
+        if action is None:
+            bucket = ehs_table.bucket_of(key) if key is not None else None
+            if bucket is None:
+                bucket = equity_bucket(self.estimate_equity())
+            # only the actions legal against the current bet, kept in chart order
+            charts = get_charts()["postflop"]
+            if self.position in POSITION_INDEX:
+                unopened, facing = charts[street][POSITION_INDEX[self.position]][bucket]
+            else:
+                unopened, facing = charts["default"]
+            action = (unopened if cur_bet == 0 else facing).sample()
 
         if cur_bet == 0:
             if action == "bet":
@@ -144,7 +241,6 @@ class GTOBot:
         return "check", 0
 
     def estimate_equity(self) -> float:
-        from poker_main import evaluate_hand, choose_winner
         deck = [r + s for r in "23456789TJQKA" for s in "DCHS"]
         used = self.hole_cards | self.community_cards
         remaining = list(set(deck) - used)
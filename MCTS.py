@@ -2,18 +2,52 @@
 #hes a bit unoptimized but I wanted to make it easier to expand upon for our personal poker bot project
 #so a terrible base case makes our good ones seem better
 
-#there are 3 adjustable parameters the constant in ucb1 and 2 factors that limit the number of children expanded
-#unforunately they are hardcoded in the code so you will have to change them manually
+#there are 4 adjustable parameters the constant in ucb1 and 3 factors that limit the number of children expanded
+#they default to the hand tuned values below and get overridden by data/mcts_params.json, which tune_mcts.py writes
 
 import random
 import time
 import math
+import heapq
+import itertools
+import json
+from pathlib import Path
+from time_manager import TimeManager
+import poker_core
+import pushfold
 
 # Variable for amount of time the model is allowed to simulate
+# choose_move only uses it when adaptive_time is off, otherwise the time manager picks the think time
 SIM_TIME = 1
+# Search iterations between convergence checks
+CONVERGENCE_CHECK = 64
+
+# Maximum number of tree nodes kept per search, least visited subtrees get evicted past this
+MAX_NODES = 50000
+# Eviction prunes the tree back down to this fraction of MAX_NODES so it doesn't run on every iteration
+EVICT_TO = 0.75
+
+# Preflop opening book built offline by mcts_book.py
+BOOK_FILE = Path(__file__).parent / "data" / "preflop_book_mcts.json"
+# Loaded on first preflop lookup
+_book = None
+
+# Search parameters, see load_params
+# constant in ucb1
+UCB_C = 2
+# preflop keeps dealing new flops while it has at most PREFLOP_WIDEN * visits ** PREFLOP_WIDEN_POWER children
+PREFLOP_WIDEN = 0.5
+PREFLOP_WIDEN_POWER = 0.75
+# flop and turn nodes switch to ucb selection once they have more than this fraction of the unseen cards as children
+CHANCE_WIDEN = 1.0
+# Tuned search parameters written by tune_mcts.py
+PARAMS_FILE = Path(__file__).parent / "data" / "mcts_params.json"
+
+# Breaks ties between equal ucb values in the selection heaps
+_tiebreak = itertools.count()
 
 class MCTS:
-    def __init__(self, hand, community, money):
+    def __init__(self, hand, community, money, max_nodes=MAX_NODES, use_book=True, warm_start=False, adaptive_time=True, time_manager=None):
         self.possibilities = ["2D", "3D", "4D", "5D", "6D", "7D", "8D", "9D", "TD", "JD", "QD", "KD", "AD",
                                 "2C", "3C", "4C", "5C", "6C", "7C", "8C", "9C", "TC", "JC", "QC", "KC", "AC",
                                 "2H", "3H", "4H", "5H", "6H", "7H", "8H", "9H", "TH", "JH", "QH", "KH", "AH",
@@ -21,6 +55,21 @@ class MCTS:
         self.hole_cards = hand
         self.community_cards = community
         self.bank = money
+        self.max_nodes = max_nodes
+        # Preflop decisions come straight from the opening book unless warm_start is set,
+        # in which case the book seeds the tree and the search runs as usual
+        self.use_book = use_book
+        self.warm_start = warm_start
+        # Shares a per-hand (or per-session, if passed in) thinking budget between decisions
+        if time_manager is None and adaptive_time:
+            time_manager = TimeManager()
+        self.time_manager = time_manager
+        self.think_time = SIM_TIME
+        # Tree size and eviction metrics for the last search
+        self.tree_size = 0
+        self.peak_tree_size = 0
+        self.evictions = 0
+        self.evicted_nodes = 0
 
     """
     You can implement this function however you see fit, but at a base level
@@ -60,7 +109,17 @@ class MCTS:
     bot has a maximum of 15 seconds to decide what its next move will be
     """
     def choose_move(self, game_phase: str, minimum_bet: int, current_bet: int, pot: int, opponent_bank: int) -> tuple[str, int]:
-        win_rate = self.simulate()
+        # short stacks play the push/fold chart instead of simulating
+        move = pushfold.short_stack_move(self.hole_cards, game_phase, minimum_bet, current_bet, self.bank, opponent_bank)
+        if move is not None:
+            return move
+        start_time = time.time()
+        think_time = None
+        if self.time_manager is not None:
+            think_time = self.time_manager.allocate(game_phase, pot, self.bank, opponent_bank)
+        win_rate = self.simulate(think_time)
+        if self.time_manager is not None:
+            self.time_manager.charge(time.time() - start_time)
         print(f"Model winrate: {win_rate * 100}% at {game_phase}")
         decision, bet = self.bet_strategy(game_phase, current_bet, pot, win_rate, minimum_bet, opponent_bank)
         if(bet <= self.bank):
@@ -80,8 +139,19 @@ class MCTS:
     # Feel free to include any other utility methods you want
 
     # Runs MCTS to simulate the game, returns the win rate
-    def simulate(self):
+    # think_time comes from the time manager, in which case the search also stops once the estimate converges
+    def simulate(self, think_time=None):
+        root = self.search(think_time)
+        if root.visits == 0:
+            return 0.5
+        return root.wins / root.visits
+
+    # Builds and searches the tree for think_time (default SIM_TIME) seconds, returns the root
+    # max_iterations additionally caps the number of playouts, which the tuning harness uses for iteration budgets
+    def search(self, think_time=None, max_iterations=None):
         start_time = time.time()
+        adaptive = think_time is not None and self.time_manager is not None
+        self.think_time = SIM_TIME if think_time is None else think_time
         communitycopy = self.community_cards.copy()
         if len(communitycopy) == 0:
             state = 0
@@ -93,14 +163,57 @@ class MCTS:
             state = 3
         root = Tree(state, self.hole_cards.copy(), communitycopy)
         Node = root
+        self.tree_size = 1
+        self.peak_tree_size = 1
+        self.evictions = 0
+        self.evicted_nodes = 0
+
+        if state == 0 and self.use_book:
+            entry = self.book_entry()
+            if entry is not None:
+                if not self.warm_start:
+                    root.wins = entry["wins"]
+                    root.visits = entry["visits"]
+                    return root
+                self.seed_tree(root, entry)
 
-        while time.time() - start_time < SIM_TIME:
+        while time.time() - start_time < self.think_time:
             self.expand(Node, start_time)
+            if self.tree_size > self.max_nodes:
+                self.evict(root)
+            if max_iterations is not None and root.visits >= max_iterations:
+                break
+            if adaptive and root.visits % CONVERGENCE_CHECK == 0:
+                if self.time_manager.converged(time.time() - start_time, self.think_time, root.wins, root.visits):
+                    break
         # print(str(root.visits) + " iterations and " + str(root.wins) + " wins")
-        return root.wins / root.visits
+        print(f"Tree size: {self.tree_size} nodes (peak {self.peak_tree_size}), {self.evicted_nodes} nodes evicted in {self.evictions} evictions")
+        return root
+
+    # Looks up the opening book entry for our hole cards' hand class, None if there isn't one
+    def book_entry(self):
+        global _book
+        from GTO import hand_key
+        if _book is None:
+            _book = json.loads(BOOK_FILE.read_text())["hands"] if BOOK_FILE.exists() else {}
+        return _book.get(hand_key(self.hole_cards))
+
+    # Copies the book's root and flop statistics into a fresh preflop tree
+    # book flops were searched with a representative hand, so their suits get relabeled onto our hole cards
+    def seed_tree(self, root, entry):
+        suit_map = map_suits(entry["cards"], self.hole_cards)
+        root.wins = entry["wins"]
+        root.visits = entry["visits"]
+        for *flop, wins, visits in entry["flops"]:
+            cards = {card[0] + suit_map[card[1]] for card in flop}
+            child = Tree(root.state + 1, root.bothand, root.community.union(cards), root, frozenset(cards))
+            child.wins = wins
+            child.visits = visits
+            root.add_child(child)
+            self.tree_size += 1
+        self.peak_tree_size = self.tree_size
         
     def evaluate_hole_cards(self):
-        import poker_main
         same_suit = True
         suit = None
         value = None
@@ -108,7 +221,7 @@ class MCTS:
         pair = True
         for card in self.hole_cards:
             # Adds cumulative value
-            avg_value += poker_main.RANK_TO_VALUE[card[0]]
+            avg_value += poker_core.RANK_TO_VALUE[card[0]]
             # Checks same suit
             if suit is None:
                 suit = card[1]
@@ -116,8 +229,8 @@ class MCTS:
                     same_suit = False
             # Checks pair
             if value is None:
-                value = poker_main.RANK_TO_VALUE[card[0]]
-            elif value != poker_main.RANK_TO_VALUE[card[0]]:
+                value = poker_core.RANK_TO_VALUE[card[0]]
+            elif value != poker_core.RANK_TO_VALUE[card[0]]:
                 pair = False
         
         # Score = average card value, with 1.25x multipler for same suit, and 2x multiplier for pair
@@ -130,13 +243,12 @@ class MCTS:
 
     # Heuristic function for determining how much to bet
     def bet_strategy(self, game_phase: str, current_bet: int, pot: int, win_rate: float, min_bet: int, opponent_bank: int) -> tuple[str, int]:
-        import poker_main
         # Weight to balance between win % and hole card strength based on the turn. Higher = more reliance on hand strength
         RISK_FACTOR = 1 # Risk factor goes from 1 - 5. Higher means lower risk
         phase_weights = {"PF" : 0.25, "F" : 0.55, "T" : 0.80, "R" : 0.99}
         hole_strength = self.evaluate_hole_cards()
         try:
-            opponent_confidence = current_bet / pot * opponent_bank / poker_main.STARTING_MONEY
+            opponent_confidence = current_bet / pot * opponent_bank / poker_core.STARTING_MONEY
         except:
             opponent_confidence = 0
         heuristic = (((phase_weights[game_phase] * (win_rate)) + (hole_strength - opponent_confidence) * (1 - phase_weights[game_phase])) / 2)
@@ -195,93 +307,152 @@ class MCTS:
     
     #this is the ucb1 formula
     #u = w/n + c * sqrt(log(N)/n)
+    #N is frozen at parent.ucb_visits so every cached value in the parent's heap uses the same log term
     def ucb(self, node, parent):
         if parent != None:
             if node.visits == 0:
                 node.ucb = 999999999
-            node.ucb = node.wins / node.visits + (2 * (math.log2(parent.visits) / node.visits) ** 0.5)
+            else:
+                node.ucb = node.wins / node.visits + (UCB_C * (math.log2(max(parent.ucb_visits, 1)) / node.visits) ** 0.5)
+            node.version += 1
+            heapq.heappush(parent.heap, (-node.ucb, next(_tiebreak), node.version, node))
+
+    # Recomputes every child's ucb against the parent's current visit count
+    # only happens when the parent's visits double, so selection stays O(log children) amortized
+    def rebuild_ucb(self, Node):
+        Node.ucb_visits = Node.visits
+        Node.heap = []
+        for child in Node.children.values():
+            self.ucb(child, Node)
+
+    # Returns the child with the highest cached ucb, skipping heap entries that have been superseded
+    def select_child(self, Node):
+        if len(Node.heap) == 0 or Node.visits >= 2 * Node.ucb_visits:
+            self.rebuild_ucb(Node)
+        while Node.heap[0][2] != Node.heap[0][3].version:
+            heapq.heappop(Node.heap)
+        return Node.heap[0][3]
+
+    # Deals num_cards onto the node's board and returns the child for that draw
+    # children are keyed by the dealt card (or the unordered flop) so a redrawn card lands on the existing child
+    def deal_child(self, Node, num_cards):
+        cards = self.random_card(Node.bothand.copy().union(Node.community), num_cards)
+        key = frozenset(cards) if num_cards > 1 else next(iter(cards))
+        child = Node.children.get(key)
+        if child is None:
+            child = Tree(Node.state + 1, Node.bothand, Node.community.union(cards), Node, key)
+            Node.add_child(child)
+            self.ucb(child, Node)
+            self.tree_size += 1
+            self.peak_tree_size = max(self.peak_tree_size, self.tree_size)
+        return child
+
+    # Prunes the least visited subtrees until the tree is back under EVICT_TO * max_nodes
+    # a parent's wins and visits already include every playout that went through its children,
+    # so dropping a subtree keeps its statistics folded into the parent and only loses the detail
+    def evict(self, root):
+        nodes = []
+        stack = [root]
+        while stack:
+            Node = stack.pop()
+            for child in Node.children.values():
+                nodes.append(child)
+                stack.append(child)
+        nodes.sort(key=lambda node: node.visits)
+        target = int(self.max_nodes * EVICT_TO)
+        pruned = set()
+        for Node in nodes:
+            if self.tree_size <= target:
+                break
+            # skip nodes whose ancestor was already pruned
+            ancestor = Node.parent
+            while ancestor != None and id(ancestor) not in pruned:
+                ancestor = ancestor.parent
+            if ancestor != None:
+                continue
+            pruned.add(id(Node))
+            del Node.parent.children[Node.key]
+            # forces the parent to rebuild its ucb heap without the pruned child
+            Node.parent.heap = []
+            size = Node.size()
+            self.tree_size -= size
+            self.evicted_nodes += size
+        self.evictions += 1
+
+    # Adds the playout result to every node on the path and refreshes their ucb in the parent's heap
+    def backpropagate(self, Node, value):
+        while Node != None:
+            Node.wins += value
+            Node.visits += 1
+            self.ucb(Node, Node.parent)
+            Node = Node.parent
 
     def expand(self, Node, start_time):
-        if time.time() - start_time > SIM_TIME:
+        if time.time() - start_time > self.think_time:
             return
-        if Node.state == 0: 
-            #preflop ##original code here / code below was modified to add a check for the number of children
-            if len(Node.children) == 0:
-                child = Tree(Node.state+1, Node.bothand, Node.community.copy(), Node)
-                child.community = child.community.union(self.random_card(child.bothand.copy().union(child.community), 3)) 
-                Node.add_child(child)
-                self.expand(child, start_time)
-                return
-            #if children exist, sort by ucb and expand the best one
-            elif len(Node.children) > 0.5 * Node.visits ** 0.75: #factor to control exploration
-                for child in Node.children:
-                    self.ucb(child, Node)
-                max_ucb_child = None
-                for child in Node.children:
-                    if max_ucb_child == None:
-                        max_ucb_child = child
-                    elif child.ucb > max_ucb_child.ucb:
-                        max_ucb_child = child
-                Node = max_ucb_child 
-                self.expand(Node, start_time)
-                return
-            #if children exist but we want to explore more do this
+        if Node.state == 0:
+            #preflop
+            #if children exist, pick the best one by ucb
+            if len(Node.children) > PREFLOP_WIDEN * Node.visits ** PREFLOP_WIDEN_POWER: #factor to control exploration
+                Node = self.select_child(Node)
+            #if we want to explore more deal a new flop
             else:
-                child = Tree(Node.state + 1, Node.bothand, Node.community.copy(), Node)
-                child.community = child.community.union(self.random_card(child.bothand.copy().union(child.community), 3))
-                Node.add_child(child)
-                self.expand(child, start_time)
-                return
-        
+                Node = self.deal_child(Node, 3)
+            self.expand(Node, start_time)
+            return
+
         #if leaf evaluate and propogate
         if Node.state == 3:
-            import poker_main
             hand2 = self.random_card(Node.bothand.copy().union(Node.community), 2)
-            value = poker_main.choose_winner(poker_main.evaluate_hand(Node.bothand.copy().union(Node.community.copy())), poker_main.evaluate_hand(hand2.copy().union(Node.community.copy())))
+            value = poker_core.choose_winner(poker_core.evaluate_hand(Node.bothand.copy().union(Node.community.copy())), poker_core.evaluate_hand(hand2.copy().union(Node.community.copy())))
             if value == -1:
                 value = 1/2
-            Node.wins += value
-            Node.visits += 1
-            while Node.parent != None:
-                Node.parent.wins += value
-                Node.parent.visits += 1
-                Node = Node.parent
+            self.backpropagate(Node, value)
             return
-        
-        #states 1 and 2 only 
-        #if no children expand
-        if len(Node.children) == 0:
-            child = Tree(Node.state+1, Node.bothand, Node.community.copy(), Node)
-            child.community = child.community.union(self.random_card(child.bothand.copy().union(child.community), 1))
-            Node.add_child(child)
-            self.expand(child, start_time)
-            return
-        #if children exist, sort by ucb and expand the best one
-        elif len(Node.children) > 52 - len(Node.bothand) - len(Node.community):
-            for child in Node.children:
-                self.ucb(child, Node)
-            max_ucb_child = None
-            for child in Node.children:
-                if max_ucb_child == None:
-                    max_ucb_child = child
-                if child.ucb > max_ucb_child.ucb:
-                    max_ucb_child = child
-            Node = max_ucb_child
-            self.expand(Node, start_time)
-            return
-        #if children exist but we want to explore more do this
+
+        #states 1 and 2 only
+        #if every card has been dealt, pick the best one by ucb
+        if len(Node.children) > CHANCE_WIDEN * (52 - len(Node.bothand) - len(Node.community)):
+            Node = self.select_child(Node)
+        #otherwise deal a card, which reaches the existing child if it was drawn before
         else:
-            child = Tree(Node.state + 1, Node.bothand, Node.community.copy(), Node)
-            num_children = len(Node.children)
-            child.community = child.community.union(self.random_card(child.bothand.copy().union(child.community), 1))
-            Node.add_child(child)
-            self.expand(child, start_time)
-            return
+            Node = self.deal_child(Node, 1)
+        self.expand(Node, start_time)
+        return
+
+
+# Loads the search parameters chosen by tune_mcts.py, keeping the defaults for anything missing
+def load_params(path=PARAMS_FILE):
+    global UCB_C, PREFLOP_WIDEN, PREFLOP_WIDEN_POWER, CHANCE_WIDEN
+    if not path.exists():
+        return
+    params = json.loads(path.read_text())["params"]
+    UCB_C = params.get("UCB_C", UCB_C)
+    PREFLOP_WIDEN = params.get("PREFLOP_WIDEN", PREFLOP_WIDEN)
+    PREFLOP_WIDEN_POWER = params.get("PREFLOP_WIDEN_POWER", PREFLOP_WIDEN_POWER)
+    CHANCE_WIDEN = params.get("CHANCE_WIDEN", CHANCE_WIDEN)
+
+load_params()
+
+# Maps the suits of a representative hand onto hole cards of the same hand class
+# suits that aren't in either hand are interchangeable, so they're paired up in order
+def map_suits(rep_cards, hole_cards):
+    by_rank = lambda card: poker_core.RANK_TO_VALUE[card[0]]
+    suit_map = {}
+    for rep, card in zip(sorted(rep_cards, key=by_rank), sorted(hole_cards, key=by_rank)):
+        suit_map.setdefault(rep[1], card[1])
+    unused = [suit for suit in poker_core.SUITS if suit not in suit_map.values()]
+    for suit in poker_core.SUITS:
+        if suit not in suit_map:
+            suit_map[suit] = unused.pop(0)
+    return suit_map
 
 
 class Tree:
-    def __init__(self, state, bothand, community, parent=None):
-        self.children = set()
+    def __init__(self, state, bothand, community, parent=None, key=None):
+        # dealt card (or frozenset flop) -> child
+        self.children = {}
+        self.key = key
         self.bothand = bothand
         self.community = community
         self.state = state
@@ -289,20 +460,22 @@ class Tree:
         self.visits = 0
         self.parent = parent
         self.ucb = 0
+        # lazy max heap of (-ucb, tiebreak, version, child), stale entries are skipped on selection
+        self.heap = []
+        # bumped whenever this node's ucb changes so older heap entries can be recognized
+        self.version = 0
+        # parent visit count the children's ucb values were last computed against
+        self.ucb_visits = 0
 
     def add_child(self, child):
         child.parent = self
         child.state = self.state + 1
-        self.children.add(child)
+        self.children[child.key] = child
 
-    def __hash__(self):
-        return hash((frozenset(self.bothand), frozenset(self.community)))
+    # Number of nodes in this subtree, including itself
+    def size(self):
+        return 1 + sum(child.size() for child in self.children.values())
 
-    def __eq__(self, other):
-        if isinstance(other, Tree):
-            return self.bothand == other.bothand and self.community == other.community
-        return False
-        
 
 class Monte_Carlo:
     def random_card(self, hand, num_cards=1):
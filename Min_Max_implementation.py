@@ -1,14 +1,46 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import random
+from poker_core import evaluate_hand, choose_winner
 
 # Standard deck of cards
 ALL_CARDS = [rank + suit for rank in "23456789TJQKA" for suit in "DCHS"]
+# Runouts (opponent hand plus the rest of the board) drawn per simulate_action call
+SIMULATION_SAMPLES = 32
+
+# Scores a batch of runouts, each a sequence of the opponent's 2 hole cards followed by the missing board cards,
+# and returns (wins, ties, losses) from our point of view
+# hands are evaluated once per distinct board, so on the river our hand is only evaluated once for the whole batch
+def showdown_batch(hole, community, runouts):
+    ours = {}
+    wins = ties = losses = 0
+    for runout in runouts:
+        board = frozenset(community.union(runout[2:]))
+        our_score = ours.get(board)
+        if our_score is None:
+            our_score = ours[board] = evaluate_hand(hole | board)
+        # choose_winner consumes the kicker lists, so our cached score is passed as a copy
+        result = choose_winner((our_score[0], list(our_score[1])), evaluate_hand(board.union(runout[:2])))
+        if result == -1:
+            ties += 1
+        elif result:
+            wins += 1
+        else:
+            losses += 1
+    return wins, ties, losses
 
 @dataclass
 class MinimaxBot:
     hole_cards: set[str]
     community_cards: set[str]
     bank: float
+    samples: int = SIMULATION_SAMPLES
+    # chips a raise adds over the current bet, the minimum bet of the decision being made
+    raise_size: int = 1
+    # cards not yet seen, reused between draws and only rebuilt when the known cards change
+    _deck: list = field(default_factory=list, init=False, repr=False)
+    _deck_used: frozenset = field(default=None, init=False, repr=False)
+    # (wins, losses, runouts) of the batch drawn for the current decision, so every action is priced on the same runouts
+    _batch: dict = field(default_factory=dict, init=False, repr=False)
 
     def draw_card(self) -> set[str]:
         used = self.hole_cards | self.community_cards
@@ -19,6 +51,8 @@ class MinimaxBot:
         self.bank += amount
 
     def choose_move(self, game_phase: str, minimum_bet: int, current_bet: int, pot: int, opponent_bank: int) -> tuple[str, int]:
+        self.raise_size = minimum_bet
+        self._batch.clear()
         _, best_move = self.minimax(self.hole_cards, self.community_cards, current_bet, pot, True, 2)
 
         if best_move == "fold":
@@ -31,7 +65,8 @@ class MinimaxBot:
             return "check", 0
 
     def minimax(self, hole_cards, community_cards, current_bet, pot, is_maximizing, depth):
-        if depth == 0 or len(community_cards) == 5:
+        # the search doesn't deal cards, so on the river the actions are still weighed by their expected value
+        if depth == 0:
             return self.evaluate_hand_strength(hole_cards, community_cards), None
 
         actions = self.get_legal_actions(current_bet)
@@ -39,22 +74,23 @@ class MinimaxBot:
         best_action = None
 
         for action in actions:
+            # an action is worth its expected value over the sampled runouts plus what the line after it is worth
             score = self.simulate_action(hole_cards, community_cards, action, pot, current_bet)
             next_score, _ = self.minimax(hole_cards, community_cards, current_bet, pot, not is_maximizing, depth - 1)
+            value = score + next_score
 
             if is_maximizing:
-                if next_score > best_score:
-                    best_score = next_score
+                if value > best_score:
+                    best_score = value
                     best_action = action
             else:
-                if next_score < best_score:
-                    best_score = next_score
+                if value < best_score:
+                    best_score = value
                     best_action = action
 
         return best_score, best_action
 
     def evaluate_hand_strength(self, hole, community):
-        from poker_main import evaluate_hand
         cards = hole | community
         rank, _ = evaluate_hand(cards)
         return 10 - rank  # Lower rank is stronger
@@ -65,38 +101,45 @@ class MinimaxBot:
         else:
             return ["call", "fold"]
 
+    # Expected value of an action over a batch of self.samples runouts: the pot plus the chips the action puts in
+    # are won on a win and lost on a loss, ties are worth 0
+    # the batch is drawn once per decision, so the actions are compared on the same runouts rather than on separate noise
     def simulate_action(self, hole, community, action, pot, current_bet):
-        from poker_main import evaluate_hand, choose_winner
         if action == "fold":
             return -pot  # Folding loses pot
 
-        # Simulate opponent hand and full board
-        opponent_hand = self.sample_opponent_hand(hole, community)
-        full_community = self.simulate_community_cards(hole, community, opponent_hand)
-
-        our_hand = hole | full_community
-        opp_hand = opponent_hand | full_community
-
-        our_score = evaluate_hand(our_hand)
-        opp_score = evaluate_hand(opp_hand)
-
-        result = choose_winner(our_score, opp_score)
-        if result == 1:
-            return pot  # win
-        elif result == -1:
-            return 0  # tie
-        else:
-            return -pot  # loss
+        stake = {"call": current_bet, "raise": current_bet + self.raise_size}.get(action, 0)
+        key = (frozenset(hole), frozenset(community))
+        if key not in self._batch:
+            # Simulate opponent hands and full boards
+            count = 2 + 5 - len(community)
+            runouts = [self.draw(hole | community, count) for _ in range(self.samples)]
+            wins, _, losses = showdown_batch(hole, community, runouts)
+            self._batch[key] = (wins, losses, len(runouts))
+        wins, losses, runouts = self._batch[key]
+        return (pot + stake) * (wins - losses) / runouts
+
+    # The unseen cards as a list, reused while the known cards stay the same
+    def remaining_deck(self, used) -> list:
+        used = frozenset(used)
+        if used != self._deck_used:
+            self._deck = [card for card in ALL_CARDS if card not in used]
+            self._deck_used = used
+        return self._deck
+
+    # count random unseen cards, picked with a partial Fisher-Yates shuffle of the buffer, so nothing is rebuilt
+    # (the buffer stays a permutation of the same cards, only its order changes)
+    def draw(self, used, count) -> list:
+        deck = self.remaining_deck(used)
+        last = len(deck) - 1
+        for i in range(count):
+            j = random.randint(i, last)
+            deck[i], deck[j] = deck[j], deck[i]
+        return deck[:count]
 
     def sample_opponent_hand(self, our_hand, community):
-        used = our_hand | community
-        deck = list(set(ALL_CARDS) - used)
-        random.shuffle(deck)
-        return set(deck[:2])
+        return set(self.draw(our_hand | community, 2))
 
     def simulate_community_cards(self, our_hand, community, opponent_hand):
         cards_needed = 5 - len(community)
-        used = our_hand | community | opponent_hand
-        deck = list(set(ALL_CARDS) - used)
-        random.shuffle(deck)
-        return community | set(deck[:cards_needed])
+        return community | set(self.draw(our_hand | community | opponent_hand, cards_needed))
@@ -1,103 +1,328 @@
 # Minimax.py
 
 import math
+import os
+import random
 import time
+from concurrent.futures import ProcessPoolExecutor, wait
+from functools import lru_cache
+import pushfold
+from game_state import GameState, BOARD_CARDS, NEXT_STREET, FOLDED
+from search_trace import SearchTrace
+from time_manager import TimeManager
+from poker_core import RANK_TO_VALUE, SUITS, evaluate_hand, choose_winner
+
+# Number of transposition table slots (power of two so the hash can be masked into an index)
+TT_SIZE = 1 << 16
+# Bound types stored with a transposition table value
+EXACT, LOWER, UPPER = 0, 1, 2
+# Depth recorded for terminal states, deeper than any search
+TERMINAL_DEPTH = 1 << 30
+
+# Half width of the aspiration window around the previous depth's score, widened to the full window on a fail
+ASPIRATION_WINDOW = 0.1
+# Killer moves remembered per ply
+KILLER_SLOTS = 2
+
+# Number of (hole, community) scores kept by card_strength
+CARD_CACHE_SIZE = 4096
+
+# Runouts (rest of the board plus an opponent hand) sampled per decision
+# chance nodes only deal cards from these, and leaves score our equity against them
+RUNOUT_SAMPLES = 16
+# Bounds on evaluate_state, needed by the Star1/Star2 chance node cutoffs
+VALUE_MIN, VALUE_MAX = -1.0, 1.0
+
+ALL_CARDS = [rank + suit for rank in "23456789TJQKA" for suit in "DCHS"]
+
+# Worker processes for parallel root search, shared by every bot in the process
+PARALLEL_WORKERS = os.cpu_count() or 1
+_pool = None
+# Each worker keeps one bot (and its transposition table) across jobs
+_worker_bot = None
+
+def get_pool():
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=PARALLEL_WORKERS)
+    return _pool
+
+# Runs in a worker: searches one root move's successor state with the bound found by the first move
+# returns (value, timed out, nodes searched)
+def search_root_move(job):
+    global _worker_bot
+    hole, state, depth, alpha, beta, runouts, initial_community, deadline = job
+    if _worker_bot is None:
+        _worker_bot = MinimaxBot(hole, initial_community, state.banks[0], show_tree=False, adaptive_time=False)
+    bot = _worker_bot
+    # a new decision (or a new hand) brings new runouts, so the per-board caches start over
+    if bot.runouts != runouts or bot.initial_community != initial_community or bot.hole != hole:
+        bot.hole_cards = set(hole)
+        bot.hole = hole
+        bot.runouts = runouts
+        bot.initial_community = initial_community
+        bot.board_needed = 5 - len(initial_community)
+        bot.runout_values = {}
+        bot.consistent = {}
+        bot.tt = [None] * TT_SIZE
+    bot.search_number += 1
+    bot.reset_stats()
+    bot.root_depth = depth + 1
+    bot.start_time = time.time()
+    bot.time_limit = deadline - bot.start_time
+    val, _ = bot._minimax(state, depth, False, alpha, beta)
+    return val, bot.timed_out, bot.nodes
+
+# Zobrist keys, generated once so the set of keys stays fixed however many hands are searched:
+# one random 64-bit number per card and per value of the fields with a handful of values,
+# and a random odd multiplier per numeric field, which is mixed into the hash arithmetically
+_zobrist_rng = random.Random(480)
+ZOBRIST_MASK = (1 << 64) - 1
+CARD_KEYS = {rank + suit: _zobrist_rng.getrandbits(64) for rank in RANK_TO_VALUE for suit in SUITS}
+ZOBRIST_KEYS = {(field, value): _zobrist_rng.getrandbits(64) for field, values in (
+    ("side", (True, False)),
+    ("street", tuple(NEXT_STREET) + ("showdown", FOLDED)),
+    ("checked", (True, False)),
+    ("folded", (None, 0, 1)),
+) for value in values}
+NUMERIC_FIELDS = ("min_bet", "current_bet", "pot", "bank0", "bank1", "street_put0", "street_put1")
+ZOBRIST_MULTIPLIERS = {field: _zobrist_rng.getrandbits(64) | 1 for field in NUMERIC_FIELDS}
+
+def zobrist_key(field, value):
+    return ZOBRIST_KEYS[(field, value)]
+
+# Chip amounts can be fractional after a split pot, so they're mixed in through hash(), which is the value itself for whole chips
+def zobrist_number(field, value):
+    return (hash(value) * ZOBRIST_MULTIPLIERS[field]) & ZOBRIST_MASK
+
+# Score in [-1, 1] for a (hole, community) pair, memoized across leaves, decisions and bots
+# hole and community must be frozensets so they can key the cache
+@lru_cache(maxsize=CARD_CACHE_SIZE)
+def card_strength(hole, community):
+    combined = hole | community
+
+    if len(combined) < 5:
+        # use a quick heuristic when we don't have full board yet
+        vals = [RANK_TO_VALUE[c[0]] for c in combined]
+        avg = sum(vals) / len(vals)
+        same_suit = (len({c[1] for c in combined}) == 1)
+        counts = {v: vals.count(v) for v in set(vals)}
+        pair_bonus = max(counts.values())
+
+        score = avg / max(RANK_TO_VALUE.values())
+        if same_suit:
+            score *= 1.25
+        if pair_bonus > 1:
+            score *= (1 + pair_bonus / 2)
+        raw = min(1, score)
+        return 2 * (raw - 0.5)
+
+    # full evaluator once we have 5+ cards
+    rank, _ = evaluate_hand(combined)
+    strength = (11 - rank) / 10  # rank=1 => 1.0, rank=10 => 0.1
+    return 2 * (strength - 0.5)
+
+# 1 if hole beats opp on the full board, 0.5 for a tie, 0 for a loss, memoized like card_strength
+@lru_cache(maxsize=CARD_CACHE_SIZE * 4)
+def showdown_value(hole, board, opp):
+    result = choose_winner(evaluate_hand(hole | board), evaluate_hand(opp | board))
+    return 0.5 if result == -1 else float(result)
 
 class MinimaxBot:
     """
-    Two-player minimax with α–β pruning and iterative deepening (time-limited).
-    If show_tree=True, prints the α–β tree after 1 s, then again fully for the last depth.
+    Two-player expectiminimax with α–β pruning and iterative deepening (time-limited), searching
+    the game_state forward model with us as player 0. Streets end on a call or two checks, then a
+    chance node deals the next cards from a fixed set of sampled runouts, pruned with Star1/Star2.
+    Search traces are only recorded for decisions that ask for one: every trace_every-th decision,
+    the next one after request_trace(), or every one if show_tree=True (which also prints it).
+    The last completed depth's trace is kept in last_trace and written to trace_path if given.
     """
-    def __init__(self, hand, community, bank, max_depth=None, show_tree=True):
+    def __init__(self, hand, community, bank, max_depth=None, show_tree=False, adaptive_time=True, time_manager=None, runout_samples=RUNOUT_SAMPLES, parallel=False,
+                 trace_every=0, trace_path=None):
         # stash hole cards, community cards, and bank
         self.hole_cards = set(hand)
         self.community_cards = set(community)
         self.bank = bank
+        # hole cards as a frozenset, as the leaf evaluation caches need
+        self.hole = frozenset(self.hole_cards)
 
-        # if True, we'll print the α–β tree after we finish iterative deepening
+        # if True, every decision is traced and its α–β tree printed afterwards
         self.show_tree = show_tree
-
-        # one-second time cutoff per move
+        # trace every n-th decision (0 = only on request), written to trace_path if set;
+        # "{decision}" in the path is replaced by the decision number so traces don't overwrite each other
+        self.trace_every = trace_every
+        self.trace_path = trace_path
+        self.trace_next = False
+        # trace being recorded by the current pass (None when not tracing), and the last completed one
+        self.trace = None
+        self.last_trace = None
+        self.decisions = 0
+
+        # one-second time cutoff per move, replaced per decision by the time manager if there is one
         self.time_limit = 1.0
         self.start_time = None
+        if time_manager is None and adaptive_time:
+            time_manager = TimeManager()
+        self.time_manager = time_manager
 
         # keep track of the best (score, move) found so far
         self.best_score_so_far = 0.0
         self.best_move_so_far = None
 
+        # transposition table shared by every depth of iterative deepening and every decision this hand
+        # slots hold (key, depth, bound, value, move, search number)
+        self.tt = [None] * TT_SIZE
+        self.use_tt = True
+        # bumped per decision so entries from earlier decisions are replaced first
+        self.search_number = 0
+        # set when a pass hits the time cutoff, whose values must not go into the table
+        self.timed_out = False
+
+        # runouts completing the board, sampled once per decision (see sample_runouts)
+        self.runout_samples = runout_samples
+        self.runouts = []
+        self.board_needed = 0
+        self.initial_community = frozenset(self.community_cards)
+        # community -> averaged leaf value, and community -> runouts consistent with it
+        self.runout_values = {}
+        self.consistent = {}
+        # move ordering: up to KILLER_SLOTS moves per ply that caused a cutoff, and a history score per
+        # (side, move) that grows with the depth of every cutoff it causes; both start over each decision
+        self.killers = {}
+        self.history = {}
+        # remaining depth at the root of the current pass, so a node's ply is root_depth - depth
+        self.root_depth = 0
+        # per-decision counters for measuring how well the search prunes (see search_stats)
+        self.reset_stats()
+
+        # if True, root moves after the first are searched concurrently in worker processes
+        self.parallel = parallel
+
     def change_bank(self, amount):
         self.bank += amount
 
+    # Asks for the next decision to be traced
+    def request_trace(self):
+        self.trace_next = True
+
+    def reset_stats(self):
+        self.nodes = 0
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0
+        self.tt_hits = 0
+        self.researches = 0
+        self.depth_reached = 0
+        self.timed_out = False
+
+    # Fraction of cutoffs caused by the first move searched, the usual measure of move ordering quality
+    def first_move_cutoff_rate(self):
+        return self.first_move_cutoffs / self.cutoffs if self.cutoffs else 0.0
+
+    def search_stats(self):
+        return {
+            "nodes": self.nodes,
+            "cutoffs": self.cutoffs,
+            "first_move_cutoff_rate": self.first_move_cutoff_rate(),
+            "tt_hits": self.tt_hits,
+            "researches": self.researches,
+            "depth": self.depth_reached,
+        }
+
+    def wants_trace(self):
+        return self.show_tree or self.trace_next or (self.trace_every > 0 and self.decisions % self.trace_every == 0)
+
     def choose_move(self, game_phase, minimum_bet, current_bet, pot, opponent_bank):
-        initial_state = (
+        # short stacks play the push/fold chart instead of searching
+        move = pushfold.short_stack_move(self.hole_cards, game_phase, minimum_bet, current_bet, self.bank, opponent_bank)
+        if move is not None:
+            return move
+        # we're player 0 and open every later street; a bet we face was put in by the opponent this street
+        initial_state = GameState(
             game_phase,
-            frozenset(self.hole_cards),
             frozenset(self.community_cards),
-            minimum_bet,
-            current_bet,
             pot,
-            opponent_bank,
-            self.bank
+            (self.bank, opponent_bank),
+            current_bet=current_bet,
+            street_put=(0, current_bet),
+            min_bet=minimum_bet
         )
+        self.hole = frozenset(self.hole_cards)
 
-        # remember if the user wanted the tree printed
-        want_tree = self.show_tree
+        self.decisions += 1
+        want_trace = self.wants_trace()
+        self.trace_next = False
+        completed_trace = None
 
         # reset timing and best-so-far
         self.start_time = time.time()
         self.best_score_so_far = 0.0
         self.best_move_so_far = None
+        self.search_number += 1
+        self.reset_stats()
+        self.killers = {}
+        self.history = {}
+        self.sample_runouts()
+        if self.time_manager is not None:
+            self.time_limit = self.time_manager.allocate(game_phase, pot, self.bank, opponent_bank)
 
         depth = 1
         last_completed_depth = 0
+        # best move found at each completed depth, so we can stop once it settles
+        best_moves = []
 
         # ───── ITERATIVE DEEPENING (1 s cutoff) ─────
         while True:
             if time.time() - self.start_time > self.time_limit:
                 break
 
-            # suppress tree printing during intermediate passes
-            self.show_tree = False
-
-            score, move = self._minimax(
-                state=initial_state,
-                depth=depth,
-                maximizing=True,
-                alpha=-math.inf,
-                beta=math.inf,
-                indent=""
-            )
+            # every pass is recorded, but only the deepest completed one is kept
+            self.trace = SearchTrace(self.decisions) if want_trace else None
+            self.root_depth = depth
+
+            if self.parallel:
+                score, move = self._parallel_root(initial_state, depth)
+            elif last_completed_depth == 0:
+                score, move = self._minimax(
+                    state=initial_state,
+                    depth=depth,
+                    maximizing=True,
+                    alpha=-math.inf,
+                    beta=math.inf
+                )
+            else:
+                score, move = self._aspiration(initial_state, depth, self.best_score_so_far, want_trace)
 
             # if we finished this depth in time, record it
             if time.time() - self.start_time <= self.time_limit:
                 self.best_score_so_far = score
                 self.best_move_so_far = move
                 last_completed_depth = depth
+                self.depth_reached = depth
                 depth += 1
+                best_moves.append(move)
+                if self.trace is not None:
+                    self.trace.info.update(depth=last_completed_depth, move=move, score=score)
+                    completed_trace = self.trace
+                if self.time_manager is not None and self.time_manager.settled(time.time() - self.start_time, self.time_limit, best_moves):
+                    break
             else:
                 # we ran out of time partway through, so ignore this result
                 break
 
-        # if user wants the tree and we have at least one completed depth:
-        if want_tree and self.best_move_so_far is not None:
-            # disable cutoff so the final tree prints fully
-            old_time_limit = self.time_limit
-            self.time_limit = float("inf")
-            self.show_tree = True
-
-            # re-run at last_completed_depth to print the full tree
-            self._minimax(
-                state=initial_state,
-                depth=last_completed_depth,
-                maximizing=True,
-                alpha=-math.inf,
-                beta=math.inf,
-                indent=""
-            )
-
-            # restore settings
-            self.show_tree = False
-            self.time_limit = old_time_limit
+        self.trace = None
+        elapsed = time.time() - self.start_time
+        print(f"Minimax searched {self.nodes} nodes to depth {last_completed_depth} in {elapsed:.2f}s ({self.nodes / max(elapsed, 1e-9):.0f} nodes/s), "
+              f"{self.cutoffs} cutoffs ({self.first_move_cutoff_rate() * 100:.0f}% on the first move), {self.researches} re-searches")
+        if self.time_manager is not None:
+            self.time_manager.charge(elapsed)
+
+        # the trace is only written out once the clock has stopped, so it never costs think time
+        if completed_trace is not None:
+            self.last_trace = completed_trace
+            if self.trace_path is not None:
+                completed_trace.write(str(self.trace_path).format(decision=self.decisions))
+            if self.show_tree:
+                print(completed_trace.render())
 
         # decide what to return
         if self.best_move_so_far is None:
@@ -119,138 +344,324 @@ class MinimaxBot:
         print(f"Decision: {decision}, Bet: ${amount}\n")
         return decision, amount
 
-    def _minimax(self, state, depth, maximizing, alpha, beta, indent):
+    # parent is the trace id of the node this one was reached from and move the move (or deal) that led here,
+    # both only used when the decision is being traced
+    def _minimax(self, state, depth, maximizing, alpha, beta, parent=None, move=None):
+        trace = self.trace
         # 1) time cutoff
         if time.time() - self.start_time > self.time_limit:
+            self.timed_out = True
             val = self.evaluate_state(state)
-            if self.show_tree:
-                print(f"{indent}└─ [Time cutoff eval] score={val:.4f}")
+            if trace is not None:
+                trace.close(trace.open(parent, move, "time", state.street, depth, alpha, beta), val)
             return val, None
 
-        phase, hole, community, min_bet, curr_bet, pot, opp_bank, bank = state
-
-        # 2) depth limit or terminal state
-        if depth == 0 or self.is_terminal(state):
+        self.nodes += 1
+        phase = state.street
+
+        # 2) transposition table: reuse a result searched at least this deep
+        key = self.hash_state(state, maximizing)
+        tt_move = None
+        if self.use_tt:
+            entry = self.tt[key & (TT_SIZE - 1)]
+            if entry is not None and entry[0] == key:
+                _, tt_depth, bound, tt_val, tt_move, _ = entry
+                if tt_depth >= depth:
+                    if bound == EXACT:
+                        self.tt_hits += 1
+                        if trace is not None:
+                            trace.close(trace.open(parent, move, "table", phase, depth, alpha, beta), tt_val)
+                        return tt_val, tt_move
+                    if bound == LOWER:
+                        alpha = max(alpha, tt_val)
+                    else:
+                        beta = min(beta, tt_val)
+                    if alpha >= beta:
+                        self.tt_hits += 1
+                        if trace is not None:
+                            trace.close(trace.open(parent, move, "table", phase, depth, alpha, beta), tt_val)
+                        return tt_val, tt_move
+
+        # 3) depth limit or terminal state
+        # terminal values don't depend on depth, so they're stored as deep as possible and reused by every pass
+        terminal = state.is_terminal()
+        if depth == 0 or terminal:
             val = self.evaluate_state(state)
-            if self.show_tree:
-                print(f"{indent}└─ [Leaf eval] phase={phase} score={val:.4f}")
+            if trace is not None:
+                trace.close(trace.open(parent, move, "terminal" if terminal else "leaf", phase, depth, alpha, beta), val)
+            if self.use_tt and not self.timed_out:
+                self.store(key, TERMINAL_DEPTH if terminal else 0, EXACT, val, None)
             return val, None
-
-        # 3) otherwise this is a decision node
-        if self.show_tree:
-            node_type = "Max" if maximizing else "Min"
-            print(f"{indent}{node_type} Node: phase={phase} depth={depth} α={alpha:.4f} β={beta:.4f}")
+        alpha_orig, beta_orig = alpha, beta
+
+        # 4) a street just closed, so deal the next cards
+        if state.needs_cards():
+            node = trace.open(parent, move, "chance", phase, depth, alpha, beta) if trace is not None else None
+            best_val = self._chance(state, depth, alpha, beta, node)
+            if trace is not None:
+                trace.close(node, best_val)
+            if self.use_tt and not self.timed_out:
+                bound = UPPER if best_val <= alpha_orig else LOWER if best_val >= beta_orig else EXACT
+                self.store(key, depth, bound, best_val, None)
+            return best_val, None
+
+        # 5) otherwise this is a decision node
+        node = trace.open(parent, move, "max" if maximizing else "min", phase, depth, alpha, beta) if trace is not None else None
+        cutoff = None
 
         best_move = None
         best_val = -math.inf if maximizing else math.inf
 
-        successors = self.get_successors(state)
-        for i, (move, next_state) in enumerate(successors):
-            is_last = (i == len(successors) - 1)
-            branch = "└─" if is_last else "├─"
-            if self.show_tree:
-                print(f"{indent}{branch} Try move {move}")
-
-            child_val, _ = self._minimax(
-                next_state,
-                depth - 1,
-                not maximizing,
-                alpha,
-                beta,
-                indent + ("   " if is_last else "|  ")
-            )
-
-            if self.show_tree:
-                print(f"{indent}{branch} Move {move} → score={child_val:.4f}")
+        ply = self.root_depth - depth
+        # without a table move, the root falls back to the previous pass's best move
+        if tt_move is None and ply == 0:
+            tt_move = self.best_move_so_far
+        # children are searched by playing each move on this state and taking it back afterwards
+        moves = self.order_moves(state.legal_actions(), tt_move, ply, maximizing)
+        for i, next_move in enumerate(moves):
+            record = state.apply(next_move)
+            child_val, _ = self._minimax(state, depth - 1, not maximizing, alpha, beta, node, next_move)
+            state.undo(record)
 
             if maximizing:
                 if child_val > best_val:
-                    best_val, best_move = child_val, move
+                    best_val, best_move = child_val, next_move
                 alpha = max(alpha, best_val)
                 if alpha >= beta:
-                    if self.show_tree:
-                        print(f"{indent}{branch} Prune (α={alpha:.4f} ≥ β={beta:.4f})")
-                    break
+                    cutoff = beta
             else:
                 if child_val < best_val:
-                    best_val, best_move = child_val, move
+                    best_val, best_move = child_val, next_move
                 beta = min(beta, best_val)
                 if beta <= alpha:
-                    if self.show_tree:
-                        print(f"{indent}{branch} Prune (β={beta:.4f} ≤ α={alpha:.4f})")
-                    break
-
-        return best_val, best_move
-
-    def get_successors(self, state):
-        phase, hole, community, min_bet, curr_bet, pot, opp_bank, bank = state
-        successors = []
-
-        # fold is always an option
-        successors.append((('fold', 0), self._apply_move(state, ('fold', 0))))
-
-        if curr_bet == 0:
-            # nobody has bet yet, so we can open the betting
-            for mul in (1, 2, 3):
-                amt = min(bank, min_bet * mul)
-                successors.append((('bet', amt), self._apply_move(state, ('bet', amt))))
-            successors.append((('check', 0), self._apply_move(state, ('check', 0))))
-        else:
-            # facing a bet: either call or raise
-            successors.append((('call', curr_bet), self._apply_move(state, ('call', curr_bet))))
-            for raise_amt in (curr_bet + min_bet, curr_bet + 2 * min_bet):
-                if raise_amt <= bank:
-                    successors.append((('raise', raise_amt), self._apply_move(state, ('raise', raise_amt))))
+                    cutoff = alpha
+            if cutoff is not None:
+                self.record_cutoff(next_move, i, ply, depth, maximizing)
+                break
 
-        return successors
+        if trace is not None:
+            trace.close(node, best_val, cutoff)
+        if self.use_tt and not self.timed_out:
+            if best_val <= alpha_orig:
+                bound = UPPER
+            elif best_val >= beta_orig:
+                bound = LOWER
+            else:
+                bound = EXACT
+            self.store(key, depth, bound, best_val, best_move)
 
-    def _apply_move(self, state, move):
-        phase, hole, community, min_bet, curr_bet, pot, opp_bank, bank = state
-        next_phase = phase
+        return best_val, best_move
 
-        if move[0] in ('call', 'check', 'bet', 'raise'):
-            amount = move[1]
-            bank -= amount
-            pot += amount
-            curr_bet = amount
-        elif move[0] == 'fold':
-            next_phase = 'terminal'
+    # Searches a narrow window around the previous depth's score, which prunes far more when the score
+    # barely moves, and re-searches with the full window when the result falls outside it
+    def _aspiration(self, state, depth, guess, want_trace):
+        alpha, beta = guess - ASPIRATION_WINDOW, guess + ASPIRATION_WINDOW
+        score, move = self._minimax(state, depth, True, alpha, beta)
+        if (score <= alpha or score >= beta) and not self.timed_out:
+            self.researches += 1
+            self.trace = SearchTrace(self.decisions) if want_trace else None
+            score, move = self._minimax(state, depth, True, -math.inf, math.inf)
+        return score, move
+
+    # Table (or previous best) move first, then this ply's killers, then the rest by history score
+    def order_moves(self, moves, tt_move, ply, maximizing):
+        killers = self.killers.get(ply, ())
+        history = self.history
+        def priority(move):
+            if move == tt_move:
+                return (0, 0)
+            if move in killers:
+                return (1, killers.index(move))
+            return (2, -history.get((maximizing, move), 0))
+        moves.sort(key=priority)
+        return moves
+
+    def record_cutoff(self, move, index, ply, depth, maximizing):
+        self.cutoffs += 1
+        if index == 0:
+            self.first_move_cutoffs += 1
+        killers = self.killers.setdefault(ply, [])
+        if move not in killers:
+            killers.insert(0, move)
+            del killers[KILLER_SLOTS:]
+        self.history[(maximizing, move)] = self.history.get((maximizing, move), 0) + depth * depth
+
+    # Young brothers wait at the root: the first move is searched here to establish alpha,
+    # then the remaining moves are searched at once in worker processes with that bound
+    def _parallel_root(self, state, depth):
+        if depth == 0 or state.is_terminal() or state.needs_cards():
+            return self._minimax(state, depth, True, -math.inf, math.inf)
+        successors = self.get_successors(state)
+        if self.best_move_so_far is not None:
+            successors.sort(key=lambda successor: successor[0] != self.best_move_so_far)
+
+        # only the serial part of the search is traced, worker results show up as single nodes
+        trace = self.trace
+        node = trace.open(None, None, "max", state.street, depth, -math.inf, math.inf) if trace is not None else None
+        first_move, first_state = successors[0]
+        best_val, _ = self._minimax(first_state, depth - 1, False, -math.inf, math.inf, node, first_move)
+        best_move = first_move
+        if self.timed_out or len(successors) == 1:
+            if trace is not None:
+                trace.close(node, best_val)
+            return best_val, best_move
+
+        deadline = self.start_time + self.time_limit
+        futures = [(move, get_pool().submit(search_root_move, (self.hole, next_state, depth - 1, best_val, math.inf, self.runouts, self.initial_community, deadline)))
+                   for move, next_state in successors[1:]]
+        timeout = max(0.0, deadline - time.time()) if deadline != math.inf else None
+        done, not_done = wait([future for _, future in futures], timeout=timeout)
+        for future in not_done:
+            future.cancel()
+        if not_done:
+            self.timed_out = True
+        # a move only replaces the first one if it beats alpha, in which case its value is exact
+        for move, future in futures:
+            if future not in done:
+                continue
+            val, timed_out, nodes = future.result()
+            self.nodes += nodes
+            self.timed_out = self.timed_out or timed_out
+            if trace is not None:
+                trace.close(trace.open(node, move, "worker", state.street, depth - 1, best_val, math.inf), val)
+            if val > best_val:
+                best_val, best_move = val, move
+        if trace is not None:
+            trace.close(node, best_val)
+        return best_val, best_move
 
-        return (next_phase, hole, community, min_bet, curr_bet, pot, opp_bank, bank)
+    # Expected value over the sampled deals, with Star2 probing followed by Star1 cutoffs
+    # the player to act after the deal (us) is the maximizer, so probing one move of each child
+    # gives a lower bound on that child, and values are bounded by [VALUE_MIN, VALUE_MAX]
+    def _chance(self, state, depth, alpha, beta, node=None):
+        deals = self.deals(state.board, BOARD_CARDS[state.street] - len(state.board))
+        if not deals:
+            return self.evaluate_state(state)
+        children = []
+        for p, cards in deals:
+            child = state.clone()
+            child.deal(cards)
+            children.append((p, cards, child))
+
+        # Star2: a single move searched from every child may already prove a fail high
+        lower = [self._probe(child, depth, node, cards) for _, cards, child in children]
+        rest_lower = sum(p * lb for (p, _, _), lb in zip(children, lower))
+        if rest_lower >= beta:
+            return rest_lower
+
+        # Star1: narrow each child's window by what the other children can still add
+        total, rest_prob = 0.0, 1.0
+        for (p, cards, child), lb in zip(children, lower):
+            rest_prob -= p
+            rest_lower -= p * lb
+            child_alpha = (alpha - total - rest_prob * VALUE_MAX) / p
+            child_beta = (beta - total - rest_lower) / p
+            val, _ = self._minimax(child, depth, True, max(child_alpha, VALUE_MIN), min(child_beta, VALUE_MAX), node, cards)
+            total += p * val
+            if val <= child_alpha:
+                return total + rest_prob * VALUE_MAX
+            if val >= child_beta:
+                return total + rest_lower
+        return total
+
+    # Lower bound on a max node from searching only its first (table ordered) move, VALUE_MIN if it can't be probed
+    def _probe(self, state, depth, node=None, cards=None):
+        if depth == 0 or state.is_terminal() or state.needs_cards():
+            return VALUE_MIN
+        moves = state.legal_actions()
+        entry = self.tt[self.hash_state(state, True) & (TT_SIZE - 1)] if self.use_tt else None
+        if entry is not None and entry[4] is not None:
+            moves.sort(key=lambda move: move != entry[4])
+        # traced straight under the chance node, labelled with the deal being probed
+        record = state.apply(moves[0])
+        val, _ = self._minimax(state, depth - 1, False, VALUE_MIN, VALUE_MAX, node, cards)
+        state.undo(record)
+        return val
+
+    # Samples the fixed runouts for this decision: the board cards still to come in deal order,
+    # followed by the opponent's two hole cards
+    def sample_runouts(self):
+        self.initial_community = frozenset(self.community_cards)
+        remaining = [card for card in ALL_CARDS if card not in self.hole_cards and card not in self.community_cards]
+        self.board_needed = 5 - len(self.community_cards)
+        self.runouts = [tuple(random.sample(remaining, self.board_needed + 2)) for _ in range(self.runout_samples)]
+        self.runout_values = {}
+        self.consistent = {}
+
+    # Runouts whose first cards are exactly the ones dealt onto the board during the search
+    def consistent_runouts(self, community):
+        runouts = self.consistent.get(community)
+        if runouts is None:
+            dealt = community - self.initial_community
+            runouts = self.consistent[community] = [r for r in self.runouts if set(r[:len(dealt)]) == dealt]
+        return runouts
+
+    # (probability, cards) for each distinct deal of num_cards the sampled runouts make from this board
+    def deals(self, community, num_cards):
+        runouts = self.consistent_runouts(community)
+        dealt = len(community) - len(self.initial_community)
+        counts = {}
+        for r in runouts:
+            cards = frozenset(r[dealt:dealt + num_cards])
+            counts[cards] = counts.get(cards, 0) + 1
+        return [(count / len(runouts), cards) for cards, count in counts.items()]
+
+    def hash_state(self, state, maximizing):
+        key = zobrist_key("side", maximizing)
+        for card in state.board:
+            key ^= CARD_KEYS[card]
+        key ^= zobrist_key("street", state.street)
+        key ^= zobrist_key("checked", state.checked)
+        key ^= zobrist_key("folded", state.folded)
+        key ^= zobrist_number("min_bet", state.min_bet)
+        key ^= zobrist_number("current_bet", state.current_bet)
+        key ^= zobrist_number("pot", state.pot)
+        key ^= zobrist_number("bank0", state.banks[0])
+        key ^= zobrist_number("bank1", state.banks[1])
+        key ^= zobrist_number("street_put0", state.street_put[0])
+        key ^= zobrist_number("street_put1", state.street_put[1])
+        return key
+
+    # Depth-preferred replacement, except entries left over from an earlier decision always give way
+    def store(self, key, depth, bound, value, move):
+        index = key & (TT_SIZE - 1)
+        entry = self.tt[index]
+        if entry is None or entry[0] == key or entry[5] != self.search_number or depth >= entry[1]:
+            self.tt[index] = (key, depth, bound, value, move, self.search_number)
+
+    # (move, next state) for every legal move, each child a separate copy of the state
+    def get_successors(self, state):
+        return [(move, state.child(move)) for move in state.legal_actions()]
 
     def is_terminal(self, state):
-        phase = state[0]
-        return (phase == 'terminal') or (phase == 'R')
+        return state.is_terminal()
+
+    # True when the street has advanced but its cards haven't been dealt yet
+    def is_chance(self, state):
+        return state.needs_cards()
 
     def evaluate_state(self, state):
-        from poker_main import evaluate_hand, RANK_TO_VALUE
-
-        _, hole, community, *_ = state
-        combined = set(hole) | set(community)
-
-        if len(combined) < 5:
-            # use a quick heuristic when we don't have full board yet
-            vals = [RANK_TO_VALUE[c[0]] for c in combined]
-            avg = sum(vals) / len(vals)
-            same_suit = (len({c[1] for c in combined}) == 1)
-            counts = {v: vals.count(v) for v in set(vals)}
-            pair_bonus = max(counts.values())
-
-            score = avg / max(RANK_TO_VALUE.values())
-            if same_suit:
-                score *= 1.25
-            if pair_bonus > 1:
-                score *= (1 + pair_bonus / 2)
-            raw = min(1, score)
-            return 2 * (raw - 0.5)
-
-        # full evaluator once we have 5+ cards
-        rank, _ = evaluate_hand(combined)
-        strength = (11 - rank) / 10  # rank=1 => 1.0, rank=10 => 0.1
-        return 2 * (strength - 0.5)
+        # a fold ends the hand for sure, whatever the cards
+        if state.folded is not None:
+            return VALUE_MIN if state.folded == 0 else VALUE_MAX
+        # otherwise leaves only differ in betting, so the score depends on the board alone: our equity against
+        # the sampled runouts consistent with it, mapped to [-1, 1] and computed once per board
+        hole, community = self.hole, state.board
+        value = self.runout_values.get(community)
+        if value is None:
+            runouts = self.consistent_runouts(community) if self.runouts else []
+            if runouts:
+                dealt = len(community) - len(self.initial_community)
+                equity = sum(showdown_value(hole, community.union(r[dealt:self.board_needed]), frozenset(r[self.board_needed:]))
+                             for r in runouts) / len(runouts)
+                value = 2 * equity - 1
+            else:
+                # no runouts sampled (search driven outside choose_move), fall back to the card heuristic
+                value = card_strength(hole, community)
+            self.runout_values[community] = value
+        return value
 
     def bet_strategy(self, game_phase, current_bet, pot, win_rate, min_bet, opponent_bank):
-        from poker_main import evaluate_hand, RANK_TO_VALUE
 
         w = min(win_rate, 0.99)
         total = pot + current_bet
@@ -0,0 +1,306 @@
+"""
+Offline CFR+ solver that regenerates the GTOBot charts (data/preflop_hunl.json, flop_hunl.json, turn_hunl.json
+and river_hunl.json).
+
+Each chart is solved as its own abstracted heads-up game, using the positions, action labels and sizes GTOBot
+plays with:
+    - Preflop, the players' hands are the 169 hand classes, weighted by their number of combos. The SB opens,
+      limps or folds, and the BB answers an open with 3bet/call/fold and a limp with raise/check/fold. The hand
+      ends at a preflop showdown.
+    - Postflop, the hands are the five equity buckets, weighted by how often random hands land in them
+      according to ehs_table. The SB bets, checks or folds, and the BB answers a bet with raise/call/fold.
+      Checks go straight to showdown.
+Showdowns use a Bradley-Terry win probability between the two hands' equities against a random hand (the MCTS
+opening book for hand classes, the bucket centers for buckets), so no card removal is modelled.
+
+The solver is vectorized over hands: every decision node keeps its regrets and strategy sums as NumPy arrays
+of shape (hands, actions), and one pass over the small public game tree updates every infoset of that node at
+once. Regrets are floored at zero and strategies averaged linearly (CFR+). The four games are sharded over
+worker processes, and each one checkpoints its arrays to data/cfr_checkpoints/ so a run can be resumed.
+
+Usage: python cfr_solver.py [iterations]
+"""
+import json
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+import GTO
+import ehs_table
+
+DATA_DIR = Path(__file__).parent / "data"
+CHECKPOINT_DIR = DATA_DIR / "cfr_checkpoints"
+SEED = 480
+ITERATIONS = 2000
+CHECKPOINT_EVERY = 250
+# Random situations per street used to weigh the equity buckets
+PRIOR_SAMPLES = 4000
+# Samples per hand class for its equity against a random hand when there is no MCTS opening book
+EQUITY_SAMPLES = 300
+
+# Preflop sizes in minimum bets (the blinds are 1 and 2), as GTOBot.preflop_action plays them
+OPEN_TO = 3
+LIMP_TO = 2
+THREEBET_MULTIPLE = 3
+RAISE_VS_LIMP = 4
+# Postflop sizes as a fraction of the pot, which starts at 1 with each player having put in half
+BET_FRACTION = 0.66
+
+STREET_NAMES = ("flop", "turn", "river")
+
+# Game trees: decision nodes are (name, player, [(action, child)]), terminals are ("fold", folder, puts) or
+# ("showdown", puts), where puts are the chips (SB, BB) have put into the pot. Player 0 is the SB.
+def preflop_tree():
+    threebet = OPEN_TO * THREEBET_MULTIPLE
+    return ("root", 0, [
+        ("open", ("vs_open", 1, [
+            ("3bet", ("vs_3bet", 0, [
+                ("call", ("showdown", (threebet, threebet))),
+                ("fold", ("fold", 0, (OPEN_TO, threebet))),
+            ])),
+            ("call", ("showdown", (OPEN_TO, OPEN_TO))),
+            ("fold", ("fold", 1, (OPEN_TO, 2))),
+        ])),
+        ("limp", ("vs_limp", 1, [
+            ("raise", ("vs_raise", 0, [
+                ("call", ("showdown", (RAISE_VS_LIMP, RAISE_VS_LIMP))),
+                ("fold", ("fold", 0, (LIMP_TO, RAISE_VS_LIMP))),
+            ])),
+            ("check", ("showdown", (LIMP_TO, LIMP_TO))),
+            ("fold", ("fold", 1, (LIMP_TO, 2))),
+        ])),
+        ("fold", ("fold", 0, (1, 2))),
+    ])
+
+def postflop_tree():
+    bet = BET_FRACTION
+    # GTOBot raises to the current bet plus BET_FRACTION of the pot
+    raise_to = bet + BET_FRACTION * (1 + bet)
+    return ("root", 0, [
+        ("bet", ("vs_bet", 1, [
+            ("raise", ("vs_raise", 0, [
+                ("call", ("showdown", (0.5 + raise_to, 0.5 + raise_to))),
+                ("fold", ("fold", 0, (0.5 + bet, 0.5 + raise_to))),
+            ])),
+            ("call", ("showdown", (0.5 + bet, 0.5 + bet))),
+            ("fold", ("fold", 1, (0.5 + bet, 0.5))),
+        ])),
+        ("check", ("showdown", (0.5, 0.5))),
+        ("fold", ("fold", 0, (0.5, 0.5))),
+    ])
+
+# P(hand i beats hand j) from each hand's equity against a random hand
+def win_matrix(equities) -> np.ndarray:
+    e = np.asarray(equities, dtype=float)
+    a, b = e[:, None] * (1 - e[None, :]), e[None, :] * (1 - e[:, None])
+    return np.where(a + b > 0, a / np.maximum(a + b, 1e-12), 0.5)
+
+class CFRGame:
+    def __init__(self, name, tree, win, priors):
+        self.name = name
+        self.tree = tree
+        # win[i, j] is the probability SB hand i beats BB hand j, priors[p] the weight of each of player p's hands
+        self.win = win
+        self.priors = [np.asarray(p, dtype=float) / np.sum(p) for p in priors]
+        self.regrets, self.strategy_sums = {}, {}
+        self.iteration = 0
+        self.index_nodes(tree)
+
+    def index_nodes(self, node):
+        if node[0] in ("fold", "showdown"):
+            return
+        name, player, edges = node
+        shape = (len(self.priors[player]), len(edges))
+        self.regrets[name] = np.zeros(shape)
+        self.strategy_sums[name] = np.zeros(shape)
+        for _, child in edges:
+            self.index_nodes(child)
+
+    # Regret matching: play in proportion to positive regret, uniformly if there is none
+    def strategy(self, name) -> np.ndarray:
+        positive = self.regrets[name]
+        total = positive.sum(axis=1, keepdims=True)
+        return np.where(total > 0, positive / np.where(total > 0, total, 1), 1.0 / positive.shape[1])
+
+    def average_strategy(self, name) -> np.ndarray:
+        sums = self.strategy_sums[name]
+        total = sums.sum(axis=1, keepdims=True)
+        return np.where(total > 0, sums / np.where(total > 0, total, 1), 1.0 / sums.shape[1])
+
+    # Value of a terminal node for every hand of player p, against the opponent's hands weighted by opponent_weight
+    def terminal_value(self, node, opponent_weight, p):
+        if node[0] == "showdown":
+            sb_put, bb_put = node[1]
+            # SB's winnings: its share of the pot minus what it put in (equal puts at a showdown)
+            sb_utility = (sb_put + bb_put) * self.win - sb_put
+            return sb_utility @ opponent_weight if p == 0 else -(sb_utility.T @ opponent_weight)
+        _, folder, (sb_put, bb_put) = node
+        sb_utility = bb_put if folder == 1 else -sb_put
+        utility = sb_utility if p == 0 else -sb_utility
+        return np.full(len(self.priors[p]), utility * opponent_weight.sum())
+
+    # Counterfactual values of every hand of player p below node, given each player's reach probabilities
+    def traverse(self, node, reach, p):
+        if node[0] in ("fold", "showdown"):
+            return self.terminal_value(node, self.priors[1 - p] * reach[1 - p], p)
+
+        name, player, edges = node
+        strategy = self.strategy(name)
+        if player != p:
+            value = 0.0
+            for a, (_, child) in enumerate(edges):
+                child_reach = list(reach)
+                child_reach[player] = reach[player] * strategy[:, a]
+                value = value + self.traverse(child, child_reach, p)
+            return value
+
+        values = np.empty_like(strategy)
+        for a, (_, child) in enumerate(edges):
+            child_reach = list(reach)
+            child_reach[player] = reach[player] * strategy[:, a]
+            values[:, a] = self.traverse(child, child_reach, p)
+        node_value = (strategy * values).sum(axis=1)
+        # CFR+: regrets are floored at zero, the average strategy weights iteration t by t
+        self.regrets[name] = np.maximum(self.regrets[name] + values - node_value[:, None], 0)
+        self.strategy_sums[name] += self.iteration * reach[player][:, None] * strategy
+        return node_value
+
+    # One CFR+ iteration, updating the two players in turn
+    def iterate(self):
+        self.iteration += 1
+        for p in (0, 1):
+            self.traverse(self.tree, [np.ones(len(prior)) for prior in self.priors], p)
+
+    def checkpoint_path(self, directory=CHECKPOINT_DIR) -> Path:
+        return directory / f"{self.name}.npz"
+
+    def save(self, directory=CHECKPOINT_DIR):
+        directory.mkdir(parents=True, exist_ok=True)
+        arrays = {f"regret/{name}": array for name, array in self.regrets.items()}
+        arrays.update({f"strategy/{name}": array for name, array in self.strategy_sums.items()})
+        np.savez(self.checkpoint_path(directory), iteration=self.iteration, **arrays)
+
+    # Resumes from a checkpoint if there is one for this game with the same shapes, returns True if it did
+    def load(self, directory=CHECKPOINT_DIR) -> bool:
+        path = self.checkpoint_path(directory)
+        if not path.exists():
+            return False
+        with np.load(path) as data:
+            for name in self.regrets:
+                if data[f"regret/{name}"].shape != self.regrets[name].shape:
+                    return False
+            for name in self.regrets:
+                self.regrets[name] = data[f"regret/{name}"]
+                self.strategy_sums[name] = data[f"strategy/{name}"]
+            self.iteration = int(data["iteration"])
+        return True
+
+    # Runs up to iterations in total, checkpointing to directory if one is given
+    def solve(self, iterations, checkpoint_every=CHECKPOINT_EVERY, directory=None):
+        while self.iteration < iterations:
+            self.iterate()
+            if directory is not None and (self.iteration % checkpoint_every == 0 or self.iteration == iterations):
+                self.save(directory)
+
+# Equity against a random hand for every hand class, from the MCTS opening book when it's there
+def class_equities() -> list[float]:
+    import MCTS
+    book = json.loads(MCTS.BOOK_FILE.read_text())["hands"] if MCTS.BOOK_FILE.exists() else {}
+    rng = random.Random(SEED)
+    equities = []
+    for key in GTO.HAND_CLASSES:
+        entry = book.get(key)
+        if entry and entry["visits"]:
+            equities.append(entry["wins"] / entry["visits"])
+        else:
+            import tune_mcts
+            cards = next([a, b] for a in GTO.CARDS for b in GTO.CARDS if a != b and GTO.hand_key({a, b}) == key)
+            equities.append(tune_mcts.sampled_equity(set(cards), set(), EQUITY_SAMPLES, rng))
+    return equities
+
+def class_combos() -> list[int]:
+    return [6 if len(key) == 2 else 4 if key[2] == "s" else 12 for key in GTO.HAND_CLASSES]
+
+# How often a random hand lands in each equity bucket on a street with board_size cards
+def bucket_priors(board_size: int) -> list[float]:
+    rng = random.Random(SEED + board_size)
+    counts = dict.fromkeys(GTO.BUCKETS, 1)
+    for _ in range(PRIOR_SAMPLES):
+        cards = rng.sample(GTO.CARDS, 2 + board_size)
+        bucket = ehs_table.lookup(set(cards[:2]), set(cards[2:]))
+        if bucket is not None:
+            counts[bucket] += 1
+    return [counts[bucket] for bucket in GTO.BUCKETS]
+
+def build_games() -> list[CFRGame]:
+    combos = class_combos()
+    games = [CFRGame("preflop", preflop_tree(), win_matrix(class_equities()), (combos, combos))]
+    bucket_win = win_matrix(ehs_table.SEEDS)
+    for street, board_size in zip(STREET_NAMES, (3, 4, 5)):
+        priors = bucket_priors(board_size)
+        games.append(CFRGame(street, postflop_tree(), bucket_win, (priors, priors)))
+    return games
+
+# Runs in a worker: solves one game (resuming from its checkpoint) and returns its average strategies
+def solve_game(job):
+    game, iterations, directory = job
+    resumed = game.load(directory)
+    start = game.iteration
+    game.solve(iterations, directory=directory)
+    print(f"{game.name}: iterations {start}-{game.iteration}{' (resumed)' if resumed else ''}")
+    return game.name, {name: game.average_strategy(name) for name in game.regrets}
+
+# Strategy row as a chart entry, rounded to 2 places with the rounding error given to the largest action
+def chart_entry(actions, row) -> dict:
+    probs = [round(float(p), 2) for p in row]
+    probs[int(np.argmax(probs))] += round(1.0 - sum(probs), 2)
+    return {action: round(p, 2) for action, p in zip(actions, probs)}
+
+def export_charts(strategies: dict, directory=DATA_DIR) -> dict:
+    charts = {}
+    pre = strategies["preflop"]
+    # the SB's entries carry its answer to the BB's raise as well: preflop how often it calls a 3-bet and a raise
+    # over its limp (see GTO.sb_raise_calls), postflop its call/fold against a raise next to its bet/check
+    charts["preflop"] = {
+        "SB": {key: {**chart_entry(("open", "limp", "fold"), pre["root"][i]),
+                     "call": chart_entry(("call", "fold"), pre["vs_3bet"][i])["call"],
+                     "call_vs_raise": chart_entry(("call", "fold"), pre["vs_raise"][i])["call"]}
+               for i, key in enumerate(GTO.HAND_CLASSES)},
+        "BB": {key: {"vs_open": chart_entry(("3bet", "call", "fold"), pre["vs_open"][i]),
+                     "vs_limp": chart_entry(("raise", "check", "fold"), pre["vs_limp"][i])}
+               for i, key in enumerate(GTO.HAND_CLASSES)},
+    }
+    for street in STREET_NAMES:
+        post = strategies[street]
+        charts[street] = {
+            "SB": {bucket: {**chart_entry(("bet", "check"), post["root"][i][:2] / post["root"][i][:2].sum()),
+                            **chart_entry(("call", "fold"), post["vs_raise"][i])}
+                   for i, bucket in enumerate(GTO.BUCKETS)},
+            "BB": {bucket: chart_entry(("raise", "call", "fold"), post["vs_bet"][i]) for i, bucket in enumerate(GTO.BUCKETS)},
+        }
+    for street, chart in charts.items():
+        (directory / GTO.CHART_FILES[street]).write_text(format_chart(chart))
+    return charts
+
+# One hand or bucket per line, like the hand-written charts
+def format_chart(chart: dict) -> str:
+    positions = []
+    for position, entries in chart.items():
+        lines = [f"    {json.dumps(key)}: {json.dumps(entry)}" for key, entry in entries.items()]
+        positions.append(f'  "{position}": {{\n' + ",\n".join(lines) + "\n  }")
+    return "{\n" + ",\n".join(positions) + "\n}\n"
+
+def solve(iterations=ITERATIONS, workers=None, checkpoint_dir=CHECKPOINT_DIR, chart_dir=DATA_DIR) -> dict:
+    games = build_games()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        strategies = dict(pool.map(solve_game, [(game, iterations, checkpoint_dir) for game in games]))
+    return export_charts(strategies, chart_dir)
+
+if __name__ == "__main__":
+    start_time = time.time()
+    solve(int(sys.argv[1]) if len(sys.argv) > 1 else ITERATIONS)
+    print(f"Solved and exported the charts in {time.time() - start_time:.0f}s")
@@ -0,0 +1,165 @@
+"""
+Offline job that builds the postflop hand strength bucket table GTOBot looks its equity bucket up in.
+
+Every (hole, board) situation is reduced to a canonical key: the street, the made hand class, whether the
+hole cards improve on the board, how many hole cards are at least as high as the board's top card, and
+whether there is a flush or straight draw. The job samples random situations per street, estimates expected
+hand strength (EHS) and its second moment (EHS², which rewards draws whose strength varies a lot with the
+runout) against a random hand, averages them per key and clusters the keys into the five GTO equity buckets
+with a weighted k-means. The bucket ids are written one byte per key to data/ehs_buckets.bin, which
+GTOBot memory-maps, so postflop decisions are a key computation and a byte lookup with no sampling.
+
+Usage: python ehs_table.py [situations per street]
+"""
+import mmap
+import random
+import sys
+import time
+from pathlib import Path
+from poker_core import RANK_TO_VALUE, evaluate_hand, choose_winner
+
+TABLE_FILE = Path(__file__).parent / "data" / "ehs_buckets.bin"
+SEED = 480
+# Random situations sampled per street
+SITUATIONS = 40000
+# Runouts per situation, and opponent hands per runout
+RUNOUTS = 6
+OPPONENTS = 6
+# Bucket labels in the order of the bucket ids, strongest first, and the EHS each cluster starts from
+BUCKETS = ("very_strong", "strong", "medium", "weak", "very_weak")
+SEEDS = (0.92, 0.75, 0.52, 0.3, 0.1)
+KMEANS_ROUNDS = 50
+
+STREETS = {3: 0, 4: 1, 5: 2}
+# Key layout: street x made hand class (royal flush merged into straight flush) x improves x high cards x flush draw x straight draw
+KEY_SHAPE = (3, 9, 2, 3, 2, 2)
+TABLE_SIZE = 3 * 9 * 2 * 3 * 2 * 2
+# Byte written for keys no situation was sampled for, looked up as a miss
+UNKNOWN = 255
+
+DECK = [r + s for r in "23456789TJQKA" for s in "DCHS"]
+
+def canonical_key(hole: set[str], board: set[str]) -> int:
+    cards = hole | board
+    made = max(evaluate_hand(cards)[0], 2) - 2
+    improves = int(evaluate_hand(board)[0] > made + 2)
+    top = max(RANK_TO_VALUE[card[0]] for card in board)
+    high = sum(RANK_TO_VALUE[card[0]] >= top for card in hole)
+
+    flush_draw = straight_draw = 0
+    if len(board) < 5:
+        # four to a flush using at least one hole card
+        suits = [card[1] for card in cards]
+        flush_draw = int(any(suits.count(card[1]) == 4 for card in hole))
+        # four ranks inside some five rank window (ace counts low too)
+        values = {RANK_TO_VALUE[card[0]] for card in cards}
+        if 14 in values:
+            values.add(1)
+        straight_draw = int(any(len(values & set(range(low, low + 5))) == 4 for low in range(1, 11)))
+
+    key = 0
+    for value, size in zip((STREETS[len(board)], made, improves, high, flush_draw, straight_draw), KEY_SHAPE):
+        key = key * size + value
+    return key
+
+# (EHS, EHS²) of hole on board against a uniformly random hand, estimated over sampled runouts and opponents
+def hand_strength(hole: set[str], board: set[str], rng: random.Random) -> tuple[float, float]:
+    remaining = [card for card in DECK if card not in hole and card not in board]
+    needed = 5 - len(board)
+    runouts = RUNOUTS if needed else 1
+    ehs = ehs2 = 0.0
+    for _ in range(runouts):
+        cards = rng.sample(remaining, needed + 2 * OPPONENTS)
+        full_board = board.union(cards[:needed])
+        rank, kickers = evaluate_hand(hole | full_board)
+        wins = 0.0
+        for i in range(OPPONENTS):
+            opp = cards[needed + 2 * i:needed + 2 * i + 2]
+            # choose_winner consumes the kicker lists, so each comparison gets its own copy
+            result = choose_winner((rank, list(kickers)), evaluate_hand(full_board.union(opp)))
+            wins += 0.5 if result == -1 else float(result)
+        strength = wins / OPPONENTS
+        ehs += strength
+        ehs2 += strength * strength
+    return ehs / runouts, ehs2 / runouts
+
+# Weighted 1-D k-means over the per key scores (see build_table), seeded so cluster i lines up with BUCKETS[i]
+def cluster(points: list[tuple[float, float, int]]) -> list[int]:
+    centers = list(SEEDS)
+    for _ in range(KMEANS_ROUNDS):
+        assign = [min(range(len(centers)), key=lambda c: abs(score - centers[c])) for score, _, _ in points]
+        totals, weights = [0.0] * len(centers), [0] * len(centers)
+        for (score, _, count), c in zip(points, assign):
+            totals[c] += score * count
+            weights[c] += count
+        new_centers = [totals[c] / weights[c] if weights[c] else centers[c] for c in range(len(centers))]
+        if new_centers == centers:
+            break
+        centers = new_centers
+    # relabel so the strongest cluster is bucket 0 even if the centers crossed
+    order = sorted(range(len(centers)), key=lambda c: -centers[c])
+    rank = {c: i for i, c in enumerate(order)}
+    return [rank[c] for c in assign]
+
+def build_table(situations=SITUATIONS, path=TABLE_FILE) -> bytes:
+    rng = random.Random(SEED)
+    sums = {}
+    for board_size in STREETS:
+        for _ in range(situations):
+            cards = rng.sample(DECK, 2 + board_size)
+            hole, board = set(cards[:2]), set(cards[2:])
+            ehs, ehs2 = hand_strength(hole, board, rng)
+            key = canonical_key(hole, board)
+            total = sums.setdefault(key, [0.0, 0.0, 0])
+            total[0] += ehs
+            total[1] += ehs2
+            total[2] += 1
+        print(f"{board_size} card boards: {len(sums)} keys seen so far")
+
+    keys = sorted(sums)
+    points = []
+    for key in keys:
+        ehs, ehs2, count = sums[key]
+        ehs, ehs2 = ehs / count, ehs2 / count
+        # potential: EHS² - EHS^2 is the variance of the strength over runouts, and drawing hands have a lot of it
+        points.append((ehs + (ehs2 - ehs * ehs), ehs2, count))
+    table = bytearray([UNKNOWN] * TABLE_SIZE)
+    for key, bucket in zip(keys, cluster(points)):
+        table[key] = bucket
+    path.write_bytes(bytes(table))
+    return bytes(table)
+
+# Memory-mapped table, opened on first lookup; None if it hasn't been built
+_table = None
+_table_loaded = False
+
+def load_table(path=TABLE_FILE):
+    global _table, _table_loaded
+    if not _table_loaded:
+        _table_loaded = True
+        if path.exists() and path.stat().st_size == TABLE_SIZE:
+            with open(path, "rb") as f:
+                _table = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return _table
+
+# Bucket label for hole on board, or None if there's no table or the situation was never sampled
+def lookup(hole: set[str], board: set[str]):
+    table = load_table()
+    if table is None or len(board) not in STREETS:
+        return None
+    return bucket_of(canonical_key(hole, board))
+
+# Bucket label of a canonical key, or None if there's no table or the key was never sampled
+def bucket_of(key: int):
+    table = load_table()
+    if table is None:
+        return None
+    bucket = table[key]
+    return BUCKETS[bucket] if bucket != UNKNOWN else None
+
+if __name__ == "__main__":
+    situations = int(sys.argv[1]) if len(sys.argv) > 1 else SITUATIONS
+    start_time = time.time()
+    table = build_table(situations)
+    counts = [table.count(bucket) for bucket in range(len(BUCKETS))]
+    print(f"Built bucket table in {time.time() - start_time:.0f}s, keys per bucket: {dict(zip(BUCKETS, counts))}")
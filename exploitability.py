@@ -0,0 +1,127 @@
+"""
+Exploitability of the chart-driven bots, measured with a best response in the abstracted games cfr_solver solves.
+
+A bot's strategy tables become per node arrays of action probabilities (hands x actions) that play the way the
+bot does: GTOBot samples its JSON charts (including the leftover probability the last action soaks up, and
+folding wherever the charts say nothing), and basicBot always checks or calls.
+For each seat the best response walks the game tree once. At the bot's nodes the range that reaches each
+child is passed on, at the responder's nodes every hand takes its best action, and terminal payoffs are
+range-vs-range matrix products, so a full evaluation takes seconds instead of millions of simulated hands.
+
+Exploitability is what the best response wins per hand averaged over both seats, reported in milli big blinds
+per hand (mbb/hand). Postflop games are measured in pots, converted at REFERENCE_POT_BB.
+
+Usage: python exploitability.py [gto|basic] [directory to write the best-response charts to]
+"""
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+import GTO
+import cfr_solver
+from GTO import chart_probs
+
+# Preflop games are measured in minimum bets, and the big blind is two of them
+PREFLOP_UNITS_PER_BB = 2
+# Postflop games are measured in pots; this is the pot in big blinds after the SB opens to 3 minimum bets and the BB calls
+REFERENCE_POT_BB = 3
+
+# (player, actions) of every decision node in a game tree, by node name
+def decision_nodes(node, nodes=None) -> dict:
+    nodes = {} if nodes is None else nodes
+    if node[0] not in ("fold", "showdown"):
+        name, player, edges = node
+        nodes[name] = (player, [action for action, _ in edges])
+        for _, child in edges:
+            decision_nodes(child, nodes)
+    return nodes
+
+def pure(action, actions) -> list[float]:
+    return [float(a == action) for a in actions]
+
+# GTOBot's strategy in one of cfr_solver's games, played from the charts in directory
+def gto_strategies(game, directory=GTO.DATA_DIR) -> dict:
+    actions = {name: node_actions for name, (_, node_actions) in decision_nodes(game.tree).items()}
+    rows = {name: [] for name in actions}
+    if game.name == "preflop":
+        chart = GTO.load_json_chart(GTO.CHART_FILES["preflop"], directory)
+        for key in GTO.HAND_CLASSES:
+            sb, bb = chart.get("SB", {}).get(key), chart.get("BB", {}).get(key)
+            # hands the chart doesn't list fold everywhere, and the SB calls raises as GTO.sb_raise_calls reads its entry
+            if sb and all(isinstance(p, (int, float)) for p in sb.values()):
+                rows["root"].append(chart_probs({k: v for k, v in sb.items() if k in actions["root"]} or {"fold": 1.0}, actions["root"]))
+                vs_3bet, vs_raise = GTO.sb_raise_calls(sb)
+                rows["vs_3bet"].append(chart_probs(vs_3bet, actions["vs_3bet"]))
+                rows["vs_raise"].append(chart_probs(vs_raise, actions["vs_raise"]))
+            else:
+                for name in ("root", "vs_3bet", "vs_raise"):
+                    rows[name].append(pure("fold", actions[name]))
+            rows["vs_open"].append(chart_probs(bb.get("vs_open", {"fold": 1.0}), actions["vs_open"]) if bb else pure("fold", actions["vs_open"]))
+            rows["vs_limp"].append(chart_probs(bb.get("vs_limp", {"check": 1.0}), actions["vs_limp"]) if bb else pure("fold", actions["vs_limp"]))
+    else:
+        chart = GTO.load_json_chart(GTO.CHART_FILES[game.name], directory)
+        for bucket in GTO.BUCKETS:
+            sb = chart.get("SB", {}).get(bucket, {"fold": 1.0})
+            bb = chart.get("BB", {}).get(bucket, {"fold": 1.0})
+            # the same split into unopened and facing-a-bet entries GTO.compile_charts makes
+            unopened = {k: v for k, v in sb.items() if k in ("bet", "check")} or {"check": 1.0}
+            sb_facing = {k: v for k, v in sb.items() if k in ("call", "fold")} or {"fold": 1.0}
+            bb_facing = {k: v for k, v in bb.items() if k in ("call", "raise", "fold")} or {"fold": 1.0}
+            rows["root"].append(chart_probs(unopened, actions["root"]))
+            rows["vs_bet"].append(chart_probs(bb_facing, actions["vs_bet"]))
+            rows["vs_raise"].append(chart_probs(sb_facing, actions["vs_raise"]))
+    return {name: np.array(row) for name, row in rows.items()}
+
+# basicBot's strategy: check when it can, call otherwise (a limp is its preflop call)
+def basic_strategies(game) -> dict:
+    strategies = {}
+    for name, (player, actions) in decision_nodes(game.tree).items():
+        passive = next(action for action in ("check", "call", "limp") if action in actions)
+        strategies[name] = np.tile(pure(passive, actions), (len(game.priors[player]), 1))
+    return strategies
+
+# Best response of player to strategies: its value per hand (in the game's units) and its pure strategy
+def best_response(game, strategies: dict, player: int) -> tuple[float, dict]:
+    response = {}
+    def walk(node, reach):
+        if node[0] in ("fold", "showdown"):
+            return game.terminal_value(node, game.priors[1 - player] * reach, player)
+        name, mover, edges = node
+        if mover == player:
+            values = np.stack([walk(child, reach) for _, child in edges], axis=1)
+            response[name] = np.eye(len(edges))[values.argmax(axis=1)]
+            return values.max(axis=1)
+        strategy = strategies[name]
+        return sum(walk(child, reach * strategy[:, a]) for a, (_, child) in enumerate(edges))
+    values = walk(game.tree, np.ones(len(game.priors[1 - player])))
+    return float(values @ game.priors[player]), response
+
+def to_mbb(game, value: float) -> float:
+    if game.name == "preflop":
+        return 1000 * value / PREFLOP_UNITS_PER_BB
+    return 1000 * value * REFERENCE_POT_BB
+
+# Exploitability in mbb/hand of every game, and the best response to each (both seats in one strategy dict)
+def exploitability(strategies_for=gto_strategies, games=None) -> dict:
+    results = {}
+    for game in games or cfr_solver.build_games():
+        strategies = strategies_for(game)
+        sb_value, sb_response = best_response(game, strategies, 0)
+        bb_value, bb_response = best_response(game, strategies, 1)
+        results[game.name] = (to_mbb(game, (sb_value + bb_value) / 2), {**sb_response, **bb_response})
+    return results
+
+if __name__ == "__main__":
+    bot = sys.argv[1] if len(sys.argv) > 1 else "gto"
+    start_time = time.time()
+    results = exploitability(basic_strategies if bot == "basic" else gto_strategies)
+    for name, (mbb, _) in results.items():
+        print(f"{name:>8}: {mbb:9.1f} mbb/hand")
+    print(f"Evaluated in {time.time() - start_time:.1f}s")
+    if len(sys.argv) > 2:
+        directory = Path(sys.argv[2])
+        directory.mkdir(parents=True, exist_ok=True)
+        cfr_solver.export_charts({name: response for name, (_, response) in results.items()}, directory)
+        print(f"Wrote the best-response charts to {directory}")
@@ -0,0 +1,125 @@
+"""
+Background review of the folds in a poker_main run: how many chips each fold saved or lost against calling and
+checking the hand down.
+
+At the moment of a fold the folder's equity against the opponent's actual hand is computed by enumerating every
+remaining runout of the board (990 on the flop, 44 on the turn, 1 on the river). Preflop there are 1.7 million
+runouts, about half a minute of evaluation per fold, so preflop equity is looked up by hand class in the all-in
+equity matrix pushfold.py builds (data/preflop_equity.bin), and only estimated from PREFLOP_SAMPLES seeded random
+runouts when that table hasn't been built. Calling would have paid the amount owed (all in if the folder is short, with the uncalled
+part of the bet going back) and won the resulting pot with that equity, so
+
+    EV of calling = equity * (pot after the call) - chips paid
+
+and a fold saved that many chips when it's negative and lost them when it's positive. Later betting is ignored,
+so this is showdown EV, the same yardstick the old fold accuracy used, but exact instead of one random runout.
+
+Postflop equities are computed in a process pool, so the hand loop only hands the fold over and never waits on
+it; results are added up per bot and street as they come in, and close() waits for the last ones. At most
+MAX_IN_FLIGHT folds are reviewed at once: when the pool falls behind, further folds are counted as dropped
+instead of queueing, so memory stays flat and close() never has a backlog to work through.
+"""
+import itertools
+import random
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import pushfold
+from poker_core import evaluate_hand, choose_winner, SUITS
+
+DECK = [rank + suit for rank in "23456789TJQKA" for suit in SUITS]
+# Random runouts a preflop fold's equity is estimated from
+PREFLOP_SAMPLES = 20000
+# Folds being reviewed in the pool at once, beyond which folds are dropped from the review
+MAX_IN_FLIGHT = 64
+STAGES = ("PF", "F", "T", "R")
+
+# Equity of hole against the opponent's hole on the board (ties count half), over every runout, or over
+# `samples` seeded random runouts when the board is empty
+def fold_equity(hole, opponent, board, samples=PREFLOP_SAMPLES, seed=0) -> float:
+    live = [card for card in DECK if card not in hole and card not in opponent and card not in board]
+    missing = 5 - len(board)
+    if board or missing == 0:
+        runouts = itertools.combinations(live, missing)
+    else:
+        rng = random.Random(seed)
+        runouts = (rng.sample(live, missing) for _ in range(samples))
+    wins = 0.0
+    count = 0
+    for runout in runouts:
+        cards = set(board).union(runout)
+        result = choose_winner(evaluate_hand(set(hole) | cards), evaluate_hand(set(opponent) | cards))
+        wins += 0.5 if result == -1 else bool(result)
+        count += 1
+    return wins / count
+
+# Chips calling down would have won (positive: the fold lost them) given the pot and what the folder owed
+def call_ev(equity, pot, owed, bank) -> float:
+    paid = min(owed, bank)
+    # a short call gets the part of the bet it can't match back
+    return equity * (pot - owed + 2 * paid) - paid
+
+class FoldReview:
+    def __init__(self, workers=None, max_in_flight=MAX_IN_FLIGHT):
+        self.pool = ProcessPoolExecutor(max_workers=workers)
+        self.lock = threading.Lock()
+        # per bot and street: [folds reviewed, folds that saved chips, chips saved (negative: lost)]
+        self.totals = {}
+        self.errors = 0
+        self.in_flight = 0
+        self.max_in_flight = max_in_flight
+        self.dropped = 0
+
+    # Reviews a preflop fold from the equity table on the spot, and hands any other fold to the pool, returning straight away
+    def submit(self, bot, stage, hole, opponent, board, pot, owed, bank):
+        if not board:
+            equity = pushfold.preflop_equity(hole, opponent)
+            if equity is not None:
+                self.record(bot, stage, equity, pot, owed, bank)
+                return
+        with self.lock:
+            if self.in_flight >= self.max_in_flight:
+                self.dropped += 1
+                return
+            self.in_flight += 1
+        seed = random.getrandbits(32)
+        future = self.pool.submit(fold_equity, frozenset(hole), frozenset(opponent), frozenset(board), PREFLOP_SAMPLES, seed)
+        future.add_done_callback(lambda done: self.finish(bot, stage, done, pot, owed, bank))
+
+    # Runs on the pool's result thread as each equity comes in
+    def finish(self, bot, stage, future, pot, owed, bank):
+        with self.lock:
+            self.in_flight -= 1
+        try:
+            equity = future.result()
+        except Exception:
+            with self.lock:
+                self.errors += 1
+            return
+        self.record(bot, stage, equity, pot, owed, bank)
+
+    def record(self, bot, stage, equity, pot, owed, bank):
+        with self.lock:
+            saved = -call_ev(equity, pot, owed, bank)
+            totals = self.totals.setdefault(bot, {s: [0, 0, 0.0] for s in STAGES})[stage]
+            totals[0] += 1
+            totals[1] += saved >= 0
+            totals[2] += saved
+
+    # Waits for the folds still being reviewed
+    def close(self):
+        self.pool.shutdown(wait=True)
+
+    def summary(self, bot) -> str:
+        with self.lock:
+            stages = self.totals.get(bot)
+            dropped = self.dropped
+        if not stages or not any(folds for folds, _, _ in stages.values()):
+            return f"{bot} model did not fold"
+        folds = sum(s[0] for s in stages.values())
+        good = sum(s[1] for s in stages.values())
+        saved = sum(s[2] for s in stages.values())
+        per_stage = ", ".join(f"{stage}: {s[0]} folds {s[2]:+.1f}" for stage, s in stages.items() if s[0])
+        return (f"Fold review for {bot} model: {good / folds * 100:.1f} % of {folds} folds saved chips against calling down, "
+                f"{saved:+.1f} chips saved in total ({saved / folds:+.2f} per fold). Per stage: {per_stage}"
+                + (f". {dropped} folds (all bots) skipped while the review was behind" if dropped else ""))
@@ -0,0 +1,200 @@
+"""
+Forward model of the heads-up betting rules used by poker_main, shared by the game engine and the search bots.
+
+A GameState holds only the public state of a hand (street, board, pot, stacks, bets and who is to act), so
+cloning it copies a handful of fields. Search bots either clone states or apply a move in place and undo it
+afterwards with the record apply() returns.
+
+Rules (matching poker_bot_template.py):
+    - Player 0 posts the small blind (min_bet) and player 1 the big blind (2 * min_bet). The blinds are dead
+      money, so pre-flop opens with nothing to call, like every other street.
+    - The first player (player 0 in the engine) acts first on every street.
+    - With nothing to call a player can check or bet, facing a bet they can call or raise. Bet and raise
+      amounts are the total bet for the street, so a call or raise only pays the difference to what the
+      player already put in this street. Anyone can fold.
+    - A call, or a check after a check, closes the street. Once a player is all in the remaining streets
+      are dealt without betting.
+"""
+
+STREETS = ("PF", "F", "T", "R")
+NEXT_STREET = {"PF": "F", "F": "T", "T": "R", "R": "showdown"}
+# Community cards on the board during each street
+BOARD_CARDS = {"PF": 0, "F": 3, "T": 4, "R": 5, "showdown": 5}
+# Street of a hand that ended with a fold
+FOLDED = "terminal"
+
+# Bet sizes (multiples of the minimum bet) and raise steps (minimum bets above the current bet) offered to search
+BET_MULTIPLES = (1, 2, 3)
+RAISE_STEPS = (1, 2)
+
+class GameState:
+    __slots__ = ("street", "board", "pot", "banks", "street_put", "put", "current_bet", "to_act", "first", "checked", "folded", "min_bet")
+
+    def __init__(self, street, board, pot, banks, current_bet=0, to_act=0, first=0, checked=False, street_put=(0, 0), put=(0, 0), min_bet=1, folded=None):
+        self.street = street
+        # frozenset of community cards
+        self.board = board
+        self.pot = pot
+        # stacks behind, chips put in this street and chips put in this hand, indexed by player
+        self.banks = banks
+        self.street_put = street_put
+        self.put = put
+        # the total bet to match this street
+        self.current_bet = current_bet
+        self.to_act = to_act
+        # player who opens every street
+        self.first = first
+        # True once the first player to act this street has checked
+        self.checked = checked
+        # player who folded, if the hand ended that way
+        self.folded = folded
+        self.min_bet = min_bet
+
+    # Posts the blinds from banks, which must already be known to cover them
+    @classmethod
+    def start_hand(cls, banks, min_bet):
+        blinds = (min_bet, 2 * min_bet)
+        return cls("PF", frozenset(), sum(blinds), (banks[0] - blinds[0], banks[1] - blinds[1]), put=blinds, min_bet=min_bet)
+
+    def clone(self):
+        state = GameState.__new__(GameState)
+        state.street = self.street
+        state.board = self.board
+        state.pot = self.pot
+        state.banks = self.banks
+        state.street_put = self.street_put
+        state.put = self.put
+        state.current_bet = self.current_bet
+        state.to_act = self.to_act
+        state.first = self.first
+        state.checked = self.checked
+        state.folded = self.folded
+        state.min_bet = self.min_bet
+        return state
+
+    # Hashable snapshot of everything that affects play from here on
+    def key(self):
+        return (self.street, self.board, self.pot, self.banks, self.street_put, self.current_bet, self.to_act, self.checked, self.folded, self.min_bet)
+
+    def is_terminal(self):
+        return self.street == FOLDED or self.street == "showdown"
+
+    # True when the street has advanced but its cards haven't been dealt yet
+    def needs_cards(self):
+        return self.street in BOARD_CARDS and len(self.board) < BOARD_CARDS[self.street]
+
+    def to_call(self):
+        return self.current_bet - self.street_put[self.to_act]
+
+    def legal_actions(self, bet_multiples=BET_MULTIPLES, raise_steps=RAISE_STEPS):
+        player = self.to_act
+        bank = self.banks[player]
+        actions = [("fold", 0)]
+        if self.current_bet == 0:
+            for amount in dict.fromkeys(min(bank, self.min_bet * mul) for mul in bet_multiples):
+                if amount > 0:
+                    actions.append(("bet", amount))
+            actions.append(("check", 0))
+        else:
+            actions.append(("call", self.current_bet))
+            # nobody can raise an opponent who is already all in
+            if self.banks[1 - player] > 0:
+                for step in raise_steps:
+                    amount = self.current_bet + step * self.min_bet
+                    if amount - self.street_put[player] <= bank:
+                        actions.append(("raise", amount))
+        return actions
+
+    # Maps any (action, amount) a bot returns onto the closest legal move
+    def legalize(self, move):
+        action, amount = move
+        player = self.to_act
+        most = self.banks[player] + self.street_put[player]
+        facing = self.current_bet > self.street_put[player]
+        if action == "fold":
+            return ("fold", 0)
+        if action in ("bet", "raise") and amount > self.current_bet and most > self.current_bet and self.banks[1 - player] > 0:
+            return ("raise" if facing else "bet", min(amount, most))
+        if facing:
+            return ("call", self.current_bet)
+        return ("check", 0)
+
+    # Plays a legal move in place and returns the record undo() needs to take it back
+    def apply(self, move):
+        record = (self.street, self.pot, self.banks, self.street_put, self.put, self.current_bet, self.to_act, self.checked, self.folded)
+        action, amount = move
+        player = self.to_act
+        if action == "fold":
+            self.folded = player
+            self.street = FOLDED
+        elif action == "check":
+            if self.checked:
+                self.close_street()
+            else:
+                self.checked = True
+                self.to_act = 1 - player
+        elif action == "call":
+            # a short stack calls all in and the uncalled part of the bet goes back to the bettor
+            owed = self.current_bet - self.street_put[player]
+            paid = min(owed, self.banks[player])
+            self.pay(player, paid)
+            if paid < owed:
+                self.pay(1 - player, paid - owed)
+            self.close_street()
+        else:
+            self.pay(player, min(amount - self.street_put[player], self.banks[player]))
+            self.current_bet = self.street_put[player]
+            self.checked = False
+            self.to_act = 1 - player
+        return record
+
+    def undo(self, record):
+        self.street, self.pot, self.banks, self.street_put, self.put, self.current_bet, self.to_act, self.checked, self.folded = record
+
+    # New state after a move, leaving this one untouched
+    def child(self, move):
+        state = self.clone()
+        state.apply(move)
+        return state
+
+    # Adds dealt community cards and returns the old board for undeal()
+    def deal(self, cards):
+        board = self.board
+        self.board = board | cards
+        return board
+
+    def undeal(self, board):
+        self.board = board
+
+    def pay(self, player, amount):
+        if player == 0:
+            self.banks = (self.banks[0] - amount, self.banks[1])
+            self.street_put = (self.street_put[0] + amount, self.street_put[1])
+            self.put = (self.put[0] + amount, self.put[1])
+        else:
+            self.banks = (self.banks[0], self.banks[1] - amount)
+            self.street_put = (self.street_put[0], self.street_put[1] + amount)
+            self.put = (self.put[0], self.put[1] + amount)
+        self.pot += amount
+
+    def close_street(self):
+        # once someone is all in there's nothing left to bet, so the board runs out to showdown
+        if self.banks[0] == 0 or self.banks[1] == 0:
+            self.street = "showdown"
+        else:
+            self.street = NEXT_STREET[self.street]
+        self.current_bet = 0
+        self.street_put = (0, 0)
+        self.checked = False
+        self.to_act = self.first
+
+    # Chips player wins (positive) or loses over the hand once it's over
+    # result is poker_core.choose_winner's verdict for player 0 at showdown (1 win, 0 loss, -1 tie), unused after a fold
+    def payoff(self, player, result=None):
+        if self.folded is not None:
+            won = self.pot if self.folded != player else 0
+        elif result == -1:
+            won = self.pot / 2
+        else:
+            won = self.pot if bool(result) == (player == 0) else 0
+        return won - self.put[player]
@@ -0,0 +1,153 @@
+"""
+Round-robin league between the bots in poker_main.CLASS_TO_NAME, with Elo ratings and adaptive scheduling.
+
+A league game is the driver's game: the two bots alternate positions and play hands through poker_main.main until
+one of them is broke, or until MAX_HANDS hands, when the bigger bank wins (equal banks draw). After every game the
+ratings are refitted to all results so far as a Bradley-Terry model on the Elo scale, with a standard error per
+bot, and the league reports each rating with a 95% confidence interval.
+
+Games aren't spread evenly over the pairings. Every pairing plays MIN_GAMES so all bots get rated, then the next
+game always goes to the least decided of the pairings next to each other in the ranking, where a pairing is
+decided once the 95% Wilson interval of its head-to-head score excludes an even split. Lopsided matchups
+are decided in a few games and stop using CPU, and the league stops as soon as every adjacent pairing is
+decided, or after MAX_GAMES games.
+
+Usage: python league.py [max games] [bot names...]
+"""
+import contextlib
+import io
+import itertools
+import math
+import sys
+import time
+
+import poker_main
+from poker_main import CLASS_TO_NAME, Deck, STARTING_MONEY
+
+NAME_TO_CLASS = {name: cls for cls, name in CLASS_TO_NAME.items()}
+MAX_HANDS = 300
+MIN_GAMES = 2
+MAX_GAMES = 60
+# Normal quantile of the 95% intervals
+Z = 1.96
+ELO_SCALE = 400 / math.log(10)
+# Virtual draw every bot gets against every other, so a pairing with only wins doesn't rate infinitely apart
+PRIOR_DRAWS = 1
+
+# Plays one league game and returns name_a's score: 1 for a win, 0 for a loss, 0.5 for a draw
+def play_game(name_a, name_b, starting_money=STARTING_MONEY, max_hands=MAX_HANDS):
+    banks = {name_a: starting_money, name_b: starting_money}
+    for hand in range(max_hands):
+        first, second = (name_a, name_b) if hand % 2 == 0 else (name_b, name_a)
+        # poker_main.main deals from the module's deck, like the driver's loop
+        poker_main.deck = Deck()
+        hand1, hand2 = poker_main.deck.deal_pre_flop()
+        p1 = NAME_TO_CLASS[first](hand1, set(), banks[first])
+        p2 = NAME_TO_CLASS[second](hand2, set(), banks[second])
+        stages = {"PF": 0, "F": 0, "T": 0, "R": 0}
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = poker_main.main(p1, p2, dict(stages), dict(stages), 0, 0, first, second,
+                                     [[0, 0], [0, 0], [0, 0]], [[0, 0], [0, 0], [0, 0]])
+        banks[first], banks[second] = result[0], result[1]
+        if banks[first] <= 0 or banks[second] <= 0:
+            break
+    if banks[name_a] == banks[name_b]:
+        return 0.5
+    return 1.0 if banks[name_a] > banks[name_b] else 0.0
+
+class League:
+    def __init__(self, names=None, min_games=MIN_GAMES, max_games=MAX_GAMES, z=Z):
+        self.names = list(names or NAME_TO_CLASS)
+        self.pairings = list(itertools.combinations(self.names, 2))
+        # (score of the first bot of the pairing, games) per pairing
+        self.results = {pairing: [0.0, 0] for pairing in self.pairings}
+        self.min_games = min_games
+        self.max_games = max_games
+        self.z = z
+        self.games = 0
+
+    def record(self, pairing, score):
+        self.results[pairing][0] += score
+        self.results[pairing][1] += 1
+        self.games += 1
+
+    # Bradley-Terry strengths by minorization-maximization (Hunter 2004), as Elo ratings centred on 0,
+    # and each rating's standard error from the diagonal of the Fisher information
+    def ratings(self, rounds=200):
+        strength = dict.fromkeys(self.names, 1.0)
+        wins = dict.fromkeys(self.names, 0.0)
+        games = {}
+        for (a, b), (score, n) in self.results.items():
+            wins[a] += score + PRIOR_DRAWS / 2
+            wins[b] += n - score + PRIOR_DRAWS / 2
+            games[a, b] = games[b, a] = n + PRIOR_DRAWS
+        for _ in range(rounds):
+            for name in self.names:
+                denominator = sum(games[name, other] / (strength[name] + strength[other]) for other in self.names if other != name)
+                strength[name] = wins[name] / denominator
+            mean_log = sum(math.log(s) for s in strength.values()) / len(strength)
+            strength = {name: s / math.exp(mean_log) for name, s in strength.items()}
+        ratings, errors = {}, {}
+        for name in self.names:
+            ratings[name] = ELO_SCALE * math.log(strength[name])
+            information = sum(games[name, other] * strength[name] * strength[other] / (strength[name] + strength[other]) ** 2
+                              for other in self.names if other != name)
+            errors[name] = ELO_SCALE / math.sqrt(information)
+        return ratings, errors
+
+    # How far the Wilson interval of a pairing's score clears 0.5 (negative while the pairing is undecided)
+    def margin(self, pairing) -> float:
+        score, n = self.results[pairing]
+        if n == 0:
+            return -0.5
+        mean = score / n
+        center = (mean + self.z ** 2 / (2 * n)) / (1 + self.z ** 2 / n)
+        spread = self.z * math.sqrt(mean * (1 - mean) / n + self.z ** 2 / (4 * n * n)) / (1 + self.z ** 2 / n)
+        return center - spread - 0.5 if mean > 0.5 else 0.5 - center - spread
+
+    # Pairings of bots next to each other in the current ranking
+    def adjacent(self):
+        ratings, _ = self.ratings()
+        ranking = sorted(self.names, key=lambda name: -ratings[name])
+        return [pairing for pairing in self.pairings if abs(ranking.index(pairing[0]) - ranking.index(pairing[1])) == 1]
+
+    def resolved(self) -> bool:
+        if any(n < self.min_games for _, n in self.results.values()):
+            return False
+        return all(self.margin(pairing) > 0 for pairing in self.adjacent())
+
+    # Pairing to play next: the least played one until they all have min_games, then the least decided adjacent one
+    def next_pairing(self):
+        fewest = min(self.pairings, key=lambda pairing: self.results[pairing][1])
+        if self.results[fewest][1] < self.min_games:
+            return fewest
+        return min(self.adjacent(), key=lambda pairing: (self.margin(pairing), self.results[pairing][1]))
+
+    def run(self, play=play_game, report=print):
+        while self.games < self.max_games and not self.resolved():
+            pairing = self.next_pairing()
+            # the two bots take turns being the first player of a game
+            a, b = pairing if self.results[pairing][1] % 2 == 0 else pairing[::-1]
+            start = time.time()
+            score = play(a, b)
+            self.record(pairing, score if a == pairing[0] else 1 - score)
+            report(f"game {self.games}: {a} vs {b} -> {score:g} ({time.time() - start:.1f}s)")
+        return self.standings()
+
+    def standings(self) -> str:
+        ratings, errors = self.ratings()
+        lines = [f"{'bot':<8} {'elo':>6} {'95% ci':>16} {'games':>6}"]
+        for name in sorted(self.names, key=lambda name: -ratings[name]):
+            low, high = ratings[name] - self.z * errors[name], ratings[name] + self.z * errors[name]
+            games = sum(n for pairing, (_, n) in self.results.items() if name in pairing)
+            lines.append(f"{name:<8} {ratings[name]:6.0f} {f'[{low:.0f}, {high:.0f}]':>16} {games:6d}")
+        lines.append("")
+        for (a, b), (score, n) in self.results.items():
+            lines.append(f"{a} vs {b}: {score:g}/{n}")
+        lines.append(f"{'Resolved' if self.resolved() else 'Not resolved'} after {self.games} games")
+        return "\n".join(lines)
+
+if __name__ == "__main__":
+    max_games = int(sys.argv[1]) if len(sys.argv) > 1 else MAX_GAMES
+    league = League(sys.argv[2:] or None, max_games=max_games)
+    print(league.run())
@@ -0,0 +1,61 @@
+"""
+Offline job that builds the preflop opening book for the MCTS bot.
+Runs a long MCTS search for a representative hand of each of the 169 preflop hand classes
+and saves the root statistics plus the most visited flops to data/preflop_book_mcts.json.
+
+Usage: python mcts_book.py [seconds per hand class] [flops kept per hand class]
+"""
+import json
+import sys
+import time
+
+import MCTS
+
+RANKS = "AKQJT98765432"
+# Seconds of search per hand class
+BOOK_SIM_TIME = 3
+# Number of most visited flops stored per hand class for warm starting
+BOOK_FLOPS = 8
+
+# Representative hole cards for each hand class, keyed the same way as GTO.hand_key
+def hand_classes() -> dict[str, list[str]]:
+    classes = {}
+    for i, high in enumerate(RANKS):
+        for low in RANKS[i:]:
+            if high == low:
+                classes[high * 2] = [high + "S", low + "H"]
+            else:
+                classes[high + low + "s"] = [high + "S", low + "S"]
+                classes[high + low + "o"] = [high + "S", low + "H"]
+    return classes
+
+def build_book(sim_time=BOOK_SIM_TIME, num_flops=BOOK_FLOPS, path=MCTS.BOOK_FILE) -> dict:
+    old_sim_time = MCTS.SIM_TIME
+    MCTS.SIM_TIME = sim_time
+    hands = {}
+    try:
+        for key, cards in hand_classes().items():
+            bot = MCTS.MCTS(set(cards), set(), 0, use_book=False)
+            root = bot.search()
+            flops = sorted(root.children.values(), key=lambda child: child.visits, reverse=True)[:num_flops]
+            hands[key] = {
+                "cards": cards,
+                "wins": round(root.wins, 1),
+                "visits": root.visits,
+                "flops": [sorted(flop.key) + [round(flop.wins, 1), flop.visits] for flop in flops],
+            }
+            print(f"{key}: {root.wins / root.visits * 100:.1f}% over {root.visits} playouts")
+    finally:
+        MCTS.SIM_TIME = old_sim_time
+    book = {"sim_time": sim_time, "hands": hands}
+    # One hand class per line keeps the file small but still diffable
+    lines = [f"  {json.dumps(key)}: {json.dumps(entry, separators=(',', ':'))}" for key, entry in hands.items()]
+    path.write_text('{"sim_time": ' + json.dumps(sim_time) + ', "hands": {\n' + ",\n".join(lines) + "\n}}\n")
+    return book
+
+if __name__ == "__main__":
+    sim_time = float(sys.argv[1]) if len(sys.argv) > 1 else BOOK_SIM_TIME
+    num_flops = int(sys.argv[2]) if len(sys.argv) > 2 else BOOK_FLOPS
+    start_time = time.time()
+    build_book(sim_time, num_flops)
+    print(f"Built opening book in {time.time() - start_time:.0f}s")
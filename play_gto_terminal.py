@@ -1,6 +1,7 @@
+import asyncio
 import random
 from GTO import GTOBot
-from poker_main import evaluate_hand, choose_winner
+from poker_core import evaluate_hand, choose_winner
 
 RANKS = "23456789TJQKA"
 SUITS = "DCHS"
@@ -15,34 +16,46 @@ def deal(deck, n):
         hand.add(deck.pop())
     return hand
 
-def user_action(valid, current_bet, min_bet, pot):
+# The hand is played through an io object, so the same flow runs in this terminal and in play_server.py:
+#   say(text) shows a line to the player, await ask(prompt) reads their answer,
+#   await decide(bot, *choose_move args) gets the bot's move
+class TerminalIO:
+    def say(self, text):
+        print(text)
+
+    async def ask(self, prompt):
+        return input(prompt)
+
+    async def decide(self, bot, *args):
+        return bot.choose_move(*args)
+
+async def user_action(io, valid, current_bet, min_bet, pot):
     while True:
-        print(f"Valid actions: {valid}")
-        act = input("Your move: ").strip().lower()
+        io.say(f"Valid actions: {valid}")
+        act = (await io.ask("Your move: ")).strip().lower()
         if act in valid:
             if act in ("bet", "raise"):
-                amt = input(f"Enter amount to {act} (minimum {min_bet}, pot is {pot}): ")
+                amt = await io.ask(f"Enter amount to {act} (minimum {min_bet}, pot is {pot}): ")
                 try:
                     amt = int(amt)
                     if amt >= min_bet:
                         return act, amt
                 except ValueError:
-                    print("Enter a valid number.")
+                    io.say("Enter a valid number.")
             elif act == "call":
                 return act, current_bet
             else:
                 return act, 0
-        print("Invalid action.")
+        io.say("Invalid action.")
 
-def print_status(stage, user_hand, comm, pot):
-    print(f"\n--- {stage.upper()} ---")
-    print(f"Your hand: {show(user_hand)}")
-    print(f"Board: {show(comm)}")
-    print(f"Pot: {pot}")
+def print_status(io, stage, user_hand, comm, pot):
+    io.say(f"\n--- {stage.upper()} ---")
+    io.say(f"Your hand: {show(user_hand)}")
+    io.say(f"Board: {show(comm)}")
+    io.say(f"Pot: {pot}")
 
-def main():
-    print("Play Texas Hold'em Heads-Up vs GTO Bot!")
-    position = input("Do you want to be SB or BB? (SB/BB): ").strip().upper()
+# new_bot(hand, community, bank, position) builds the opponent, a GTOBot unless play_server picked another bot
+async def play_hand(io, position, new_bot=GTOBot):
     bot_pos = "BB" if position == "SB" else "SB"
 
     # Deal
@@ -58,14 +71,14 @@ def main():
     bot_bank -= 2
     current_bet = 2  # BB's forced bet
 
-    print_status("Preflop", user_hand, community, pot)
+    print_status(io, "Preflop", user_hand, community, pot)
 
     # --- Preflop Betting ---
     if position == "SB":
         valid = ["fold", "call", "raise"]
-        act, amt = user_action(valid, current_bet, min_bet, pot)
+        act, amt = await user_action(io, valid, current_bet, min_bet, pot)
         if act == "fold":
-            print("You folded. Bot wins the pot!")
+            io.say("You folded. Bot wins the pot!")
             return
         elif act == "call":
             user_bank -= current_bet
@@ -76,11 +89,11 @@ def main():
             current_bet = amt
 
         # Bot's turn
-        bot = GTOBot(bot_hand, community, bot_bank, bot_pos)
-        bot_move, bot_amt = bot.choose_move("PF", min_bet, current_bet, pot, user_bank)
-        print(f"GTO Bot action: {bot_move} {bot_amt}")
+        bot = new_bot(bot_hand, community, bot_bank, bot_pos)
+        bot_move, bot_amt = await io.decide(bot, "PF", min_bet, current_bet, pot, user_bank)
+        io.say(f"Bot action: {bot_move} {bot_amt}")
         if bot_move == "fold":
-            print("Bot folded. You win the pot!")
+            io.say("Bot folded. You win the pot!")
             return
         elif bot_move == "call":
             bot_bank -= current_bet
@@ -91,20 +104,20 @@ def main():
             current_bet = bot_amt
             # User response
             valid = ["fold", "call"]
-            act, amt = user_action(valid, current_bet, min_bet, pot)
+            act, amt = await user_action(io, valid, current_bet, min_bet, pot)
             if act == "fold":
-                print("You folded. Bot wins the pot!")
+                io.say("You folded. Bot wins the pot!")
                 return
             elif act == "call":
                 user_bank -= current_bet
                 pot += current_bet
 
     else:  # User is BB (acts after bot)
-        bot = GTOBot(bot_hand, community, bot_bank, bot_pos)
-        bot_move, bot_amt = bot.choose_move("PF", min_bet, current_bet, pot, user_bank)
-        print(f"GTO Bot action: {bot_move} {bot_amt}")
+        bot = new_bot(bot_hand, community, bot_bank, bot_pos)
+        bot_move, bot_amt = await io.decide(bot, "PF", min_bet, current_bet, pot, user_bank)
+        io.say(f"Bot action: {bot_move} {bot_amt}")
         if bot_move == "fold":
-            print("Bot folded. You win the pot!")
+            io.say("Bot folded. You win the pot!")
             return
         elif bot_move == "call":
             bot_bank -= current_bet
@@ -114,9 +127,9 @@ def main():
             pot += bot_amt
             current_bet = bot_amt
         valid = ["fold", "call", "raise"]
-        act, amt = user_action(valid, current_bet, min_bet, pot)
+        act, amt = await user_action(io, valid, current_bet, min_bet, pot)
         if act == "fold":
-            print("You folded. Bot wins the pot!")
+            io.say("You folded. Bot wins the pot!")
             return
         elif act == "call":
             user_bank -= current_bet
@@ -128,15 +141,15 @@ def main():
 
     # --- FLOP ---
     community |= deal(deck, 3)
-    print_status("Flop", user_hand, community, pot)
+    print_status(io, "Flop", user_hand, community, pot)
     bot.community_cards = community.copy()
     bot.bank = bot_bank
 
     # User acts first after flop unless all-in, but for this demo user always acts first
     valid = ["check", "bet", "fold"]
-    act, amt = user_action(valid, 0, min_bet, pot)
+    act, amt = await user_action(io, valid, 0, min_bet, pot)
     if act == "fold":
-        print("You folded. Bot wins the pot!")
+        io.say("You folded. Bot wins the pot!")
         return
     elif act == "bet":
         user_bank -= amt
@@ -148,10 +161,10 @@ def main():
     # Bot's flop response
     bot.community_cards = community.copy()
     bot.bank = bot_bank
-    bot_move, bot_amt = bot.choose_move("F", min_bet, current_bet, pot, user_bank)
-    print(f"GTO Bot action: {bot_move} {bot_amt}")
+    bot_move, bot_amt = await io.decide(bot, "F", min_bet, current_bet, pot, user_bank)
+    io.say(f"Bot action: {bot_move} {bot_amt}")
     if bot_move == "fold":
-        print("Bot folded. You win the pot!")
+        io.say("Bot folded. You win the pot!")
         return
     elif bot_move == "call":
         bot_bank -= current_bet
@@ -162,9 +175,9 @@ def main():
         current_bet = bot_amt
         # User response
         valid = ["fold", "call"]
-        act, amt = user_action(valid, current_bet, min_bet, pot)
+        act, amt = await user_action(io, valid, current_bet, min_bet, pot)
         if act == "fold":
-            print("You folded. Bot wins the pot!")
+            io.say("You folded. Bot wins the pot!")
             return
         elif act == "call":
             user_bank -= current_bet
@@ -172,14 +185,14 @@ def main():
 
     # --- TURN ---
     community |= deal(deck, 1)
-    print_status("Turn", user_hand, community, pot)
+    print_status(io, "Turn", user_hand, community, pot)
     bot.community_cards = community.copy()
     bot.bank = bot_bank
 
     valid = ["check", "bet", "fold"]
-    act, amt = user_action(valid, 0, min_bet, pot)
+    act, amt = await user_action(io, valid, 0, min_bet, pot)
     if act == "fold":
-        print("You folded. Bot wins the pot!")
+        io.say("You folded. Bot wins the pot!")
         return
     elif act == "bet":
         user_bank -= amt
@@ -188,10 +201,10 @@ def main():
     else:
         current_bet = 0
 
-    bot_move, bot_amt = bot.choose_move("T", min_bet, current_bet, pot, user_bank)
-    print(f"GTO Bot action: {bot_move} {bot_amt}")
+    bot_move, bot_amt = await io.decide(bot, "T", min_bet, current_bet, pot, user_bank)
+    io.say(f"Bot action: {bot_move} {bot_amt}")
     if bot_move == "fold":
-        print("Bot folded. You win the pot!")
+        io.say("Bot folded. You win the pot!")
         return
     elif bot_move == "call":
         bot_bank -= current_bet
@@ -201,9 +214,9 @@ def main():
         pot += bot_amt
         current_bet = bot_amt
         valid = ["fold", "call"]
-        act, amt = user_action(valid, current_bet, min_bet, pot)
+        act, amt = await user_action(io, valid, current_bet, min_bet, pot)
         if act == "fold":
-            print("You folded. Bot wins the pot!")
+            io.say("You folded. Bot wins the pot!")
             return
         elif act == "call":
             user_bank -= current_bet
@@ -211,14 +224,14 @@ def main():
 
     # --- RIVER ---
     community |= deal(deck, 1)
-    print_status("River", user_hand, community, pot)
+    print_status(io, "River", user_hand, community, pot)
     bot.community_cards = community.copy()
     bot.bank = bot_bank
 
     valid = ["check", "bet", "fold"]
-    act, amt = user_action(valid, 0, min_bet, pot)
+    act, amt = await user_action(io, valid, 0, min_bet, pot)
     if act == "fold":
-        print("You folded. Bot wins the pot!")
+        io.say("You folded. Bot wins the pot!")
         return
     elif act == "bet":
         user_bank -= amt
@@ -227,10 +240,10 @@ def main():
     else:
         current_bet = 0
 
-    bot_move, bot_amt = bot.choose_move("R", min_bet, current_bet, pot, user_bank)
-    print(f"GTO Bot action: {bot_move} {bot_amt}")
+    bot_move, bot_amt = await io.decide(bot, "R", min_bet, current_bet, pot, user_bank)
+    io.say(f"Bot action: {bot_move} {bot_amt}")
     if bot_move == "fold":
-        print("Bot folded. You win the pot!")
+        io.say("Bot folded. You win the pot!")
         return
     elif bot_move == "call":
         bot_bank -= current_bet
@@ -240,28 +253,33 @@ def main():
         pot += bot_amt
         current_bet = bot_amt
         valid = ["fold", "call"]
-        act, amt = user_action(valid, current_bet, min_bet, pot)
+        act, amt = await user_action(io, valid, current_bet, min_bet, pot)
         if act == "fold":
-            print("You folded. Bot wins the pot!")
+            io.say("You folded. Bot wins the pot!")
             return
         elif act == "call":
             user_bank -= current_bet
             pot += current_bet
 
     # --- Showdown ---
-    print("\n--- SHOWDOWN ---")
-    print(f"Your hand: {show(user_hand)}")
-    print(f"Bot hand: {show(bot_hand)}")
-    print(f"Board: {show(community)}")
+    io.say("\n--- SHOWDOWN ---")
+    io.say(f"Your hand: {show(user_hand)}")
+    io.say(f"Bot hand: {show(bot_hand)}")
+    io.say(f"Board: {show(community)}")
     user_eval = evaluate_hand(user_hand | community)
     bot_eval = evaluate_hand(bot_hand | community)
     result = choose_winner(list(user_eval), list(bot_eval))
-    if result == 1:
-        print("You win the pot!")
-    elif result == -1:
-        print("Bot wins the pot!")
+    if result == -1:
+        io.say("It's a tie!")
+    elif result:
+        io.say("You win the pot!")
     else:
-        print("It's a tie!")
+        io.say("Bot wins the pot!")
+
+def main():
+    print("Play Texas Hold'em Heads-Up vs GTO Bot!")
+    position = input("Do you want to be SB or BB? (SB/BB): ").strip().upper()
+    asyncio.run(play_hand(TerminalIO(), position))
 
 if __name__ == "__main__":
     main()
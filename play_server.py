@@ -0,0 +1,138 @@
+"""
+Line-protocol TCP server that lets many people play heads-up hands against the bots at once.
+
+Every connection is a session playing play_gto_terminal's hand flow, with the prompts and results sent over the
+socket instead of the terminal. Sessions are asyncio tasks, so waiting on a slow human costs nothing, and bot
+decisions go to one worker process pool shared by every session, so a slow MCTS or Minimax search only holds up
+its own session. The latency of every bot decision (queueing included) is shown to the player after each hand
+and logged per session when it disconnects.
+
+Usage: python play_server.py [port]    then connect with e.g. `nc localhost 4800`
+"""
+import asyncio
+import multiprocessing
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from GTO import GTOBot
+from MCTS import MCTS
+from Minimax import MinimaxBot
+from basic_bot import basicBot
+from play_gto_terminal import play_hand
+
+HOST = "127.0.0.1"
+PORT = 4800
+# Worker processes shared by all sessions (None uses one per CPU)
+WORKERS = None
+
+# Opponents a player can pick, built the way play_hand builds its bot
+BOTS = {
+    "gto": lambda hand, community, bank, position: GTOBot(hand, community, bank, position),
+    "mcts": lambda hand, community, bank, position: MCTS(hand, community, bank),
+    "minimax": lambda hand, community, bank, position: MinimaxBot(hand, community, bank),
+    "basic": lambda hand, community, bank, position: basicBot(hand, community, bank),
+}
+
+# Runs in every worker at startup, so the first players don't wait for the workers to spawn and import the bots
+def warm_up():
+    import GTO
+    GTO.get_charts()
+
+# Runs in a worker: the bot's move, plus the bot itself so any state it keeps between decisions comes back
+def bot_decision(bot, args):
+    return bot.choose_move(*args), bot
+
+def latency_summary(latencies) -> str:
+    if not latencies:
+        return "no bot decisions"
+    ms = sorted(latency * 1000 for latency in latencies)
+    p95 = ms[min(len(ms) - 1, int(0.95 * len(ms)))]
+    return f"{len(ms)} bot decisions, mean {statistics.mean(ms):.0f} ms, p95 {p95:.0f} ms, max {ms[-1]:.0f} ms"
+
+class Session:
+    def __init__(self, number, reader, writer, pool):
+        self.number = number
+        self.reader = reader
+        self.writer = writer
+        self.pool = pool
+        self.latencies = []
+
+    def say(self, text):
+        self.writer.write((text + "\n").encode())
+
+    async def ask(self, prompt):
+        self.writer.write(prompt.encode())
+        await self.writer.drain()
+        line = await self.reader.readline()
+        if not line:
+            raise ConnectionResetError("player disconnected")
+        return line.decode(errors="replace").strip()
+
+    async def decide(self, bot, *args):
+        start = time.perf_counter()
+        move, played = await asyncio.get_running_loop().run_in_executor(self.pool, bot_decision, bot, args)
+        self.latencies.append(time.perf_counter() - start)
+        bot.__dict__.update(played.__dict__)
+        return move
+
+    async def run(self):
+        self.say("Play Texas Hold'em Heads-Up against the bots!")
+        name = (await self.ask(f"Which bot do you want to play? ({', '.join(BOTS)}): ")).lower()
+        new_bot = BOTS.get(name, BOTS["gto"])
+        while True:
+            position = (await self.ask("Do you want to be SB or BB? (SB/BB): ")).upper()
+            hand_start = len(self.latencies)
+            await play_hand(self, position, new_bot)
+            self.say(f"Bot latency this hand: {latency_summary(self.latencies[hand_start:])}")
+            if (await self.ask("Play another hand? (y/n): ")).lower() != "y":
+                break
+        self.say("Thanks for playing!")
+        await self.writer.drain()
+
+class PlayServer:
+    def __init__(self, workers=WORKERS):
+        # spawned rather than forked, so workers don't inherit (and hold open) the sockets of connected players
+        self.workers = workers or os.cpu_count()
+        self.pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"))
+        self.sessions = 0
+        self.active = 0
+
+    async def handle(self, reader, writer):
+        self.sessions += 1
+        self.active += 1
+        session = Session(self.sessions, reader, writer, self.pool)
+        print(f"session {session.number}: connected ({self.active} active)")
+        try:
+            await session.run()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except Exception as error:
+            print(f"session {session.number}: {error!r}")
+            session.say(f"The server hit an error: {error}")
+        finally:
+            self.active -= 1
+            print(f"session {session.number}: closed, {latency_summary(session.latencies)}")
+            writer.close()
+
+    async def serve(self, host=HOST, port=PORT):
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self.pool, warm_up) for _ in range(self.workers)))
+        server = await asyncio.start_server(self.handle, host, port)
+        print(f"Serving on {', '.join(str(sock.getsockname()) for sock in server.sockets)}")
+        async with server:
+            await server.serve_forever()
+
+    def close(self):
+        self.pool.shutdown(cancel_futures=True)
+
+if __name__ == "__main__":
+    play_server = PlayServer()
+    try:
+        asyncio.run(play_server.serve(port=int(sys.argv[1]) if len(sys.argv) > 1 else PORT))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        play_server.close()
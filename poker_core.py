@@ -0,0 +1,319 @@
+"""
+Cards, deck, hand evaluator and the 169 preflop hand classes shared by the game, the bots and the offline jobs.
+
+This module only uses the standard library, so bots, worker processes and scripts that just need to evaluate
+hands can import it at module level without loading poker_main, which pulls in every bot (and matplotlib when
+run as the driver). poker_main re-exports the deck and evaluator, so `from poker_main import evaluate_hand` still works.
+"""
+import random
+from typing import Optional
+
+# For blind bets
+MIN_BET = 1
+# Starting money for each player
+STARTING_MONEY = 200
+# Maps the string representing the card rank to its numerical value
+RANK_TO_VALUE = {'2': 2, '3': 3, '4': 4, '5': 5, '6': 6, '7': 7, '8': 8, '9': 9, 'T': 10, 'J': 11, 'Q': 12, 'K': 13, 'A': 14}
+# Reverse mapping
+VALUE_TO_RANK = {1: 'A', 2: '2', 3: '3', 4: '4', 5: '5', 6: '6', 7: '7', 8: '8', 9: '9', 10: 'T', 11: 'J', 12: 'Q', 13: 'K', 14: 'A'}
+# Collection of suits
+SUITS = ('D', 'C', 'H', 'S')
+# Maps generated result to a human understandable name
+RESULT_TO_HAND = {1 : "Royal flush", 2 : "Straight Flush", 3 : "Four of a kind", 4 : "Full House", 5 : "Flush", 6 : "Straight", 7 : "Three of a kind", 8 : "Two pair", 9 : "Pair", 10 : "High card"}
+
+# Deck class
+class Deck:
+    def __init__(self):
+        # Randomly shuffles deck on instantiation
+        self.deck: list[str] = ["2D", "3D", "4D", "5D", "6D", "7D", "8D", "9D", "TD", "JD", "QD", "KD", "AD",
+                                "2C", "3C", "4C", "5C", "6C", "7C", "8C", "9C", "TC", "JC", "QC", "KC", "AC",
+                                "2H", "3H", "4H", "5H", "6H", "7H", "8H", "9H", "TH", "JH", "QH", "KH", "AH",
+                                "2S", "3S", "4S", "5S", "6S", "7S", "8S", "9S", "TS", "JS", "QS", "KS", "AS"]
+        random.shuffle(self.deck)
+                                 
+    
+    # Dealing at each phase modifies deck, so no duplicate checking needed
+    def deal_pre_flop(self) -> tuple[set[str], set[str]]:
+        hand1 = set()
+        hand2 = set()
+        for i in range(2):
+            hand1.add(self.deck.pop())
+            hand2.add(self.deck.pop())
+        return hand1, hand2
+
+    def deal_flop(self) -> set[str]:
+        flop_cards = set()
+        for i in range(3):
+            flop_cards.add(self.deck.pop())
+        return flop_cards  
+
+    def deal_turn(self) -> set[str]:
+        turn_card = set()
+        turn_card.add(self.deck.pop())
+        return turn_card  
+
+    def deal_river(self) -> set[str]:
+        river_card = set()
+        river_card.add(self.deck.pop())
+        return river_card  
+
+def royal_flush(values: dict, suits: dict, cards: set[str]) -> Optional[tuple[int, list[int]]]:
+    # Royal flush must have 5 different cards values
+    if len(values.keys()) < 5:
+        return None
+    
+    # Checks if there is a suit with 5 different cards
+    royal_suit = 0
+    for suit in suits.keys():
+        if suits[suit] >= 5:
+            royal_suit = suit
+    
+    # No suits had 5 cards
+    if royal_suit == 0:
+        return None
+
+    royal_values = set([10, 11, 12, 13, 14])
+    # Checks if there a possible royal flush
+    if len(set(values.keys()).intersection(royal_values)) == 5:
+        royal_hand = set([f"T{royal_suit}", f"J{royal_suit}", f"Q{royal_suit}", f"K{royal_suit}", f"A{royal_suit}"])
+        if len(royal_hand.intersection(cards)) == 5:
+            return (1, [])
+        else:
+            return None
+
+def straight_flush(values: dict, suits: dict, cards: set) -> Optional[tuple[int, list[int]]]:
+    straight = False
+
+    # Sorts the values
+    sorted_values = sorted(values.keys())
+
+    # Checks for straight
+    in_a_row = 1
+    straight_cards = set()
+    
+    for i in range(len(sorted_values) - 1):
+        if(sorted_values[i + 1] == sorted_values[i] + 1):
+            in_a_row += 1
+            straight_cards.add(sorted_values[i])
+            straight_cards.add(sorted_values[i+1])
+        elif(in_a_row < 5):
+            in_a_row = 1
+            straight_cards = set()
+            
+    if(in_a_row < 5):
+        # If ace
+        if sorted_values[-1] == 14:
+            in_a_row = 1
+            # Retries with ace as 1
+            sorted_values = [1] + sorted_values[:-1]
+            for i in range(len(sorted_values) - 1):
+                if(sorted_values[i + 1] == sorted_values[i] + 1):
+                    in_a_row += 1
+                    straight_cards.add(sorted_values[i])
+                    straight_cards.add(sorted_values[i+1])
+                elif(in_a_row < 5):
+                    in_a_row = 1
+                    straight_cards = set()
+    
+    # Confirms a straight is possible
+    if(in_a_row >= 5):
+        straight = True
+
+    # Checks flush
+    flush_suit = 0
+    for suit in suits.keys():
+        if suits[suit] == 5:
+            # Flush is possible
+            flush_suit = suit
+            break
+    # No flush
+    if flush_suit == 0:
+        if straight:
+            # Just a straight
+            return (6, list(straight_cards)[-5:])
+        else:
+            return None
+    else:
+        straight_flush_cards = set()
+        for card in straight_cards:
+            straight_flush_cards.add(f'{VALUE_TO_RANK[card]}{flush_suit}')
+        # Checks straight and flush
+        hand = (straight_flush_cards.intersection(cards))
+        if len(hand) >= 5:
+            h = sorted([RANK_TO_VALUE[card[0]] for card in hand])
+            # Checks to make same suit
+            in_a_row = 1
+            for i in range(len(h) - 1):
+                if(h[i + 1] == h[i] + 1):
+                    in_a_row += 1
+                else:
+                    in_a_row = 1
+            # Straight flush
+            if(in_a_row == 5):
+                return (2, h[-5:])
+            
+            else:
+                # Just a flush
+                return (5, sorted([RANK_TO_VALUE[card[0]] for card in cards if card[1] == suit]))
+
+def duplicates(values: dict) -> Optional[tuple[int, list[int]]]:
+    
+    sorted_values = sorted(values.keys())
+    
+    three_of_a_kind = False
+    three_value = []
+    pair_count = 0
+    pair_values = []
+
+    for value in values.keys():
+        # Four of a kind
+        if(values[value] == 4):
+            sorted_values.remove(value)
+            return (3, sorted_values[-1:] + [value])
+        # Three of a kind
+        if(values[value] == 3):
+            three_value.append(value)
+            three_of_a_kind = True
+        # Pairs
+        if(values[value] == 2):
+            pair_count += 1
+            pair_values.append(value)
+    
+    if(three_of_a_kind):
+        # Full house
+        if( pair_count > 0):
+            return (4, [max(pair_values)] + three_value)
+        else:
+            # Just three of a kind
+            sorted_values.remove(three_value[0])
+            return (7, sorted_values[-2:] + three_value)
+
+    # Two pairs
+    if pair_count >= 2:
+        pair_values.sort()
+        # Takes the highest two pairs
+        pair_values = pair_values[-2:]
+        sorted_values.remove(pair_values[0])
+        sorted_values.remove(pair_values[1])
+        return (8, sorted_values[-1:] + pair_values)
+    
+    # Pair
+    if pair_count == 1:
+        sorted_values.remove(pair_values[0])
+        return(9, sorted_values[-3:] + pair_values)
+    
+    # High card
+    else:
+        return(10, sorted_values[-5:])
+
+def evaluate_hand(cards: set[str]) -> tuple[int, list[int]]:
+    # Dictionary to hold the counts of each value of card
+    value_counter = {}
+    
+    # Dictionary to hold the counts of each suit of card
+    suit_counter = {}
+    
+    # Counts cards
+    for card in cards:
+        if RANK_TO_VALUE[card[0]] in value_counter.keys():
+            value_counter[RANK_TO_VALUE[card[0]]] += 1
+        else:
+            value_counter[RANK_TO_VALUE[card[0]]] = 1
+        
+        if card[1] in suit_counter.keys():
+            suit_counter[card[1]] += 1
+        else:
+            suit_counter[card[1]] = 1
+
+    # Checks royal flush
+    rf = royal_flush(value_counter, suit_counter, cards)
+    if not rf is None:
+        return rf
+
+    # Checks four of a kind, three of a kind, full house, two pairs, pair, and high card
+    dup = duplicates(value_counter)
+
+    # Checks straight, flush, and straight flush    
+    sf = straight_flush(value_counter, suit_counter, cards)
+    if sf is None or dup[0] == 3:
+        return dup
+    else:
+        return sf
+
+def breakdown_result(result: tuple[int, list[int]]) -> str:      
+    rank = RESULT_TO_HAND[result[0]]
+    if result[0] == 1:
+        return rank
+    if result[0] in [2, 4, 5, 6]:
+        return rank + f" ({str(result[1])})"
+    if result[0] == 3:
+        return rank + f" ({result[1][-1]}), Kicker: {result[1][-2]}"
+    if result[0] == 7:
+        return rank + f" ({result[1][-1]}), Kickers: {result[1][-3:-1]}"
+    if result[0] == 8:
+        return rank + f" ({result[1][-2]}, {result[1][-1]}), Kicker: {result[1][-3]}"
+    if result[0] == 9:
+        return rank + f" ({result[1][-1]}), Kickers: {result[1][-4:-1]}"
+    else:
+        return rank + f" ({result[1][-1]}), Kickers: {result[1][-5:-1]}"
+    
+"""
+Takes in two evaluated hands.
+Returns 1 if the first player wins
+Return 0 if the second player wins
+Returns -1 if tie
+"""
+def choose_winner(p0: tuple[int, list[int]], p1: tuple[int, list[int]]) -> int:
+    # If hands have the same rank
+    if(p0[0] == p1[0]):
+        # Compare kickers
+        while len(p0[1]) > 0 and len(p1[1]) > 0:
+            kicker0 = p0[1].pop()
+            kicker1 = p1[1].pop()
+            # Goes to the next kicker if they are the same
+            if kicker0 == kicker1:
+                continue
+            else:
+                # Otherwise compares kickers to determine winner
+                return kicker1 < kicker0
+        
+        # Ties
+        if len(p0[1]) == 0 and len(p1[1]) == 0:
+            return -1
+        # p0 had higher duplicate kicker
+        elif len(p0[1]) == 0 and len(p1[1]) != 0:
+            return 1
+        # p1 had higher duplicate kicker
+        elif len(p0[1]) != 0 and len(p1[1]) == 0:
+            return 0
+            
+    # Whoever has highest ranking hand wins
+    # Note, 1 is the highest rank and 10 is the lowest.
+    else:
+        return p0[0] < p1[0]
+
+# The 169 preflop hand classes, and a table from every ordered pair of card indices (52 * 52) to its class index
+RANKS = "AKQJT98765432"
+CARDS = [r + s for r in "23456789TJQKA" for s in "DCHS"]
+CARD_INDEX = {card: i for i, card in enumerate(CARDS)}
+
+def _hand_class(a: str, b: str) -> str:
+    if RANK_TO_VALUE[a[0]] < RANK_TO_VALUE[b[0]]:
+        a, b = b, a
+    if a[0] == b[0]:
+        return a[0] * 2
+    return a[0] + b[0] + ('s' if a[1] == b[1] else 'o')
+
+HAND_CLASSES = []
+for i, high in enumerate(RANKS):
+    for low in RANKS[i:]:
+        HAND_CLASSES += [high * 2] if high == low else [high + low + "s", high + low + "o"]
+CLASS_INDEX = {key: i for i, key in enumerate(HAND_CLASSES)}
+COMBO_CLASS = [CLASS_INDEX[_hand_class(a, b)] if a != b else -1 for a in CARDS for b in CARDS]
+
+def hand_index(cards: set[str]) -> int:
+    a, b = cards
+    return COMBO_CLASS[CARD_INDEX[a] * 52 + CARD_INDEX[b]]
+
+def hand_key(cards: set[str]) -> str:
+    return HAND_CLASSES[hand_index(cards)]
@@ -1,12 +1,14 @@
 import tkinter as tk
 from tkinter import messagebox
 import random
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Set, Tuple, List
 from basic_bot import basicBot
 from MCTS import MCTS
 from Minimax import MinimaxBot
 from GTO import GTOBot
-from poker_main import royal_flush, straight_flush, duplicates
+from poker_core import royal_flush, straight_flush, duplicates
 
 SUITS = ['H', 'D', 'C', 'S']
 RANKS = ['2', '3', '4', '5', '6', '7', '8', '9', 'T', 'J', 'Q', 'K', 'A']
@@ -17,6 +19,9 @@ RESULT_TO_HAND = {
 }
 DECK = [r + s for s in SUITS for r in RANKS]
 
+# The UI polls for the bot's decision (and animates the thinking indicator) once per frame, at about 60 fps
+FRAME_MS = 16
+SPINNER = "|/-\\"
 
 
 def evaluate_hand(cards: Set[str]) -> Tuple[int, List[int]]:
@@ -56,6 +61,12 @@ class PokerGUI:
         self.deck = DECK[:]
         random.shuffle(self.deck)
         self.awaiting_bot_action = False
+        # bot decisions run on one worker thread so the Tk event loop never blocks on a search, and a cancelled
+        # search finishes before the next decision starts on the same bot
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.pending = None
+        self.think_start = 0
+        self.master.protocol("WM_DELETE_WINDOW", self.close)
         self.setup_ui()
         self.start_hand()
 
@@ -85,6 +96,13 @@ class PokerGUI:
         tk.Button(self.actions_frame, text="Bet", command=self.player_bet).grid(row=0, column=1)
         tk.Button(self.actions_frame, text="Fold", command=self.player_fold).grid(row=0, column=2)
 
+        self.thinking_frame = tk.Frame(self.master)
+        self.thinking_frame.pack()
+        self.thinking_label = tk.Label(self.thinking_frame, text="")
+        self.thinking_label.grid(row=0, column=0)
+        self.cancel_button = tk.Button(self.thinking_frame, text="Cancel", command=self.cancel_bot, state=tk.DISABLED)
+        self.cancel_button.grid(row=0, column=1)
+
     def deal_cards(self):
         self.player_hand = {self.deck.pop(), self.deck.pop()}
         self.bot.hole_cards = {self.deck.pop(), self.deck.pop()}
@@ -134,8 +152,49 @@ class PokerGUI:
         self.bot_hand_label.config(text=f"Bot Hand: {self.bot.hole_cards}")
         self.end_game("You folded. Bot wins!")
 
+    # Starts the bot's decision on the worker thread and polls for it from the event loop
     def bot_move(self):
-        move, amount = self.bot.choose_move(self.phase, 0, self.current_bet, self.pot, self.user_bank)
+        if self.pending is not None:
+            return
+        self.set_buttons(tk.DISABLED)
+        self.cancel_button.config(state=tk.NORMAL)
+        self.think_start = time.time()
+        self.pending = self.executor.submit(self.bot.choose_move, self.phase, 0, self.current_bet, self.pot, self.user_bank)
+        self.master.after(FRAME_MS, self.poll_bot, self.pending)
+
+    # Each decision has its own polling loop, which ends once the decision is delivered or cancelled
+    def poll_bot(self, future):
+        if future is not self.pending:
+            return
+        if not future.done():
+            elapsed = time.time() - self.think_start
+            self.thinking_label.config(text=f"Bot is thinking {SPINNER[int(elapsed * 10) % len(SPINNER)]} {elapsed:.1f}s")
+            self.master.after(FRAME_MS, self.poll_bot, future)
+            return
+        self.pending = None
+        self.stop_thinking()
+        try:
+            move, amount = future.result()
+        except Exception as error:
+            messagebox.showinfo("Error", f"Bot failed to decide: {error}")
+            move, amount = ("check", 0) if self.current_bet == 0 else ("fold", 0)
+        self.apply_bot_move(move, amount)
+
+    # Stops waiting for the bot, which checks if it can and folds otherwise; the search itself runs out its clock in the background
+    def cancel_bot(self):
+        if self.pending is None:
+            return
+        self.pending.cancel()
+        self.pending = None
+        self.stop_thinking()
+        self.apply_bot_move(*(("check", 0) if self.current_bet == 0 else ("fold", 0)))
+
+    def stop_thinking(self):
+        self.thinking_label.config(text="")
+        self.cancel_button.config(state=tk.DISABLED)
+        self.set_buttons(tk.NORMAL)
+
+    def apply_bot_move(self, move, amount):
         self.bot_action_label.config(text=f"Bot Action: {move} ${amount}")
         if move == "call":
             if self.bot.bank >= amount:
@@ -201,8 +260,20 @@ class PokerGUI:
         self.disable_buttons()
 
     def disable_buttons(self):
+        self.set_buttons(tk.DISABLED)
+        self.game_over = True
+
+    def set_buttons(self, state):
+        if state == tk.NORMAL and getattr(self, "game_over", False):
+            return
         for widget in self.actions_frame.winfo_children():
-            widget.config(state=tk.DISABLED)
+            widget.config(state=state)
+
+    def close(self):
+        self.pending = None
+        # don't wait for a search that's still running, its thread exits with the process
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.master.destroy()
 
 def select_bot():
     def launch_game_with_bot(bot_class):
@@ -0,0 +1,93 @@
+"""
+Constant-memory statistics of a bot's per-hand profit, for the poker_main driver.
+
+Every hand updates a Welford accumulator (running mean and sum of squared deviations), so the mean, standard
+deviation and win rate in big blinds per 100 hands, with its confidence interval, are available at any point in
+the run without keeping the hands. For plotting, the cumulative profit is kept as a downsampled series of at
+most SERIES_SIZE points: once it fills up every other point is dropped and points are recorded half as often,
+so it always spans the whole run. A reservoir keeps a uniform sample of RESERVOIR_SIZE single-hand profits for
+histograms and medians. Memory stays the same whether the run is a hundred hands or millions.
+"""
+import math
+import random
+
+# Points kept of the cumulative profit series
+SERIES_SIZE = 2000
+# Single-hand profits kept in the reservoir sample
+RESERVOIR_SIZE = 1000
+# Normal quantile of the 95% intervals
+Z = 1.96
+
+class Welford:
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        # Sum of squared deviations from the mean
+        self.m2 = 0.0
+
+    def add(self, x):
+        self.n += 1
+        delta = x - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (x - self.mean)
+
+    # Sample variance, like statistics.variance
+    def variance(self) -> float:
+        return self.m2 / (self.n - 1) if self.n > 1 else 0.0
+
+    def stdev(self) -> float:
+        return math.sqrt(self.variance())
+
+    # Confidence interval of the mean
+    def interval(self, z=Z) -> tuple[float, float]:
+        spread = z * self.stdev() / math.sqrt(self.n) if self.n else 0.0
+        return self.mean - spread, self.mean + spread
+
+class ProfitTracker:
+    def __init__(self, big_blind, series_size=SERIES_SIZE, reservoir_size=RESERVOIR_SIZE, rng=None):
+        self.big_blind = big_blind
+        self.stats = Welford()
+        self.total = 0.0
+        # (hand number, cumulative profit) every `stride` hands
+        self.series = []
+        self.series_size = series_size
+        self.stride = 1
+        self.reservoir = []
+        self.reservoir_size = reservoir_size
+        self.rng = rng or random.Random()
+
+    @property
+    def hands(self) -> int:
+        return self.stats.n
+
+    def add(self, profit):
+        self.stats.add(profit)
+        self.total += profit
+        if self.hands % self.stride == 0:
+            self.series.append((self.hands, self.total))
+            if len(self.series) == self.series_size:
+                self.series = self.series[1::2]
+                self.stride *= 2
+        # Algorithm R: the n-th hand replaces a random sample with probability size / n
+        if len(self.reservoir) < self.reservoir_size:
+            self.reservoir.append(profit)
+        else:
+            k = self.rng.randrange(self.hands)
+            if k < self.reservoir_size:
+                self.reservoir[k] = profit
+
+    # Win rate in big blinds per 100 hands, and its confidence interval
+    def bb_per_100(self, z=Z) -> tuple[float, float, float]:
+        scale = 100 / self.big_blind
+        low, high = self.stats.interval(z)
+        return self.stats.mean * scale, low * scale, high * scale
+
+    # Hand numbers and cumulative profits to plot, always ending at the latest hand
+    def plot_series(self):
+        points = self.series if self.series and self.series[-1][0] == self.hands else self.series + [(self.hands, self.total)]
+        return [hand for hand, _ in points], [total for _, total in points]
+
+    def summary(self) -> str:
+        rate, low, high = self.bb_per_100()
+        return (f"average profit per hand of {self.stats.mean} over {self.hands} hands (Std dev: {self.stats.stdev()}), "
+                f"{rate:.1f} bb/100 (95% CI [{low:.1f}, {high:.1f}])")
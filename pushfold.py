@@ -0,0 +1,190 @@
+"""
+Heads-up push/fold equilibrium for short stacks, which every bot plays preflop instead of its full search once the
+effective stack is MAX_STACK big blinds or less.
+
+Offline, the job estimates the all-in equity of every pair of the 169 hand classes. It samples random boards and,
+on each one, evaluates every two-card combo once and compares all pairs of combos that don't share a card at the
+same time as NumPy matrices. It then runs fictitious play for every stack depth at once: the SB shoves or folds
+with the blinds at 0.5 and 1 big blind, the BB calls or folds, each side best-responds to the other's average
+strategy, and the averages converge to the equilibrium. Card removal is kept by weighing every pair of classes by
+how many of their combos can be dealt together.
+
+The push and call probabilities are written one byte per (side, stack, hand class) to data/pushfold.bin, so a
+decision is a table index. The equity matrix is kept as well, two bytes per pair of classes in
+data/preflop_equity.bin, for fold_review to price preflop folds with. The engine's blinds are dead money and checking an unopened pot is free, so bots check
+the hands the chart would fold.
+
+Usage: python pushfold.py [boards]
+"""
+import array
+import math
+import random
+import sys
+import time
+from pathlib import Path
+
+from poker_core import evaluate_hand, CARDS, HAND_CLASSES, COMBO_CLASS, hand_index
+
+TABLE_FILE = Path(__file__).parent / "data" / "pushfold.bin"
+EQUITY_FILE = Path(__file__).parent / "data" / "preflop_equity.bin"
+SEED = 480
+# Random boards the equity matrix is averaged over
+BOARDS = 2000
+ITERATIONS = 4000
+# Effective stacks in big blinds, 1 to MAX_STACK
+MAX_STACK = 30
+STACKS = range(1, MAX_STACK + 1)
+SIDES = ("push", "call")
+CLASSES = len(HAND_CLASSES)
+TABLE_SIZE = len(SIDES) * MAX_STACK * CLASSES
+# Equities are stored as little-endian uint16, 0 to EQUITY_SCALE
+EQUITY_SCALE = 65535
+
+# All 1326 two-card combos as card index pairs
+COMBOS = [(a, b) for a in range(52) for b in range(a + 1, 52)]
+
+# Combo classes one-hot, the cards of every combo, and which combos share no card
+# (numpy is only imported to build the table, so bots consulting it don't pay for it)
+def combo_matrices():
+    import numpy as np
+    onehot = np.zeros((len(COMBOS), CLASSES), dtype=np.float32)
+    cards = np.zeros((len(COMBOS), 52), dtype=np.float32)
+    for k, (a, b) in enumerate(COMBOS):
+        onehot[k, COMBO_CLASS[a * 52 + b]] = 1
+        cards[k, [a, b]] = 1
+    disjoint = (cards @ cards.T) == 0
+    return onehot, cards.astype(bool), disjoint
+
+# Sort key of a poker_core.evaluate_hand result that orders hands the way choose_winner does
+def hand_score(evaluated) -> tuple:
+    rank, kickers = evaluated
+    # choose_winner compares kickers from the end, and the hand that runs out of kickers first wins
+    return (-rank, *reversed(kickers), 99)
+
+# equity[i, j]: probability (ties counting half) a hand of class i beats one of class j all in preflop
+def equity_matrix(boards=BOARDS, seed=SEED):
+    import numpy as np
+    onehot, cards, disjoint = combo_matrices()
+    rng = random.Random(seed)
+    wins = np.zeros((CLASSES, CLASSES))
+    games = np.zeros((CLASSES, CLASSES))
+    for _ in range(boards):
+        board = rng.sample(range(52), 5)
+        board_cards = {CARDS[c] for c in board}
+        live = ~cards[:, board].any(axis=1)
+        scores = {k: hand_score(evaluate_hand(board_cards | {CARDS[COMBOS[k][0]], CARDS[COMBOS[k][1]]}))
+                  for k in np.flatnonzero(live)}
+        order = {score: r for r, score in enumerate(sorted(set(scores.values())))}
+        ranks = np.full(len(COMBOS), -1.0, dtype=np.float32)
+        for k, score in scores.items():
+            ranks[k] = order[score]
+        pairs = (disjoint & live[:, None] & live[None, :]).astype(np.float32)
+        outcome = ((ranks[:, None] > ranks[None, :]) + 0.5 * (ranks[:, None] == ranks[None, :])) * pairs
+        wins += onehot.T @ outcome @ onehot
+        games += onehot.T @ pairs @ onehot
+    return wins / np.maximum(games, 1)
+
+# counts[i, j]: how many (combo of i, combo of j) pairs can be dealt together
+def combo_counts():
+    import numpy as np
+    onehot, _, disjoint = combo_matrices()
+    return (onehot.T @ disjoint.astype(np.float32) @ onehot).astype(float)
+
+# Fictitious play for every stack depth at once; returns the push and call probabilities, (stacks x classes) each
+def solve(equity, counts, stacks=STACKS, iterations=ITERATIONS):
+    import numpy as np
+    stack = np.asarray(stacks, dtype=float)[:, None]
+    weighted = counts * equity
+    rows = counts.sum(axis=1)
+    push = np.ones((len(stack), CLASSES))
+    call = np.ones((len(stack), CLASSES))
+    for t in range(1, iterations + 1):
+        # the SB's shove wins the big blind when the BB folds and the all-in pot share 2S * equity - S when it calls
+        push_ev = ((1 - call) @ counts.T + 2 * stack * (call @ weighted.T) - stack * (call @ counts.T)) / rows
+        push_br = (push_ev > -0.5).astype(float)
+        # the BB's call is worth 2S * equity - S against the shoving range, folding loses its 1 big blind
+        call_gain = 2 * stack * (push @ weighted.T) - (stack - 1) * (push @ counts.T)
+        call_br = (call_gain > 0).astype(float)
+        push += (push_br - push) / (t + 1)
+        call += (call_br - call) / (t + 1)
+    return push, call
+
+def build_table(boards=BOARDS, path=TABLE_FILE, equity_path=EQUITY_FILE) -> bytes:
+    import numpy as np
+    equity = equity_matrix(boards)
+    equity_path.write_bytes(np.round(equity * EQUITY_SCALE).astype("<u2").tobytes())
+    push, call = solve(equity, combo_counts())
+    data = bytes(round(p * 255) for side in (push, call) for p in side.ravel())
+    path.write_bytes(data)
+    return data
+
+# Loaded on first lookup; None if it hasn't been built
+_table = None
+_table_loaded = False
+
+def load_table(path=TABLE_FILE):
+    global _table, _table_loaded
+    if not _table_loaded:
+        _table_loaded = True
+        if path.exists() and path.stat().st_size == TABLE_SIZE:
+            _table = path.read_bytes()
+    return _table
+
+# Loaded on first lookup like the push/fold table
+_equity = None
+_equity_loaded = False
+
+def load_equity(path=EQUITY_FILE):
+    global _equity, _equity_loaded
+    if not _equity_loaded:
+        _equity_loaded = True
+        if path.exists() and path.stat().st_size == 2 * CLASSES * CLASSES:
+            _equity = array.array("H", path.read_bytes())
+            if sys.byteorder == "big":
+                _equity.byteswap()
+    return _equity
+
+# All-in preflop equity of hole against the opponent's hole (by hand class), or None if the table hasn't been built
+def preflop_equity(hole_cards, opponent_cards):
+    equity = load_equity()
+    if equity is None:
+        return None
+    return equity[hand_index(hole_cards) * CLASSES + hand_index(opponent_cards)] / EQUITY_SCALE
+
+# Equilibrium probability (0-255) of side ("push" or "call") at an effective stack for a hand class index
+def probability(side: str, stack: int, hand: int):
+    table = load_table()
+    if table is None or not 1 <= stack <= MAX_STACK:
+        return None
+    return table[(SIDES.index(side) * MAX_STACK + stack - 1) * CLASSES + hand]
+
+# Effective stack in big blinds, rounded up
+def effective_stack(bank, opponent_bank, min_bet) -> int:
+    return math.ceil(min(bank, opponent_bank) / (2 * min_bet))
+
+# The chart's preflop move once stacks are short, or None to let the bot decide
+def short_stack_move(hole_cards, game_phase, min_bet, current_bet, bank, opponent_bank):
+    if game_phase != "PF" or bank <= 0 or min_bet <= 0:
+        return None
+    # a bet we face is part of the opponent's stack
+    stack = effective_stack(bank, opponent_bank + current_bet, min_bet)
+    hand = hand_index(hole_cards)
+    if current_bet == 0:
+        p = probability("push", stack, hand)
+        if p is None:
+            return None
+        return ("bet", bank) if random.randrange(255) < p else ("check", 0)
+    # facing a bet: call an all-in, or shove over anything else, with the hands the BB calls a shove with
+    p = probability("call", stack, hand)
+    if p is None:
+        return None
+    if random.randrange(255) >= p:
+        return ("fold", 0)
+    return ("call", current_bet) if opponent_bank == 0 else ("raise", current_bet + bank)
+
+if __name__ == "__main__":
+    boards = int(sys.argv[1]) if len(sys.argv) > 1 else BOARDS
+    start_time = time.time()
+    table = build_table(boards)
+    pushes = [sum(table[(stack - 1) * CLASSES:stack * CLASSES]) / 255 for stack in (1, 10, 20, MAX_STACK)]
+    print(f"Built push/fold table in {time.time() - start_time:.0f}s, hand classes pushed at 1/10/20/{MAX_STACK}bb: {[round(p) for p in pushes]}")
@@ -0,0 +1,111 @@
+"""
+Structured traces of a MinimaxBot search.
+
+A SearchTrace records every node the search visits as one compact list in visit order, and only
+exists for decisions that asked for a trace, so untraced decisions pay nothing but a None check per
+node. Once the decision is made the trace can be written to a file as JSON (for tools) or DOT (for
+graphviz, e.g. `dot -Tsvg trace.dot -o trace.svg`), or rendered as the indented text tree the bot used
+to print.
+"""
+import json
+from pathlib import Path
+
+# Layout of each node record
+FIELDS = ("parent", "move", "kind", "phase", "depth", "alpha", "beta", "value", "cutoff")
+PARENT, MOVE, KIND, PHASE, DEPTH, ALPHA, BETA, VALUE, CUTOFF = range(len(FIELDS))
+
+# Node kinds: decision nodes, chance nodes, leaves, and nodes cut short by the table, the clock or a worker
+KINDS = ("max", "min", "chance", "leaf", "terminal", "table", "time", "worker")
+
+# Readable edge label for a move tuple or a set of dealt cards
+def move_label(move) -> str:
+    if move is None:
+        return ""
+    if isinstance(move, frozenset):
+        return " ".join(sorted(move))
+    action, amount = move
+    return f"{action} {amount}" if amount else action
+
+class SearchTrace:
+    def __init__(self, decision=0):
+        self.nodes = []
+        # decision number within the bot, plus the depth, move and score filled in once the pass completes
+        self.info = {"decision": decision}
+
+    # Records a node when the search enters it and returns its id
+    def open(self, parent, move, kind, phase, depth, alpha, beta) -> int:
+        self.nodes.append([parent, move, kind, phase, depth, alpha, beta, None, None])
+        return len(self.nodes) - 1
+
+    # Fills in a node's value (and the bound that pruned its remaining moves, if any) when the search leaves it
+    def close(self, node, value, cutoff=None):
+        record = self.nodes[node]
+        record[VALUE] = value
+        record[CUTOFF] = cutoff
+
+    def children(self) -> dict[int, list[int]]:
+        children = {}
+        for node, record in enumerate(self.nodes):
+            if record[PARENT] is not None:
+                children.setdefault(record[PARENT], []).append(node)
+        return children
+
+    def to_dict(self) -> dict:
+        nodes = [[record[PARENT], move_label(record[MOVE]), *record[KIND:]] for record in self.nodes]
+        info = {key: move_label(value) if key == "move" else value for key, value in self.info.items()}
+        return {**info, "fields": list(FIELDS), "nodes": nodes}
+
+    def to_json(self) -> str:
+        # infinite window bounds aren't valid JSON, so they're written as null
+        def finite(value):
+            return None if isinstance(value, float) and abs(value) == float("inf") else value
+        data = self.to_dict()
+        data["nodes"] = [[finite(value) for value in record] for record in data["nodes"]]
+        return json.dumps(data, separators=(",", ":"))
+
+    def to_dot(self) -> str:
+        lines = ["digraph search {", '  node [shape=box, fontname="monospace"];']
+        shapes = {"max": "triangle", "min": "invtriangle", "chance": "circle"}
+        for node, record in enumerate(self.nodes):
+            value = "?" if record[VALUE] is None else f"{record[VALUE]:.4f}"
+            label = f"{record[KIND]} {record[PHASE]} d={record[DEPTH]}\\nα={record[ALPHA]:.4f} β={record[BETA]:.4f}\\n= {value}"
+            if record[CUTOFF] is not None:
+                label += f"\\nprune at {record[CUTOFF]:.4f}"
+            lines.append(f'  n{node} [label="{label}", shape={shapes.get(record[KIND], "box")}];')
+            if record[PARENT] is not None:
+                lines.append(f'  n{record[PARENT]} -> n{node} [label="{move_label(record[MOVE])}"];')
+        lines.append("}")
+        return "\n".join(lines) + "\n"
+
+    # The old show_tree printout, built from the records instead of a second search
+    def render(self) -> str:
+        children = self.children()
+        lines = []
+        def walk(node, indent):
+            record = self.nodes[node]
+            value = "?" if record[VALUE] is None else f"{record[VALUE]:.4f}"
+            kind, phase, depth = record[KIND], record[PHASE], record[DEPTH]
+            if kind in ("max", "min", "chance"):
+                lines.append(f"{indent}{kind.capitalize()} Node: phase={phase} depth={depth} α={record[ALPHA]:.4f} β={record[BETA]:.4f}")
+            else:
+                lines.append(f"{indent}└─ [{kind} eval] phase={phase} score={value}")
+            kids = children.get(node, [])
+            for i, child in enumerate(kids):
+                is_last = i == len(kids) - 1
+                branch = "└─" if is_last else "├─"
+                lines.append(f"{indent}{branch} Try {move_label(self.nodes[child][MOVE])}")
+                walk(child, indent + ("   " if is_last else "|  "))
+                child_value = self.nodes[child][VALUE]
+                lines.append(f"{indent}{branch} {move_label(self.nodes[child][MOVE])} → score={'?' if child_value is None else f'{child_value:.4f}'}")
+            if record[CUTOFF] is not None:
+                lines.append(f"{indent}└─ Prune at {record[CUTOFF]:.4f}")
+        if self.nodes:
+            walk(0, "")
+        return "\n".join(lines)
+
+    # Writes the trace as DOT if the path ends in .dot, otherwise as JSON
+    def write(self, path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(self.to_dot() if path.suffix == ".dot" else self.to_json() + "\n")
+        return path
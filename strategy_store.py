@@ -0,0 +1,154 @@
+"""
+Binary postflop strategy store GTOBot consults before its JSON charts.
+
+Each street has its own file (data/flop_strategy.bin, ...), a small header followed by one fixed-size row per
+infoset. A row holds the probabilities of the three actions open at that infoset, quantized to bytes that add
+up to 255, and an all-zero row means the store has no strategy there. Rows are found by a packed infoset id:
+    (position, betting history, canonical hand/board key)
+where the key is ehs_table's canonical key (made hand, board texture and draws) and the history is the size of
+the bet being faced (HISTORY_SIZES). Files are memory-mapped read-only the first time their street is looked
+up, so starting a bot reads nothing and every process shares the same pages, however many infosets there are.
+
+write_store() is what a solver exports to. Running this file converts the current bucket charts into stores,
+giving every canonical key its bucket's strategy.
+
+Usage: python strategy_store.py
+"""
+import mmap
+import random
+import struct
+import sys
+from pathlib import Path
+
+import ehs_table
+
+DATA_DIR = Path(__file__).parent / "data"
+STORE_FILES = {street: DATA_DIR / f"{street}_strategy.bin" for street in ("flop", "turn", "river")}
+STREET_INDEX = {"flop": 0, "turn": 1, "river": 2}
+
+MAGIC = b"GTOS"
+VERSION = 1
+# magic, version, actions per row, rows
+HEADER = struct.Struct("<4sBBxxI")
+QUANTUM = 255
+
+# Actions of a row, with nothing to call and facing a bet
+ACTIONS = (("bet", "check", "fold"), ("raise", "call", "fold"))
+# Betting history: no bet (0), or facing a bet up to each fraction of the pot (1, 2), or bigger (3)
+HISTORY_SIZES = (0.5, 1.0)
+HISTORIES = len(HISTORY_SIZES) + 2
+POSITIONS = 2
+KEYS = ehs_table.TABLE_SIZE // len(ehs_table.STREETS)
+ROWS = POSITIONS * HISTORIES * KEYS
+
+def history_index(current_bet, pot) -> int:
+    if current_bet <= 0:
+        return 0
+    ratio = current_bet / pot if pot > 0 else float("inf")
+    return 1 + sum(ratio > size for size in HISTORY_SIZES)
+
+# Packs an infoset into its row number; key is an ehs_table canonical key for the street
+def infoset_id(position: int, history: int, key: int) -> int:
+    return (position * HISTORIES + history) * KEYS + key % KEYS
+
+# Probabilities as bytes adding up to QUANTUM, rounding by largest remainder
+def quantize(probs) -> bytes:
+    total = sum(probs)
+    if total <= 0:
+        return bytes(len(probs))
+    scaled = [p / total * QUANTUM for p in probs]
+    quanta = [int(s) for s in scaled]
+    by_remainder = sorted(range(len(probs)), key=lambda i: quanta[i] - scaled[i])
+    for i in by_remainder[:QUANTUM - sum(quanta)]:
+        quanta[i] += 1
+    return bytes(quanta)
+
+# Writes a store with rows given as {infoset id: probabilities over ACTIONS[facing]}; missing rows stay unknown
+def write_store(path, rows: dict, actions=3, size=ROWS):
+    data = bytearray(size * actions)
+    for infoset, probs in rows.items():
+        data[infoset * actions:(infoset + 1) * actions] = quantize(probs)
+    Path(path).write_bytes(HEADER.pack(MAGIC, VERSION, actions, size) + bytes(data))
+
+class StrategyStore:
+    def __init__(self, path):
+        self.path = Path(path)
+        self.table = None
+        self.actions = self.rows = 0
+
+    # Maps the file on first use; False if it's missing or isn't a store
+    def open(self) -> bool:
+        if self.table is None and self.path.exists() and self.path.stat().st_size >= HEADER.size:
+            with open(self.path, "rb") as f:
+                table = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, actions, rows = HEADER.unpack_from(table)
+            if magic == MAGIC and version == VERSION and len(table) == HEADER.size + actions * rows:
+                self.table, self.actions, self.rows = table, actions, rows
+            else:
+                table.close()
+        return self.table is not None
+
+    # Quantized row of an infoset, or None if the store doesn't know it
+    def row(self, infoset: int):
+        if not self.open() or not 0 <= infoset < self.rows:
+            return None
+        start = HEADER.size + infoset * self.actions
+        row = self.table[start:start + self.actions]
+        return row if any(row) else None
+
+    def probabilities(self, infoset: int):
+        row = self.row(infoset)
+        return None if row is None else [q / QUANTUM for q in row]
+
+    # Draws an action index from an infoset's row, or None if the store doesn't know it
+    def sample(self, infoset: int):
+        row = self.row(infoset)
+        if row is None:
+            return None
+        r = random.randrange(QUANTUM)
+        for i, q in enumerate(row):
+            if r < q:
+                return i
+            r -= q
+        return len(row) - 1
+
+# One store per street, mapped lazily
+_stores = {}
+
+def get_store(street: str) -> StrategyStore:
+    if street not in _stores:
+        _stores[street] = StrategyStore(STORE_FILES[street])
+    return _stores[street]
+
+# Action GTOBot's store plays at an infoset, or None to fall back on the charts
+def lookup(street: str, position: int, current_bet, pot, key: int):
+    history = history_index(current_bet, pot)
+    index = get_store(street).sample(infoset_id(position, history, key))
+    return None if index is None else ACTIONS[history > 0][index]
+
+# Stores with every canonical key playing its bucket's strategy from the JSON charts, split the way GTO.compile_charts splits them
+def stores_from_charts(paths=STORE_FILES):
+    import GTO
+    table = ehs_table.load_table()
+    if table is None:
+        sys.exit("No bucket table, run ehs_table.py first")
+    for street, path in paths.items():
+        chart = GTO.load_json_chart(GTO.CHART_FILES[street])
+        rows = {}
+        for key in range(KEYS):
+            bucket = table[STREET_INDEX[street] * KEYS + key]
+            if bucket == ehs_table.UNKNOWN:
+                continue
+            for position, name in enumerate(GTO.POSITIONS):
+                strat = chart.get(name, {}).get(ehs_table.BUCKETS[bucket], {"fold": 1.0})
+                for history in range(HISTORIES):
+                    actions = ACTIONS[history > 0]
+                    # with nothing to call the charts never fold, like GTOBot
+                    playable = actions[:2] if history == 0 else actions
+                    dist = {k: v for k, v in strat.items() if k in playable} or {playable[-1]: 1.0}
+                    rows[infoset_id(position, history, key)] = GTO.chart_probs(dist, actions)
+        write_store(path, rows)
+        print(f"{street}: {len(rows)} infosets written to {path.name}")
+
+if __name__ == "__main__":
+    stores_from_charts()
@@ -0,0 +1,36 @@
+import tempfile
+from pathlib import Path
+import numpy as np
+from cfr_solver import CFRGame, chart_entry, postflop_tree, win_matrix
+
+def small_game(name="river"):
+    return CFRGame(name, postflop_tree(), win_matrix((0.9, 0.5, 0.1)), ((1, 1, 1), (1, 1, 1)))
+
+def test_solve_and_export():
+    win = win_matrix((0.9, 0.5, 0.1))
+    assert np.allclose(win + win.T, 1) and win[0, 2] > win[1, 2] > 0.5
+    game = small_game()
+    game.solve(300)
+    root, vs_bet = game.average_strategy("root"), game.average_strategy("vs_bet")
+    assert np.allclose(root.sum(axis=1), 1) and np.allclose(vs_bet.sum(axis=1), 1)
+    # the nuts always bets, and the BB never calls a bet with the worst hand
+    assert root[0, 0] > 0.95 and vs_bet[2, 1] < 0.05
+    entry = chart_entry(("bet", "check", "fold"), root[1])
+    assert list(entry) == ["bet", "check", "fold"] and abs(sum(entry.values()) - 1) < 1e-9
+
+def test_checkpoint_resume():
+    with tempfile.TemporaryDirectory() as directory:
+        directory = Path(directory)
+        straight = small_game()
+        straight.solve(40, directory=directory / "straight")
+        resumed = small_game()
+        resumed.solve(20, directory=directory)
+        again = small_game()
+        assert again.load(directory) and again.iteration == 20
+        again.solve(40, directory=directory)
+        assert np.allclose(again.average_strategy("root"), straight.average_strategy("root"))
+
+if __name__ == "__main__":
+    test_solve_and_export()
+    test_checkpoint_resume()
+    print("All CFR solver tests passed.")
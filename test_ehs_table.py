@@ -0,0 +1,19 @@
+import random
+from ehs_table import TABLE_SIZE, canonical_key, cluster, hand_strength
+
+def test_canonical_key():
+    flop = {"2H", "8C", "QS"}
+    keys = {canonical_key(hole, flop) for hole in ({"QH", "QD"}, {"AS", "KD"}, {"7C", "2D"}, {"9S", "TS"})}
+    assert len(keys) == 4 and all(0 <= key < TABLE_SIZE for key in keys)
+    # suits and exact ranks that don't change the features map to the same key
+    assert canonical_key({"AS", "KD"}, flop) == canonical_key({"AD", "KH"}, {"2S", "8D", "QC"})
+
+def test_strength_and_clusters():
+    ehs, ehs2 = hand_strength({"AS", "AD"}, {"AH", "AC", "KS", "2D", "7C"}, random.Random(480))
+    assert ehs == ehs2 == 1.0
+    assert cluster([(0.95, 0.9, 10), (0.05, 0.0, 10), (0.5, 0.3, 10), (0.7, 0.5, 1), (0.25, 0.1, 3)]) == [0, 4, 2, 1, 3]
+
+if __name__ == "__main__":
+    test_canonical_key()
+    test_strength_and_clusters()
+    print("All EHS table tests passed.")
@@ -0,0 +1,50 @@
+import tempfile
+from pathlib import Path
+import numpy as np
+from cfr_solver import STREET_NAMES, CFRGame, class_combos, export_charts, postflop_tree, preflop_tree, win_matrix
+from GTO import HAND_CLASSES, chart_probs, load_json_chart
+from exploitability import basic_strategies, exploitability, gto_strategies
+
+def river_game():
+    return CFRGame("river", postflop_tree(), win_matrix((0.9, 0.5, 0.1)), ((1, 1, 1), (1, 1, 1)))
+
+def test_chart_probs():
+    # the last action soaks up whatever the chart leaves over, like GTO.AliasTable
+    assert chart_probs({"bet": 0.3, "check": 0.5}, ("bet", "check", "fold")) == [0.3, 0.7, 0.0]
+    assert chart_probs({"fold": 0.0}, ("call", "fold")) == [0.0, 1.0]
+
+def test_best_response():
+    game = river_game()
+    game.solve(500)
+    solved = {name: game.average_strategy(name) for name in game.regrets}
+    # against a CFR+ solution a best response wins next to nothing, against always calling it wins a lot
+    solved_mbb = exploitability(lambda g: solved, [game])["river"][0]
+    basic_mbb, response = exploitability(basic_strategies, [river_game()])["river"]
+    assert abs(solved_mbb) < 5 and basic_mbb > 100
+    # the best response value-bets the nuts and checks the worst hand against a player who never folds
+    assert np.allclose(response["root"][0], [1, 0, 0]) and response["root"][2][0] == 0
+
+def test_exported_charts_keep_the_solution():
+    combos = class_combos()
+    games = [CFRGame("preflop", preflop_tree(), win_matrix(np.linspace(0.85, 0.3, len(HAND_CLASSES))), (combos, combos))]
+    games += [CFRGame(street, postflop_tree(), win_matrix((0.95, 0.75, 0.5, 0.3, 0.1)), ((1,) * 5, (1,) * 5)) for street in STREET_NAMES]
+    for game in games:
+        game.solve(300)
+    solved = {game.name: {name: game.average_strategy(name) for name in game.regrets} for game in games}
+    with tempfile.TemporaryDirectory() as directory:
+        directory = Path(directory)
+        export_charts(solved, directory)
+        # the SB's answers to a raise are exported along with its first action
+        assert {"call", "call_vs_raise"} <= set(load_json_chart("preflop_hunl.json", directory)["SB"]["AA"])
+        assert {"call", "fold"} <= set(load_json_chart("river_hunl.json", directory)["SB"]["strong"])
+        charts = exploitability(lambda game: gto_strategies(game, directory), games)
+    solution = exploitability(lambda game: solved[game.name], games)
+    # played from the rounded charts, GTOBot is about as unexploitable as the solver's own strategies
+    for name, (mbb, _) in charts.items():
+        assert mbb < solution[name][0] + 1
+
+if __name__ == "__main__":
+    test_chart_probs()
+    test_best_response()
+    test_exported_charts_keep_the_solution()
+    print("All exploitability tests passed.")
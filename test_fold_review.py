@@ -0,0 +1,52 @@
+from fold_review import FoldReview, call_ev, fold_equity
+
+def test_fold_equity():
+    # on the river there's one runout: the set of sevens beats ace king
+    assert fold_equity({"AS", "KD"}, {"7C", "7H"}, {"7D", "2S", "9H", "JC", "3D"}) == 0.0
+    # on the turn only the 44 river cards count: the 3 aces and 3 kings left (6 outs of 44) make AK the winner
+    assert abs(fold_equity({"AS", "KD"}, {"7C", "7H"}, {"4D", "2S", "9H", "JC"}) - 6 / 44) < 1e-12
+    # a chopped board is a tie whatever the hands
+    assert fold_equity({"2S", "3D"}, {"4C", "5H"}, {"AS", "KS", "QS", "JS", "TS"}) == 0.5
+    # preflop is sampled, aces are around 85% against kings
+    assert 0.78 < fold_equity({"AS", "AD"}, {"KC", "KH"}, set(), samples=2000) < 0.88
+
+def test_call_ev():
+    # owing 10 into a pot of 30 (the bet included) with 50% equity: calling makes a 40 pot, worth 10 more than folding
+    assert call_ev(0.5, 30, 10, 100) == 10
+    # a short stack can only call 4 of the 10, the other 6 go back to the bettor
+    assert call_ev(1.0, 30, 10, 4) == 24
+
+def test_review():
+    review = FoldReview(workers=1)
+    # folding the nuts on the river loses the pot, folding the worst hand to a bet saves the call
+    review.submit("gto", "R", {"AS", "KS"}, {"2C", "3D"}, {"QS", "JS", "TS", "4H", "5H"}, 10, 0, 50)
+    review.submit("gto", "R", {"2C", "3D"}, {"AS", "KS"}, {"QS", "JS", "TS", "4H", "5H"}, 20, 10, 50)
+    review.close()
+    folds, good, saved = review.totals["gto"]["R"]
+    assert (folds, good, saved) == (2, 1, -10 + 10)
+    assert "50.0 % of 2 folds" in review.summary("gto") and "did not fold" in review.summary("basic")
+
+def test_preflop_folds_are_looked_up():
+    review = FoldReview(workers=1)
+    # folding aces preflop with nothing to call throws away about 83% of the 3 chip pot, priced without the pool
+    review.submit("gto", "PF", {"AS", "AD"}, {"KC", "KH"}, set(), 3, 0, 200)
+    folds, good, saved = review.totals["gto"]["PF"]
+    assert (folds, good) == (1, 0) and -2.6 < saved < -2.4 and review.in_flight == 0
+    review.close()
+
+def test_backlog_is_capped():
+    review = FoldReview(workers=1, max_in_flight=1)
+    # the pool is still starting up, so the folds after the first are dropped instead of queueing
+    for _ in range(3):
+        review.submit("gto", "F", {"AS", "KD"}, {"7C", "7H"}, {"4D", "2S", "9H"}, 10, 5, 100)
+    review.close()
+    assert review.dropped == 2 and review.totals["gto"]["F"][0] == 1 and review.in_flight == 0
+    assert "2 folds (all bots) skipped" in review.summary("gto")
+
+if __name__ == "__main__":
+    test_fold_equity()
+    test_call_ev()
+    test_review()
+    test_preflop_folds_are_looked_up()
+    test_backlog_is_capped()
+    print("All fold review tests passed.")
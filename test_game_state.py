@@ -0,0 +1,49 @@
+from game_state import GameState
+
+def test_betting_round_and_street_transitions():
+    state = GameState.start_hand((200, 200), 1)
+    assert (state.pot, state.banks, state.current_bet) == (3, (199, 198), 0)
+    state.apply(("check", 0))
+    assert state.street == "PF" and state.to_act == 1
+    state.apply(("check", 0))
+    assert state.street == "F" and state.to_act == 0 and state.needs_cards()
+    state.deal(frozenset({"2H", "8C", "QS"}))
+    state.apply(("bet", 5))
+    state.apply(("raise", 12))
+    # raising to 12 and calling 12 only pay the difference to what each player already put in this street
+    state.apply(("call", 12))
+    assert state.street == "T" and state.pot == 27 and state.banks == (187, 186) and state.street_put == (0, 0)
+
+def test_apply_and_undo_round_trip():
+    state = GameState("F", frozenset({"2H", "8C", "QS"}), 10, (50, 200), current_bet=4, street_put=(0, 4))
+    before = state.key()
+    for move in state.legal_actions():
+        child = state.child(move)
+        record = state.apply(move)
+        assert state.key() == child.key()
+        state.undo(record)
+        assert state.key() == before
+
+def test_all_in_runs_out_and_pays_off():
+    state = GameState("F", frozenset({"2H", "8C", "QS"}), 10, (20, 200), put=(5, 5))
+    state.apply(("bet", 50))
+    assert state.banks[0] == 0 and state.legal_actions() == [("fold", 0), ("call", 20)]
+    state.apply(("call", 20))
+    assert state.street == "showdown" and state.needs_cards() and state.banks == (0, 180)
+    assert state.payoff(0, 1) == 25 and state.payoff(1, 1) == -25 and state.payoff(0, -1) == 0
+
+def test_legalize_maps_bot_moves_onto_legal_ones():
+    state = GameState("T", frozenset(), 10, (100, 100), current_bet=5, street_put=(0, 5), put=(2, 8))
+    assert state.legalize(("check", 0)) == ("call", 5)
+    assert state.legalize(("bet", 20)) == ("raise", 20)
+    assert state.legalize(("raise", 500)) == ("raise", 100)
+    assert state.legalize(("raise", 5)) == ("call", 5)
+    state.apply(("fold", 0))
+    assert state.is_terminal() and state.payoff(1) == 2 and state.payoff(0) == -2
+
+if __name__ == "__main__":
+    test_betting_round_and_street_transitions()
+    test_apply_and_undo_round_trip()
+    test_all_in_runs_out_and_pays_off()
+    test_legalize_maps_bot_moves_onto_legal_ones()
+    print("All game state tests passed.")
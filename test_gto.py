@@ -1,5 +1,6 @@
-from GTO import GTOBot
-from poker_main import evaluate_hand
+import random
+from GTO import GTOBot, AliasTable, HAND_CLASSES, hand_key, get_charts
+from poker_core import evaluate_hand
 
 def test_preflop_open():
     bot = GTOBot({"AS", "AD"}, set(), 200, "SB")
@@ -14,15 +15,27 @@ def test_flop_bucket():
 
 def test_vs_minimax():
     from Minimax import MinimaxBot
-    from poker_main import STARTING_MONEY
+    from poker_core import STARTING_MONEY
     bot1 = GTOBot({"AS", "AD"}, set(), STARTING_MONEY, "SB")
     bot2 = MinimaxBot({"KH", "KS"}, set(), STARTING_MONEY)
     move1, amt1 = bot1.choose_move("PF", 1, 0, 0, STARTING_MONEY)
     move2, amt2 = bot2.choose_move("PF", 1, amt1, amt1, STARTING_MONEY)
     print(f"GTO: {move1}, {amt1} | Minimax: {move2}, {amt2}")
 
+def test_compiled_charts():
+    assert len(HAND_CLASSES) == 169
+    assert hand_key({"2S", "AS"}) == "A2s" and hand_key({"TD", "TH"}) == "TT" and hand_key({"KC", "QD"}) == "KQo"
+    charts = get_charts()
+    assert get_charts() is charts and len(charts["preflop"]) == 2
+    # the last action takes whatever probability the chart leaves unassigned, like GTO.sample
+    random.seed(480)
+    table = AliasTable({"check": 0.5, "bet": 0.2})
+    draws = [table.sample() for _ in range(20000)]
+    assert abs(draws.count("bet") / len(draws) - 0.5) < 0.02
+
 if __name__ == "__main__":
     test_preflop_open()
     test_flop_bucket()
     test_vs_minimax()
+    test_compiled_charts()
     print("All GTOBot tests passed.")
@@ -0,0 +1,32 @@
+from league import League, play_game
+
+def test_play_game():
+    assert play_game("gto", "basic", max_hands=3) in (0.0, 0.5, 1.0)
+
+def test_schedule():
+    league = League(["gto", "basic", "minimax"], min_games=2)
+    # every pairing gets its first games before any is played a third time
+    for _ in range(6):
+        pairing = league.next_pairing()
+        assert league.results[pairing][1] < 2
+        league.record(pairing, 1.0 if pairing[0] == "gto" or pairing == ("basic", "minimax") else 0.0)
+    assert not league.resolved()
+    # gto beats everyone and basic beats minimax, so only adjacent pairings get more games until they're decided
+    while not league.resolved():
+        pairing = league.next_pairing()
+        assert pairing in (("gto", "basic"), ("basic", "minimax"))
+        league.record(pairing, 1.0)
+    ratings, _ = league.ratings()
+    assert ratings["gto"] > ratings["basic"] > ratings["minimax"]
+    assert league.results[("gto", "minimax")][1] == 2 and league.games < 20
+
+def test_even_pairing_not_resolved():
+    league = League(["gto", "basic"], max_games=10)
+    league.run(play=lambda a, b: 0.5, report=lambda line: None)
+    assert league.games == 10 and not league.resolved()
+
+if __name__ == "__main__":
+    test_play_game()
+    test_schedule()
+    test_even_pairing_not_resolved()
+    print("All league tests passed.")
@@ -0,0 +1,46 @@
+import time
+from MCTS import MCTS, Tree
+
+def test_redrawn_card_reaches_existing_child():
+    bot = MCTS({"AS", "AD"}, {"2H", "8C", "QS"}, 200)
+    root = Tree(1, bot.hole_cards.copy(), bot.community_cards.copy())
+    bot.random_card = lambda hand, num_cards=1: {"5D"}
+    first = bot.deal_child(root, 1)
+    second = bot.deal_child(root, 1)
+    assert first is second
+    assert list(root.children) == ["5D"]
+
+def test_select_child_picks_highest_ucb():
+    bot = MCTS({"AS", "AD"}, set(), 200)
+    root = Tree(0, bot.hole_cards.copy(), set())
+    for flop, wins in (({"2H", "8C", "QS"}, 1), ({"3H", "9C", "KS"}, 9)):
+        bot.random_card = lambda hand, num_cards=1, flop=flop: set(flop)
+        child = bot.deal_child(root, 3)
+        child.wins, child.visits = wins, 10
+        root.visits += 10
+    assert bot.select_child(root).key == frozenset({"3H", "9C", "KS"})
+
+def test_evict_keeps_tree_under_cap():
+    bot = MCTS({"AS", "AD"}, {"2H", "8C", "QS"}, 200, max_nodes=40)
+    root = Tree(1, bot.hole_cards.copy(), bot.community_cards.copy())
+    bot.tree_size = 1
+    for _ in range(500):
+        bot.expand(root, time.time())
+    wins, visits = root.wins, root.visits
+    bot.evict(root)
+    assert bot.tree_size == root.size() <= 40
+    assert bot.evicted_nodes > 0
+    assert (root.wins, root.visits) == (wins, visits)
+
+def test_map_suits_relabels_book_flops():
+    from MCTS import map_suits
+    suit_map = map_suits(["AS", "KH"], {"AD", "KC"})
+    assert suit_map["S"] == "D" and suit_map["H"] == "C"
+    assert sorted(suit_map.values()) == ["C", "D", "H", "S"]
+
+if __name__ == "__main__":
+    test_redrawn_card_reaches_existing_child()
+    test_select_child_picks_highest_ucb()
+    test_evict_keeps_tree_under_cap()
+    test_map_suits_relabels_book_flops()
+    print("All MCTS tests passed.")
@@ -0,0 +1,34 @@
+from Min_Max_implementation import MinimaxBot, showdown_batch
+
+def test_draw_reuses_the_deck_buffer():
+    bot = MinimaxBot({"AS", "KD"}, {"2H", "8C", "QS"}, 200)
+    used = bot.hole_cards | bot.community_cards
+    deck = bot.remaining_deck(used)
+    for _ in range(50):
+        cards = bot.draw(used, 4)
+        assert len(set(cards)) == 4 and not used.intersection(cards)
+    assert bot.remaining_deck(used) is deck and sorted(deck) == sorted(set(deck))
+
+def test_simulate_action_averages_the_batch():
+    bot = MinimaxBot({"AS", "AD"}, {"AH", "AC", "KS", "2D", "7C"}, 200, samples=64)
+    # quad aces on the board can't lose
+    assert bot.simulate_action(bot.hole_cards, bot.community_cards, "call", 10, 0) == 10
+    assert bot.simulate_action(bot.hole_cards, bot.community_cards, "fold", 10, 0) == -10
+    assert showdown_batch({"2S", "3S"}, {"AH", "AC", "AS", "AD", "KS"}, [("4D", "5D")]) == (0, 1, 0)
+
+def test_expected_value_picks_the_action():
+    board = {"AH", "AC", "AS", "AD", "2C"}
+    # with quad aces on the board a king kicker can't lose, a four loses to nearly every hand
+    nuts = MinimaxBot({"KD", "3C"}, set(board), 200, samples=64)
+    weak = MinimaxBot({"3D", "4D"}, set(board), 200, samples=64)
+    assert nuts.choose_move("R", 1, 5, 10, 200) == ("call", 5)
+    assert weak.choose_move("R", 1, 5, 10, 200) == ("fold", 0)
+    # with nothing to call the nuts raises for the extra chips, the weak hand keeps them
+    assert nuts.choose_move("R", 1, 0, 10, 200) == ("raise", 1)
+    assert weak.choose_move("R", 1, 0, 10, 200) == ("check", 0)
+
+if __name__ == "__main__":
+    test_draw_reuses_the_deck_buffer()
+    test_simulate_action_averages_the_batch()
+    test_expected_value_picks_the_action()
+    print("All Min_Max_implementation tests passed.")
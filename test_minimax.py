@@ -0,0 +1,125 @@
+import json
+import math
+import random
+import time
+from game_state import GameState
+import Minimax
+from Minimax import MinimaxBot
+
+def search(bot, depth):
+    state = GameState("F", frozenset(bot.community_cards), 10, (bot.bank, 200))
+    bot.start_time = time.time()
+    bot.time_limit = math.inf
+    return bot._minimax(state, depth, True, -math.inf, math.inf)
+
+def test_transposition_table_matches_plain_search():
+    with_tt = MinimaxBot({"AS", "KD"}, {"2H", "8C", "QS"}, 200, show_tree=False, adaptive_time=False)
+    without_tt = MinimaxBot({"AS", "KD"}, {"2H", "8C", "QS"}, 200, show_tree=False, adaptive_time=False)
+    without_tt.use_tt = False
+    for depth in range(1, 5):
+        assert search(with_tt, depth)[0] == search(without_tt, depth)[0]
+    assert any(entry is not None for entry in with_tt.tt)
+
+def test_chance_node_cutoffs_respect_window():
+    bot = MinimaxBot({"AS", "KD"}, {"2H", "8C", "QS"}, 200, show_tree=False, adaptive_time=False)
+    bot.sample_runouts()
+    bot.start_time = time.time()
+    bot.time_limit = math.inf
+    state = GameState("T", frozenset(bot.community_cards), 10, (200, 200))
+    exact = bot._chance(state, 2, -math.inf, math.inf)
+    assert bot._chance(state, 2, exact - 0.1, exact + 0.1) == exact
+    assert bot._chance(state, 2, exact + 0.05, 1.0) <= exact + 0.05
+    assert bot._chance(state, 2, -1.0, exact - 0.05) >= exact - 0.05
+
+def test_parallel_root_matches_serial_search():
+    serial = MinimaxBot({"AS", "KD"}, {"2H", "8C", "QS"}, 200, show_tree=False, adaptive_time=False)
+    parallel = MinimaxBot({"AS", "KD"}, {"2H", "8C", "QS"}, 200, show_tree=False, adaptive_time=False, parallel=True)
+    serial.sample_runouts()
+    parallel.sample_runouts()
+    parallel.runouts = serial.runouts
+    for bot in (serial, parallel):
+        bot.start_time = time.time()
+        bot.time_limit = math.inf
+    state = GameState("F", frozenset(serial.community_cards), 10, (200, 200))
+    for depth in range(1, 4):
+        assert parallel._parallel_root(state, depth)[0] == serial._minimax(state, depth, True, -math.inf, math.inf)[0]
+
+def test_aspiration_and_ordering_keep_the_value():
+    ordered = MinimaxBot({"AS", "KD"}, {"2H", "8C", "QS"}, 200, show_tree=False, adaptive_time=False)
+    plain = MinimaxBot({"AS", "KD"}, {"2H", "8C", "QS"}, 200, show_tree=False, adaptive_time=False)
+    plain.use_tt = False
+    state = GameState("T", frozenset(ordered.community_cards | {"5D"}), 10, (200, 200))
+    for bot in (ordered, plain):
+        bot.start_time = time.time()
+        bot.time_limit = math.inf
+    for depth in range(1, 5):
+        ordered.root_depth = depth
+        guess, _ = ordered._minimax(state, depth - 1, True, -math.inf, math.inf) if depth > 1 else (0.0, None)
+        assert ordered._aspiration(state, depth, guess, False)[0] == plain._minimax(state, depth, True, -math.inf, math.inf)[0]
+    assert ordered.cutoffs > 0 and 0 <= ordered.first_move_cutoff_rate() <= 1
+    assert ordered.killers and ordered.history
+
+def test_trace_is_only_recorded_on_request(tmp_path):
+    bot = MinimaxBot({"AS", "KD"}, {"2H", "8C", "QS"}, 200, adaptive_time=False, trace_every=2, trace_path=tmp_path / "trace{decision}.json")
+    bot.time_limit = 0.2
+    bot.choose_move("F", 1, 0, 10, 200)
+    assert bot.last_trace is None
+    bot.choose_move("F", 1, 0, 10, 200)
+    data = json.loads((tmp_path / "trace2.json").read_text())
+    assert data["decision"] == 2 and data["nodes"][0][0] is None
+    # the trace is labelled with the depth of the pass it holds
+    assert data["depth"] == bot.last_trace.info["depth"] == bot.depth_reached
+    assert all(0 <= node[0] < i for i, node in enumerate(data["nodes"]) if i > 0)
+    assert bot.last_trace.to_dot().startswith("digraph")
+
+def test_zobrist_keys_stay_fixed():
+    keys = dict(Minimax.ZOBRIST_KEYS)
+    bot = MinimaxBot({"AS", "KD"}, {"2H", "8C", "QS"}, 200)
+    # states that differ only in chip amounts (fractional ones included) still hash apart
+    a = GameState("F", frozenset({"2H", "8C", "QS"}), 10, (195, 195))
+    b = GameState("F", frozenset({"2H", "8C", "QS"}), 10.5, (195, 194.5))
+    assert bot.hash_state(a, True) != bot.hash_state(b, True) != bot.hash_state(a, False)
+    for pot in range(3, 500):
+        bot.hash_state(GameState("T", frozenset({"2H", "8C", "QS", "4D"}), pot, (200 - pot, 200)), True)
+    assert Minimax.ZOBRIST_KEYS == keys and len(Minimax.CARD_KEYS) == 52
+
+def test_leaf_scores_are_memoized():
+    Minimax.card_strength.cache_clear()
+    search(MinimaxBot({"AS", "KD"}, {"2H", "8C", "QS"}, 200), 2)
+    misses = Minimax.card_strength.cache_info().misses
+    assert misses > 0
+    # a fresh bot searching the same position scores every leaf from the cache
+    search(MinimaxBot({"AS", "KD"}, {"2H", "8C", "QS"}, 200), 2)
+    info = Minimax.card_strength.cache_info()
+    assert info.misses == misses and info.hits >= misses
+    Minimax.showdown_value.cache_clear()
+    hand = (frozenset({"AS", "KD"}), frozenset({"2H", "8C", "QS", "4D", "KC"}), frozenset({"QH", "QD"}))
+    assert Minimax.showdown_value(*hand) == Minimax.showdown_value(*hand) == 0.0
+    assert Minimax.showdown_value.cache_info()[:2] == (1, 1)
+
+def test_cached_scores_match_the_evaluator():
+    rng = random.Random(32)
+    deck = [rank + suit for rank in "23456789TJQKA" for suit in "DCHS"]
+    for board_size in (0, 3, 4, 5) * 25:
+        cards = rng.sample(deck, 4 + board_size)
+        hole, opp, board = set(cards[:2]), set(cards[2:4]), set(cards[4:])
+        # the frozenset keyed cache gives what the plain evaluator gives for the same cards as sets
+        assert Minimax.card_strength(frozenset(hole), frozenset(board)) == Minimax.card_strength.__wrapped__(hole, board)
+        if board_size == 5:
+            result = Minimax.choose_winner(Minimax.evaluate_hand(hole | board), Minimax.evaluate_hand(opp | board))
+            expected = 0.5 if result == -1 else float(result)
+            assert Minimax.showdown_value(frozenset(hole), frozenset(board), frozenset(opp)) == expected
+
+if __name__ == "__main__":
+    test_transposition_table_matches_plain_search()
+    test_chance_node_cutoffs_respect_window()
+    test_parallel_root_matches_serial_search()
+    test_aspiration_and_ordering_keep_the_value()
+    test_zobrist_keys_stay_fixed()
+    test_leaf_scores_are_memoized()
+    test_cached_scores_match_the_evaluator()
+    import tempfile
+    from pathlib import Path
+    with tempfile.TemporaryDirectory() as tmp:
+        test_trace_is_only_recorded_on_request(Path(tmp))
+    print("All MinimaxBot tests passed.")
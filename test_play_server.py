@@ -0,0 +1,32 @@
+import asyncio
+from play_server import PlayServer
+
+async def play(port, script):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(script.encode())
+    await writer.drain()
+    output = (await reader.read()).decode()
+    writer.close()
+    return output
+
+async def serve_sessions(scripts):
+    play_server = PlayServer(workers=2)
+    server = await asyncio.start_server(play_server.handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    try:
+        return await asyncio.gather(*(play(port, script) for script in scripts))
+    finally:
+        server.close()
+        play_server.close()
+
+def test_concurrent_sessions():
+    # the bot opens as SB in the first sessions, the player folds right away in the last one
+    outputs = asyncio.run(serve_sessions(["gto\nBB\nfold\nn\n", "basic\nBB\nfold\nn\n", "gto\nSB\nfold\nn\n"]))
+    for output in outputs:
+        assert "--- PREFLOP ---" in output and output.rstrip().endswith("Thanks for playing!")
+    assert "Bot action:" in outputs[0] and "Bot latency this hand: 1 bot decisions" in outputs[1]
+    assert "You folded" in outputs[2] and "no bot decisions" in outputs[2]
+
+if __name__ == "__main__":
+    test_concurrent_sessions()
+    print("All play server tests passed.")
@@ -0,0 +1,29 @@
+import random
+import statistics
+from profit_stats import ProfitTracker, Welford
+
+def test_welford_matches_statistics():
+    rng = random.Random(1)
+    profits = [rng.choice((-200, -2, -1, 1, 3, 50, 200)) for _ in range(5000)]
+    stats = Welford()
+    for profit in profits:
+        stats.add(profit)
+    assert abs(stats.mean - statistics.mean(profits)) < 1e-9
+    assert abs(stats.stdev() - statistics.stdev(profits)) < 1e-9
+
+def test_tracker_memory_stays_flat():
+    tracker = ProfitTracker(2, series_size=100, reservoir_size=50, rng=random.Random(2))
+    for hand in range(1, 100001):
+        tracker.add(1 if hand % 2 else -0.5)
+    assert len(tracker.series) < 100 and len(tracker.reservoir) == 50
+    x, y = tracker.plot_series()
+    # the series spans the whole run and its points are exact cumulative profits
+    assert x[-1] == 100000 and y[-1] == tracker.total == 25000
+    assert all(total == (hand + 1) // 2 - hand // 2 * 0.5 for hand, total in zip(x, y))
+    rate, low, high = tracker.bb_per_100()
+    assert abs(rate - 12.5) < 1e-6 and low < rate < high
+
+if __name__ == "__main__":
+    test_welford_matches_statistics()
+    test_tracker_memory_stays_flat()
+    print("All profit stats tests passed.")
@@ -0,0 +1,34 @@
+import random
+import numpy as np
+from poker_core import evaluate_hand, choose_winner, HAND_CLASSES
+from pushfold import hand_score, short_stack_move, solve
+
+def test_hand_score():
+    rng = random.Random(480)
+    deck = [r + s for r in "23456789TJQKA" for s in "DCHS"]
+    for _ in range(300):
+        cards = rng.sample(deck, 9)
+        board = set(cards[4:])
+        a, b = evaluate_hand(board | set(cards[:2])), evaluate_hand(board | set(cards[2:4]))
+        result = choose_winner((a[0], list(a[1])), (b[0], list(b[1])))
+        expected = 0 if result == -1 else 1 if result else -1
+        assert (hand_score(a) > hand_score(b)) - (hand_score(a) < hand_score(b)) == expected
+
+def test_solve_and_chart():
+    # a made up equity matrix where earlier classes beat later ones
+    strength = np.linspace(0.85, 0.3, len(HAND_CLASSES))
+    equity = strength[:, None] * (1 - strength[None, :])
+    equity = equity / (equity + equity.T)
+    push, call = solve(equity, np.ones_like(equity), stacks=(1, 20), iterations=500)
+    assert push[0].min() > 0.9 and push[1].sum() < push[0].sum() and call[1].sum() < call[0].sum()
+    # deep stacks are left to the bot, short ones shove the nuts and check trash for free
+    assert short_stack_move({"AS", "AD"}, "PF", 1, 0, 150, 150) is None
+    assert short_stack_move({"AS", "AD"}, "PF", 1, 0, 10, 40) == ("bet", 10)
+    assert short_stack_move({"7S", "2D"}, "PF", 1, 0, 40, 40) == ("check", 0)
+    assert short_stack_move({"AS", "AD"}, "PF", 1, 10, 20, 0) == ("call", 10)
+    assert short_stack_move({"AS", "AD"}, "F", 1, 0, 10, 40) is None
+
+if __name__ == "__main__":
+    test_hand_score()
+    test_solve_and_chart()
+    print("All push/fold tests passed.")
@@ -0,0 +1,25 @@
+import tempfile
+from pathlib import Path
+from strategy_store import HISTORIES, KEYS, ROWS, StrategyStore, history_index, infoset_id, quantize, write_store
+
+def test_infoset_ids():
+    ids = {infoset_id(position, history, key) for position in range(2) for history in range(HISTORIES) for key in range(KEYS)}
+    assert ids == set(range(ROWS))
+    assert [history_index(bet, 10) for bet in (0, 3, 8, 30)] == [0, 1, 2, 3]
+
+def test_write_and_read():
+    assert quantize([0.2, 0.6, 0.2]) == bytes([51, 153, 51]) and sum(quantize([1, 1, 1])) == 255
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "flop_strategy.bin"
+        write_store(path, {5: [0.0, 1.0, 0.0], 7: [0.25, 0.25, 0.5]}, size=10)
+        store = StrategyStore(path)
+        assert store.sample(5) == 1 and store.row(6) is None and store.row(10) is None
+        assert [round(p, 2) for p in store.probabilities(7)] == [0.25, 0.25, 0.5]
+        # anything that isn't a store is ignored
+        path.write_bytes(b"not a store")
+        assert StrategyStore(path).row(0) is None
+
+if __name__ == "__main__":
+    test_infoset_ids()
+    test_write_and_read()
+    print("All strategy store tests passed.")
@@ -0,0 +1,24 @@
+from time_manager import TimeManager, MIN_THINK, MAX_THINK
+
+def test_big_pots_get_more_time():
+    small = TimeManager().allocate("F", 4, 200, 200)
+    big = TimeManager().allocate("F", 300, 100, 100)
+    assert MIN_THINK <= small < big <= MAX_THINK
+
+def test_budget_is_charged():
+    manager = TimeManager(budget=1.0, decisions=2)
+    manager.charge(0.75)
+    assert manager.remaining == 0.25
+    assert manager.allocate("R", 400, 0, 0) <= 0.25 * 1.2 * 2
+
+def test_converged_needs_tight_estimate():
+    manager = TimeManager()
+    manager.allocate("F", 4, 200, 200)
+    assert not manager.converged(1.0, 1.0, 50, 100)
+    assert manager.converged(1.0, 1.0, 5000, 10000)
+
+if __name__ == "__main__":
+    test_big_pots_get_more_time()
+    test_budget_is_charged()
+    test_converged_needs_tight_estimate()
+    print("All TimeManager tests passed.")
@@ -0,0 +1,40 @@
+import json
+import MCTS
+import tune_mcts
+from tune_mcts import pareto_front, tune
+
+def result(rmse, ms):
+    return {"params": {"UCB_C": ms}, "rmse": rmse, "ms": ms}
+
+def test_pareto_front():
+    results = [result(0.05, 40), result(0.2, 1), result(0.1, 5), result(0.1, 8), result(0.3, 2), result(0.05, 50)]
+    front = pareto_front(results)
+    # slower at the same error, or slower and worse, is dominated
+    assert front == [result(0.2, 1), result(0.1, 5), result(0.05, 40)]
+    # ties on both count as neither dominating the other
+    assert pareto_front([result(0.1, 5), result(0.1, 5)]) == [result(0.1, 5), result(0.1, 5)]
+
+def test_tune_writes_params_mcts_loads(tmp_path):
+    path = tmp_path / "mcts_params.json"
+    saved = {name: getattr(MCTS, name) for name in tune_mcts.GRID}
+    grid = {"UCB_C": [0.5, 3], "PREFLOP_WIDEN": [0.5], "PREFLOP_WIDEN_POWER": [0.5], "CHANCE_WIDEN": [1.0]}
+    try:
+        config = tune(1, path, grid, [("iterations", 20)])
+        # the search parameters are put back after the sweep
+        assert {name: getattr(MCTS, name) for name in saved} == saved
+        assert json.loads(path.read_text()) == config
+        assert config["params"]["UCB_C"] in grid["UCB_C"] and config["pareto"]
+        assert config["pareto"] == sorted(config["pareto"], key=lambda r: r["ms"])
+        MCTS.load_params(path)
+        assert {name: getattr(MCTS, name) for name in grid} == config["params"]
+    finally:
+        for name, value in saved.items():
+            setattr(MCTS, name, value)
+
+if __name__ == "__main__":
+    test_pareto_front()
+    import tempfile
+    from pathlib import Path
+    with tempfile.TemporaryDirectory() as tmp:
+        test_tune_writes_params_mcts_loads(Path(tmp))
+    print("All tune_mcts tests passed.")
@@ -0,0 +1,100 @@
+"""
+Per-decision think time allocation for the search bots (MCTS and MinimaxBot).
+
+A TimeManager owns a budget of seconds for a hand (or a whole session if the same instance is
+shared between bots) and hands out a slice of it for each decision. Slices grow with the street
+and with how much of the effective stack is already in the pot, and are capped by how long the
+machine needs to pin a win rate estimate down, which is calibrated once per process from the
+measured showdowns per second.
+"""
+import math
+import random
+import time
+from poker_core import evaluate_hand, choose_winner
+
+# Seconds of thinking per hand when a manager isn't given its own budget
+HAND_BUDGET = 2.0
+# Decisions we expect to make with that budget (roughly one per street)
+EXPECTED_DECISIONS = 4
+# Bounds on a single decision's think time
+MIN_THINK = 0.05
+MAX_THINK = 2.0
+# Relative share of the budget spent on each street
+STREET_WEIGHT = {"PF": 0.5, "F": 1.0, "T": 1.0, "R": 1.2}
+# Standard error of the win rate we're happy with in a tiny pot, halved as the pot approaches the stacks
+TOLERANCE = 0.01
+# Playouts cost more than a bare showdown because of the tree bookkeeping around them
+SEARCH_OVERHEAD = 2.0
+# Fraction of the allotted time that's always spent before stopping early
+MIN_FRACTION = 0.2
+# Playouts needed before a win rate estimate is trusted at all
+MIN_VISITS = 100
+# MinimaxBot stops deepening once the best move has held for this many completed depths
+STABLE_DEPTHS = 3
+# Seconds spent measuring showdowns per second
+CALIBRATION_TIME = 0.05
+
+# Measured once per process by calibrate()
+_sims_per_second = None
+
+# Measures how many random showdowns this machine evaluates per second
+def calibrate() -> float:
+    global _sims_per_second
+    if _sims_per_second is None:
+        deck = [r + s for r in "23456789TJQKA" for s in "DCHS"]
+        count = 0
+        start_time = time.time()
+        while time.time() - start_time < CALIBRATION_TIME:
+            cards = random.sample(deck, 9)
+            choose_winner(evaluate_hand(set(cards[:7])), evaluate_hand(set(cards[2:])))
+            count += 1
+        _sims_per_second = count / (time.time() - start_time)
+    return _sims_per_second
+
+class TimeManager:
+    def __init__(self, budget=HAND_BUDGET, decisions=EXPECTED_DECISIONS, min_time=MIN_THINK, max_time=MAX_THINK):
+        self.remaining = budget
+        self.decisions_left = decisions
+        self.min_time = min_time
+        self.max_time = max_time
+        self.sims_per_second = calibrate()
+        # Tolerance for the decision currently being searched, set by allocate()
+        self.tolerance = TOLERANCE
+        # Think time actually used by each decision
+        self.history = []
+
+    # Seconds to spend on the next decision
+    def allocate(self, game_phase: str, pot: int, bank: float, opponent_bank: float) -> float:
+        # How much of the effective stack is already committed, from 0 (tiny pot) to 1 (stacks are in)
+        stack = min(bank, opponent_bank)
+        pressure = pot / (pot + stack) if pot + stack > 0 else 1
+        self.tolerance = TOLERANCE * (1 - 0.5 * pressure)
+
+        share = self.remaining / max(self.decisions_left, 1)
+        think_time = share * STREET_WEIGHT.get(game_phase, 1.0) * (0.5 + 1.5 * pressure)
+        # Never plan more time than the estimate needs to reach the tolerance on this machine
+        needed = 0.25 / self.tolerance ** 2 / self.sims_per_second * SEARCH_OVERHEAD
+        think_time = min(think_time, needed)
+        return max(self.min_time, min(self.max_time, think_time))
+
+    # Records time spent on a decision against the budget
+    def charge(self, elapsed: float):
+        self.remaining = max(0.0, self.remaining - elapsed)
+        self.decisions_left = max(1, self.decisions_left - 1)
+        self.history.append(elapsed)
+
+    # True once a win rate estimate from wins / visits playouts is within tolerance
+    def converged(self, elapsed: float, allotted: float, wins: float, visits: int) -> bool:
+        if visits < MIN_VISITS or elapsed < MIN_FRACTION * allotted:
+            return False
+        p = wins / visits
+        return math.sqrt(p * (1 - p) / visits) <= self.tolerance
+
+    # True once the best move from iterative deepening has stopped changing
+    def settled(self, elapsed: float, allotted: float, best_moves: list) -> bool:
+        if elapsed < MIN_FRACTION * allotted or len(best_moves) < STABLE_DEPTHS:
+            return False
+        return len(set(best_moves[-STABLE_DEPTHS:])) == 1
+
+    def average_think_time(self) -> float:
+        return sum(self.history) / len(self.history) if self.history else 0.0
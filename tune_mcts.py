@@ -0,0 +1,164 @@
+"""
+Benchmark harness that tunes the MCTS search parameters (UCB_C, PREFLOP_WIDEN, PREFLOP_WIDEN_POWER, CHANCE_WIDEN).
+
+Every parameter setting searches the same seeded corpus of positions under a set of wall clock and
+iteration budgets. The root win rate is compared against the position's reference equity, and the
+settings that are Pareto optimal in (milliseconds per search, RMSE) are written to data/mcts_params.json,
+together with the setting MCTS loads on import.
+
+The corpus is built once and cached in data/mcts_tuning_corpus.json. Flop and turn equities against a
+random hand are enumerated exactly; preflop equities use a large seeded Monte Carlo run because full
+enumeration is out of reach for this evaluator.
+
+Usage: python tune_mcts.py [repeats per position]
+"""
+import contextlib
+import io
+import itertools
+import json
+import math
+import random
+import sys
+import time
+from pathlib import Path
+
+import MCTS
+from poker_core import evaluate_hand, choose_winner
+
+SEED = 480
+CORPUS_FILE = Path(__file__).parent / "data" / "mcts_tuning_corpus.json"
+# Number of positions in the corpus per street (community card count)
+CORPUS_POSITIONS = {0: 6, 3: 4, 4: 6}
+# Samples used for the preflop reference equity
+PREFLOP_SAMPLES = 100000
+# Parameter grid swept by the harness
+GRID = {
+    "UCB_C": [0.5, 1, 2, 4],
+    "PREFLOP_WIDEN": [0.25, 0.5, 1.0],
+    "PREFLOP_WIDEN_POWER": [0.5, 0.75],
+    "CHANCE_WIDEN": [0.5, 1.0],
+}
+# Budgets are either ("time", seconds) or ("iterations", playouts)
+BUDGETS = [("time", 0.05), ("time", 0.2), ("iterations", 500), ("iterations", 2000)]
+# Searches per position and budget, averaged to tame the Monte Carlo noise
+REPEATS = 2
+
+DECK = [r + s for r in "23456789TJQKA" for s in "DCHS"]
+
+# 1 for a win, 0.5 for a tie, 0 for a loss, from the first hand's point of view
+def showdown(mine, theirs) -> float:
+    result = choose_winner(mine, theirs)
+    return 0.5 if result == -1 else float(result)
+
+# Exact equity against a uniformly random opponent hand, enumerating every runout
+def exact_equity(hole: set[str], board: set[str]) -> float:
+    remaining = [card for card in DECK if card not in hole and card not in board]
+    total, wins = 0, 0.0
+    for runout in itertools.combinations(remaining, 5 - len(board)):
+        full_board = board.union(runout)
+        rank, kickers = evaluate_hand(hole | full_board)
+        rest = [card for card in remaining if card not in runout]
+        for opp in itertools.combinations(rest, 2):
+            # choose_winner consumes the kicker lists, so each comparison gets its own copy
+            wins += showdown((rank, list(kickers)), evaluate_hand(full_board.union(opp)))
+            total += 1
+    return wins / total
+
+# Seeded Monte Carlo equity against a random hand, used for preflop
+def sampled_equity(hole: set[str], board: set[str], samples: int, rng: random.Random) -> float:
+    remaining = [card for card in DECK if card not in hole and card not in board]
+    needed = 5 - len(board)
+    wins = 0.0
+    for _ in range(samples):
+        cards = rng.sample(remaining, needed + 2)
+        full_board = board.union(cards[:needed])
+        wins += showdown(evaluate_hand(hole | full_board), evaluate_hand(full_board.union(cards[needed:])))
+    return wins / samples
+
+def build_corpus(path=CORPUS_FILE) -> list[dict]:
+    rng = random.Random(SEED)
+    positions = []
+    for board_size, count in CORPUS_POSITIONS.items():
+        for _ in range(count):
+            cards = rng.sample(DECK, 2 + board_size)
+            hole, board = set(cards[:2]), set(cards[2:])
+            if board_size == 0:
+                equity, exact = sampled_equity(hole, board, PREFLOP_SAMPLES, rng), False
+            else:
+                equity, exact = exact_equity(hole, board), True
+            positions.append({"hole": sorted(hole), "board": sorted(board), "equity": equity, "exact": exact})
+            print(f"{positions[-1]['hole']} {positions[-1]['board']}: {equity * 100:.2f}%")
+    path.write_text(json.dumps({"seed": SEED, "positions": positions}, indent=1) + "\n")
+    return positions
+
+def load_corpus(path=CORPUS_FILE) -> list[dict]:
+    if path.exists():
+        return json.loads(path.read_text())["positions"]
+    return build_corpus(path)
+
+# Runs one search per position and repeat under the given budget, returns (RMSE, ms per search, playouts per search)
+def measure(corpus: list[dict], budget: tuple[str, float], repeats: int) -> tuple[float, float, float]:
+    kind, amount = budget
+    squared_error, elapsed, playouts, runs = 0.0, 0.0, 0, 0
+    for position in corpus:
+        for _ in range(repeats):
+            bot = MCTS.MCTS(set(position["hole"]), set(position["board"]), 0, use_book=False, adaptive_time=False)
+            start_time = time.time()
+            # the search prints its tree metrics, which would drown the harness output
+            with contextlib.redirect_stdout(io.StringIO()):
+                if kind == "time":
+                    root = bot.search(think_time=amount)
+                else:
+                    root = bot.search(think_time=math.inf, max_iterations=int(amount))
+            elapsed += time.time() - start_time
+            # a search that was starved of time before its first playout knows nothing
+            estimate = root.wins / root.visits if root.visits else 0.5
+            squared_error += (estimate - position["equity"]) ** 2
+            playouts += root.visits
+            runs += 1
+    return math.sqrt(squared_error / runs), elapsed / runs * 1000, playouts / runs
+
+# Keeps the results no other result beats on both error and time
+def pareto_front(results: list[dict]) -> list[dict]:
+    front = []
+    for result in results:
+        dominated = any(other["rmse"] <= result["rmse"] and other["ms"] <= result["ms"]
+                        and (other["rmse"] < result["rmse"] or other["ms"] < result["ms"]) for other in results)
+        if not dominated:
+            front.append(result)
+    return sorted(front, key=lambda result: result["ms"])
+
+def tune(repeats=REPEATS, path=MCTS.PARAMS_FILE, grid=GRID, budgets=BUDGETS) -> dict:
+    random.seed(SEED)
+    corpus = load_corpus()
+    saved = {name: getattr(MCTS, name) for name in grid}
+    results = []
+    try:
+        for values in itertools.product(*grid.values()):
+            params = dict(zip(grid, values))
+            for name, value in params.items():
+                setattr(MCTS, name, value)
+            for budget in budgets:
+                rmse, ms, playouts = measure(corpus, budget, repeats)
+                results.append({"params": params, "budget": list(budget), "rmse": rmse, "ms": ms, "playouts": playouts})
+                print(f"{params} {budget}: RMSE {rmse:.4f} in {ms:.1f} ms ({playouts:.0f} playouts)")
+    finally:
+        for name, value in saved.items():
+            setattr(MCTS, name, value)
+
+    front = pareto_front(results)
+    # The bot runs under many different budgets, so it loads the Pareto optimal setting
+    # with the lowest error averaged over every budget
+    on_front = {json.dumps(result["params"], sort_keys=True) for result in front}
+    def mean_rmse(key):
+        return sum(r["rmse"] for r in results if json.dumps(r["params"], sort_keys=True) == key) / len(budgets)
+    best = json.loads(min(on_front, key=mean_rmse))
+    config = {"params": best, "pareto": front}
+    path.write_text(json.dumps(config, indent=1) + "\n")
+    print(f"Loaded by MCTS: {best}")
+    return config
+
+if __name__ == "__main__":
+    start_time = time.time()
+    tune(int(sys.argv[1]) if len(sys.argv) > 1 else REPEATS)
+    print(f"Tuning took {time.time() - start_time:.0f}s")